@@ -0,0 +1,27 @@
+"""
+Aggregations over bias detection results used by the dashboard
+Kept free of Streamlit and plotting imports so they can be benchmarked
+and reused outside the app.
+"""
+
+from collections import Counter
+from typing import Dict, List
+
+# Short function words that carry no signal in the suspicious-word chart
+STOP_WORDS = frozenset([
+    'this', 'that', 'with', 'have', 'will', 'they', 'what', 'your', 'from', 'were', 'been', 'said'
+])
+
+def suspicious_phrases(bias_items: List[Dict]) -> List[str]:
+    """Non-blank Example_Phrase values, in detection order"""
+    return [item.get('Example_Phrase', '') for item in bias_items if item.get('Example_Phrase', '').strip()]
+
+def suspicious_word_counts(phrases: List[str], top_n: int = 10) -> Dict[str, int]:
+    """Most frequent words longer than three characters across the phrases"""
+    word_counts = Counter()
+    for phrase in phrases:
+        word_counts.update(
+            word.strip('.,!?;:"()[]') for word in phrase.lower().split()
+            if len(word) > 3 and word not in STOP_WORDS
+        )
+    return dict(word_counts.most_common(top_n))
@@ -1,7 +1,20 @@
-import google.generativeai as genai
+import hashlib
 import json
-import re
-from typing import Dict, List, Any
+import queue
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
+from backends import GeminiBackend, ModelBackend
+from cache import ResponseCache
+from chunking import chunk_transcript, merge_bias_items
+from metrics import REGISTRY, MetricsRegistry
+from parsing import (IncrementalJSONParser, extract_json, validate_bias,
+                     validate_recommendations, validate_summary)
+from prescreen import has_bias_cues, prescreen
+from recommendations import bias_profile, profile_key
+from turns import interviewer_excerpt
+from verification import MIN_MATCH_SCORE, PhraseIndex, verify_bias, verify_bias_items
 
 class InterviewAnalyzer:
     """
@@ -9,15 +22,75 @@ class InterviewAnalyzer:
     Handles summarization, bias detection, and recommendations
     """
     
-    def __init__(self):
+    # Bump whenever a prompt template changes so cached results are not reused
+    PROMPT_VERSION = "2"
+    
+    # "llm": always ask the model; "triage": skip the model when the local
+    # pre-screen finds neither a lexicon phrase nor a cue word; "fast":
+    # return pre-screen findings only;
+    # "interviewer": ask the model about interviewer turns only, with the tail
+    # of each preceding candidate turn as context
+    BIAS_MODES = ("llm", "triage", "fast", "interviewer")
+    
+    def __init__(self, cache: Optional[ResponseCache] = None, model_name: str = 'gemini-2.5-flash-lite',
+                 max_chunk_chars: int = 20000, chunk_overlap_turns: int = 1, chunk_workers: int = 4,
+                 bias_mode: str = "llm", metrics: Optional[MetricsRegistry] = None,
+                 near_duplicates=None, escalation_threshold: float = 0.7,
+                 min_match_score: Optional[float] = MIN_MATCH_SCORE):
+        if bias_mode not in self.BIAS_MODES:
+            raise ValueError(f"bias_mode must be one of {self.BIAS_MODES}")
+        
         self.api_key = None
         self.model = None
+        self.model_name = model_name
+        self.cache = cache
+        # Transcripts longer than max_chunk_chars go through the map-reduce path
+        self.max_chunk_chars = max_chunk_chars
+        self.chunk_overlap_turns = chunk_overlap_turns
+        self.chunk_workers = chunk_workers
+        self.bias_mode = bias_mode
+        self.metrics = metrics if metrics is not None else REGISTRY
+        # Precomputed recommendations by profile_key(), consulted before the cache
+        self.recommendation_table = {}
+        # Optional near_duplicates.NearDuplicateIndex consulted by reuse_analysis()
+        self.near_duplicates = near_duplicates
+        # (tier, analyzer) pairs, cheapest first, set by set_tiers()
+        self.tiers = []
+        # Bias results reporting less confidence than this escalate to the next tier
+        self.escalation_threshold = escalation_threshold
+        # Quoted phrases must match the transcript at least this well; None keeps every finding
+        self.min_match_score = min_match_score
         
     def set_api_key(self, api_key: str):
         """Configure Gemini API with the provided key"""
         self.api_key = api_key
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-2.5-flash-lite')
+        self.set_backend(GeminiBackend(api_key, self.model_name))
+    
+    def set_backend(self, backend: ModelBackend):
+        """Use any ModelBackend (e.g. a local FakeBackend) instead of Gemini"""
+        self.model = backend
+        self.model_name = backend.model_name
+    
+    def set_tiers(self, tiers: List[Tuple[str, ModelBackend]]):
+        """
+        Route summaries and bias detection through model tiers, cheapest first
+        Every transcript is analyzed by the first tier. A section moves on to
+        the next tier when it comes back as an error or unparseable, and bias
+        detection also does when it finds anything or reports confidence
+        below escalation_threshold. Recommendations, fused analyses and live
+        sessions use the first tier.
+        """
+        if not tiers:
+            raise ValueError("At least one model tier is required")
+        self.set_backend(tiers[0][1])
+        self.tiers = []
+        for name, backend in tiers:
+            analyzer = InterviewAnalyzer(cache=self.cache, max_chunk_chars=self.max_chunk_chars,
+                                         chunk_overlap_turns=self.chunk_overlap_turns,
+                                         chunk_workers=self.chunk_workers, bias_mode=self.bias_mode,
+                                         metrics=self.metrics)
+            analyzer.set_backend(backend)
+            self.tiers.append((name, analyzer))
     
     def generate_summary(self, transcript: str) -> Dict[str, Any]:
         """
@@ -26,8 +99,693 @@ class InterviewAnalyzer:
         """
         if not self.model:
             raise Exception("API key not configured")
+        
+        cache_key = self._cache_key("summary", transcript)
+        cached = self._cache_get(cache_key, "summary")
+        if cached is not None:
+            return cached
+            
+        prompt = self._summary_prompt(transcript)
+        
+        try:
+            response = self._generate("summary", prompt)
+            result = self._parse_response("summary", response.text)
+            if result is not None:
+                self._cache_set(cache_key, result)
+                return result
+            else:
+                # Fallback if JSON parsing fails
+                return self._parse_summary_fallback(response.text)
+        except Exception as e:
+            return self._summary_error(e)
+    
+    def detect_bias(self, transcript: str) -> Dict[str, Any]:
+        """
+        Detect potential biases in interview questions and discussion
+        Returns: Dictionary with bias_items list
+        """
+        if not self.model:
+            raise Exception("API key not configured")
+        
+        screened = self._screened_bias(transcript)
+        if screened is not None:
+            return screened
+        
+        transcript = self._bias_input(transcript)
+        cache_key = self._cache_key("bias", transcript)
+        cached = self._cache_get(cache_key, "bias")
+        if cached is not None:
+            return cached
+            
+        prompt = self._bias_prompt(transcript)
+        
+        try:
+            response = self._generate("bias", prompt)
+            result = self._parse_response("bias", response.text)
+            if result is not None:
+                self._cache_set(cache_key, result)
+                return result
+            else:
+                return _UNPARSED_BIAS.copy()
+        except Exception as e:
+            return self._bias_error(e)
+    
+    def generate_recommendations(self, bias_data: Dict[str, Any]) -> List[str]:
+        """
+        Generate actionable recommendations based on bias detection results
+        Returns: List of recommendation strings
+        """
+        if not self.model:
+            return ["API key not configured"]
+            
+        bias_items = bias_data.get('bias_items', [])
+        
+        if not bias_items:
+            return [
+                "Great job! No significant biases were detected in this interview.",
+                "Continue following structured interview practices and focusing on job-relevant skills.",
+                "Consider using standardized questions to maintain consistency across all candidates."
+            ]
+        
+        # Recommendations depend only on the bias profile, so differently worded
+        # findings of the same kinds and severities share one model answer
+        profile = bias_profile(bias_items)
+        if self.recommendation_table:
+            table_hit = self.recommendation_table.get(profile_key(profile))
+            self.metrics.record_cache("recommendations_table", table_hit is not None)
+            if table_hit is not None:
+                return list(table_hit)
+        
+        try:
+            result = self.recommend_for_profile(profile)
+            if result is not None:
+                return result
+            else:
+                # Fallback recommendations
+                return self._generate_fallback_recommendations(bias_items)
+        except Exception as e:
+            return [f"Error generating recommendations: {str(e)}"]
+    
+    def recommend_for_profile(self, profile: List[Tuple[str, str]]) -> Optional[List[str]]:
+        """
+        Generate recommendations for a canonical bias profile, memoized in the response cache
+        Returns: List of recommendation strings, or None if no valid response was recovered
+        """
+        if not self.model:
+            raise Exception("API key not configured")
+        
+        cache_key = self._cache_key("recommendations", profile_key(profile))
+        cached = self._cache_get(cache_key, "recommendations")
+        if cached is not None:
+            return cached
+        
+        response = self._generate("recommendations", self._recommendations_prompt(profile))
+        result = self._parse_response("recommendations", response.text)
+        if result is not None:
+            self._cache_set(cache_key, result)
+        return result
+    
+    def prewarm_recommendations(self, table: Dict[str, List[str]]):
+        """Add precomputed recommendations, keyed by profile_key(), e.g. from load_recommendation_table"""
+        self.recommendation_table.update(table)
+    
+    def prescreen_bias(self, transcript: str) -> Dict[str, Any]:
+        """
+        Scan the transcript against the local bias lexicon without a model call
+        Returns: Dictionary with bias_items list
+        """
+        return {"bias_items": prescreen(transcript)}
+    
+    def iter_analysis(self, transcript: str) -> Iterator[Tuple[str, Any]]:
+        """
+        Run the full analysis concurrently, yielding results as they complete
+        Summary and bias detection are fired together; recommendations start
+        as soon as the bias results arrive.
+        Yields: (section, result) pairs where section is one of
+        "summary", "bias" or "recommendations"
+        """
+        if not self.model:
+            raise Exception("API key not configured")
+        
+        start = time.perf_counter()
+        if self.tiers:
+            mode = "tiered"
+            summarize = lambda text: self.route("summary", text)
+            detect = lambda text: self.route("bias", text)
+        elif len(transcript) > self.max_chunk_chars:
+            mode = "chunked"
+            summarize, detect = self.generate_summary_chunked, self.detect_bias_chunked
+        else:
+            mode = "split"
+            summarize, detect = self.generate_summary, self.detect_bias
+        
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            sections = {
+                pool.submit(summarize, transcript): "summary",
+                pool.submit(detect, transcript): "bias",
+            }
+            pending = set(sections)
+            
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    section = sections[future]
+                    result = future.result()
+                    
+                    if section == "bias":
+                        result = self.verify_bias(transcript, result)
+                        follow_up = pool.submit(self.generate_recommendations, result)
+                        sections[follow_up] = "recommendations"
+                        pending.add(follow_up)
+                    
+                    yield section, result
+        
+        self.metrics.record_analysis(mode, time.perf_counter() - start)
+    
+    def analyze_all(self, transcript: str) -> Dict[str, Any]:
+        """
+        Run summary, bias detection and recommendations concurrently
+        Returns: Dictionary with summary, bias and recommendations keys
+        """
+        return dict(self.iter_analysis(transcript))
+    
+    def reuse_analysis(self, transcript: str, fused: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Reuse the stored analysis of a near-duplicate transcript, if the index has one
+        Only analyses made the same way, fused or split, are considered.
+        When every speaker turn matches the stored transcript (whitespace,
+        timestamps or deleted turns aside) its results are reused. Otherwise
+        only the new or edited turns are scanned for bias and merged with the
+        stored findings, and the stored summary is refreshed with those turns
+        (see update_summary()); if that fails the stored summary is kept and
+        flagged as stale.
+        Returns: Dictionary with summary, bias and recommendations keys plus
+        a "reuse" entry (similarity, matched_transcript, action "reused" or
+        "updated", changed_turns, summary_stale), or None when nothing is
+        similar enough
+        """
+        if self.near_duplicates is None:
+            return None
+        if not self.model:
+            raise Exception("API key not configured")
+        
+        # Imported here so the analyzer does not load numpy unless an index is configured
+        from near_duplicates import changed_turns, phrase_present, turn_hashes
+        
+        start = time.perf_counter()
+        scope = self._reuse_scope(fused)
+        match = self.near_duplicates.query(transcript, scope)
+        self.metrics.record_cache("near_duplicate", match is not None)
+        if match is None:
+            return None
+        
+        stored = match['results']
+        bias_items = stored['bias'].get('bias_items', [])
+        if set(match['turn_hashes']) - set(turn_hashes(transcript)):
+            # Turns were removed: drop findings quoted from them
+            bias_items = [item for item in bias_items if phrase_present(item.get('Example_Phrase', ''), transcript)]
+        
+        changed = changed_turns(transcript, match['turn_hashes'])
+        results = dict(stored)
+        summary_stale = False
+        if changed:
+            found = self.detect_bias_chunked("\n\n".join(changed))['bias_items']
+            bias_items = merge_bias_items([bias_items, found])
+            try:
+                summary = self.update_summary(stored['summary'], "\n\n".join(changed))
+            except Exception:
+                # The stored summary is kept and flagged as stale below
+                summary = None
+            if summary is not None:
+                results['summary'] = summary
+            else:
+                summary_stale = True
+        
+        # Stored offsets point into the matched transcript, so findings are located again in this one
+        results['bias'] = self.verify_bias(transcript, dict(stored['bias'], bias_items=bias_items))
+        if changed or len(results['bias']['bias_items']) != len(stored['bias'].get('bias_items', [])):
+            results['recommendations'] = self.generate_recommendations(results['bias'])
+        
+        action = "updated" if changed else "reused"
+        if not analysis_failed(results) and not summary_stale:
+            self.near_duplicates.add(transcript, results, scope)
+        self.metrics.record_analysis(action, time.perf_counter() - start)
+        results['reuse'] = {
+            "similarity": match['similarity'],
+            "matched_transcript": match['transcript_hash'],
+            "action": action,
+            "changed_turns": len(changed),
+            "summary_stale": summary_stale,
+        }
+        return results
+    
+    def remember_analysis(self, transcript: str, results: Dict[str, Any], fused: bool = False):
+        """Index a completed analysis for reuse_analysis(fused=...); results with error placeholders are skipped"""
+        if self.near_duplicates is not None and not analysis_failed(results):
+            results = {key: value for key, value in results.items() if key != 'reuse'}
+            self.near_duplicates.add(transcript, results, self._reuse_scope(fused))
+    
+    def detect_bias_chunked(self, transcript: str) -> Dict[str, Any]:
+        """
+        Detect biases in a long transcript by scanning overlapping chunks in parallel
+        Duplicate findings from overlapping chunks are merged.
+        Returns: Dictionary with bias_items list
+        """
+        chunks = chunk_transcript(transcript, self.max_chunk_chars, self.chunk_overlap_turns)
+        if len(chunks) == 1:
+            return self.detect_bias(transcript)
+        
+        with ThreadPoolExecutor(max_workers=self.chunk_workers) as pool:
+            chunk_results = list(pool.map(self.detect_bias, chunks))
+        
+        result = {"bias_items": merge_bias_items(result.get('bias_items', []) for result in chunk_results)}
+        confidences = [chunk['confidence'] for chunk in chunk_results if 'confidence' in chunk]
+        if confidences:
+            # The least certain chunk bounds confidence in the whole
+            result['confidence'] = min(confidences)
+        return result
+    
+    def verify_bias(self, transcript: str, bias: Dict[str, Any], offsets: bool = True,
+                    index: Optional[PhraseIndex] = None) -> Dict[str, Any]:
+        """
+        Drop bias findings whose quoted phrase cannot be found in the transcript
+        Kept findings quote the transcript's own text and carry a Match_Score,
+        and Start/End offsets unless offsets is false; see
+        verification.verify_bias(). An index already built for the transcript
+        may be passed in. Results are returned unchanged when
+        min_match_score is None.
+        Returns: Dictionary with bias_items list and an unverified count
+        """
+        if self.min_match_score is None or not bias.get('bias_items'):
+            return bias
+        result = verify_bias(transcript, bias, index, min_score=self.min_match_score, offsets=offsets)
+        exact = sum(1 for item in result['bias_items'] if item.get('Match_Score') == 1.0)
+        self.metrics.record_phrases("exact", exact)
+        self.metrics.record_phrases("fuzzy", sum(1 for item in result['bias_items'] if 'Match_Score' in item) - exact)
+        self.metrics.record_phrases("dropped", result['unverified'])
+        return result
+    
+    def route(self, section: str, transcript: str) -> Any:
+        """
+        Run one section ("summary" or "bias") on each model tier in turn until a result needs no escalation
+        Returns: the last tier's result
+        """
+        for index, (tier, analyzer) in enumerate(self.tiers):
+            start = time.perf_counter()
+            if section == "summary":
+                result = analyzer.generate_summary_chunked(transcript)
+            else:
+                result = analyzer.detect_bias_chunked(transcript)
+            escalation = self.escalation_reason(section, result) if index + 1 < len(self.tiers) else None
+            self.metrics.record_tier(tier, analyzer.model_name, section, time.perf_counter() - start, escalation)
+            if escalation is None:
+                break
+        return result
+    
+    def escalation_reason(self, section: str, result: Any) -> Optional[str]:
+        """
+        Why a section's result should be redone by a stronger model tier
+        Returns: "error", "parse_failed", "bias_found", "low_confidence", or
+        None to keep the result
+        """
+        if analysis_failed({section: result}):
+            return "error"
+        if section == "summary":
+            return "parse_failed" if result == self._parse_summary_fallback("") else None
+        if result.get('bias_items'):
+            return "bias_found"
+        try:
+            confidence = float(result.get('confidence', 1.0))
+        except (TypeError, ValueError):
+            confidence = 0.0
+        return "low_confidence" if confidence < self.escalation_threshold else None
+    
+    def update_summary(self, summary: Optional[Dict[str, Any]], new_turns: str) -> Optional[Dict[str, Any]]:
+        """
+        Refresh a running summary with the turns spoken since it was written
+        Only the previous summary and the new turns are sent, so the prompt
+        stays about the same size however long the interview gets. With no
+        previous summary the new turns are summarized on their own.
+        Returns: Dictionary with executive_summary, strengths, improvements,
+        recommendation, or None if no valid response was recovered
+        """
+        if not self.model:
+            raise Exception("API key not configured")
+        
+        if summary is None:
+            kind, payload, prompt = "summary", new_turns, self._summary_prompt(new_turns)
+        else:
+            kind = "summary_update"
+            payload = json.dumps(summary, sort_keys=True) + "\n\n" + new_turns
+            prompt = self._update_summary_prompt(summary, new_turns)
+        
+        cache_key = self._cache_key(kind, payload)
+        cached = self._cache_get(cache_key, kind)
+        if cached is not None:
+            return cached
+        
+        response = self._generate(kind, prompt)
+        result = self._parse_response("summary", response.text)
+        if result is not None:
+            self._cache_set(cache_key, result)
+        return result
+    
+    def start_session(self, context_turns: int = 1):
+        """
+        Begin incremental analysis of a transcript that grows during the interview
+        Returns: live_session.LiveSession; append() new turns and call update()
+        """
+        # live_session imports this module
+        from live_session import LiveSession
+        return LiveSession(self, context_turns)
+    
+    def generate_summary_chunked(self, transcript: str) -> Dict[str, Any]:
+        """
+        Summarize a long transcript map-reduce style
+        Each chunk is summarized in parallel, then the partial summaries are
+        combined into one with a final, transcript-free model call.
+        Returns: Dictionary with executive_summary, strengths, improvements, recommendation
+        """
+        chunks = chunk_transcript(transcript, self.max_chunk_chars, self.chunk_overlap_turns)
+        if len(chunks) == 1:
+            return self.generate_summary(transcript)
+        
+        cache_key = self._cache_key("summary_reduce", transcript)
+        cached = self._cache_get(cache_key, "summary_reduce")
+        if cached is not None:
+            return cached
+        
+        with ThreadPoolExecutor(max_workers=self.chunk_workers) as pool:
+            partials = list(pool.map(self.generate_summary, chunks))
+        
+        return self._reduce_summaries(cache_key, partials)
+    
+    def analyze_chunks(self, chunks: Iterable[str]) -> Dict[str, Any]:
+        """
+        Analyze a transcript supplied lazily as chunks, e.g. from ingest.iter_chunks()
+        Each chunk is summarized and scanned for bias as it arrives, with at
+        most chunk_workers chunks in flight, so the transcript is never held
+        whole. Partial summaries are then reduced into one and bias findings
+        merged before recommendations are generated.
+        Returns: Dictionary with summary, bias and recommendations keys
+        """
+        if not self.model:
+            raise Exception("API key not configured")
+        
+        start = time.perf_counter()
+        # The reduce step is cached under a digest of the chunks, not their text
+        digest = hashlib.sha256()
+        partials = []
+        bias_items = []
+        
+        with ThreadPoolExecutor(max_workers=self.chunk_workers * 2) as pool:
+            pending = deque()
+            
+            def collect():
+                nonlocal bias_items
+                chunk, summary_future, bias_future = pending.popleft()
+                partials.append(summary_future.result())
+                # Offsets into a chunk mean nothing once the chunks are merged
+                found = self.verify_bias(chunk, bias_future.result(), offsets=False)
+                bias_items = merge_bias_items([bias_items, found.get('bias_items', [])])
             
-        prompt = f"""
+            for chunk in chunks:
+                digest.update(chunk.encode("utf-8") + b"\0")
+                pending.append((chunk, pool.submit(self.generate_summary, chunk), pool.submit(self.detect_bias, chunk)))
+                if len(pending) >= self.chunk_workers:
+                    collect()
+            while pending:
+                collect()
+        
+        if len(partials) > 1:
+            cache_key = self._cache_key("summary_reduce", digest.hexdigest())
+            summary = self._cache_get(cache_key, "summary_reduce")
+            if summary is None:
+                summary = self._reduce_summaries(cache_key, partials)
+        else:
+            summary = partials[0] if partials else {}
+        bias = {"bias_items": bias_items}
+        results = {
+            "summary": summary,
+            "bias": bias,
+            "recommendations": self.generate_recommendations(bias),
+        }
+        self.metrics.record_analysis("streamed", time.perf_counter() - start)
+        return results
+    
+    def analyze_fused(self, transcript: str) -> Dict[str, Any]:
+        """
+        Run summary, bias detection and recommendations in a single model call
+        The transcript is sent once and all three sections come back in one
+        JSON document. Any section that is missing or malformed is recomputed
+        with its per-call method.
+        Returns: Dictionary with summary, bias and recommendations keys
+        """
+        if not self.model:
+            raise Exception("API key not configured")
+        
+        start = time.perf_counter()
+        cache_key = self._cache_key("fused", transcript)
+        cached = self._cache_get(cache_key, "fused")
+        if cached is not None:
+            # Cache keys ignore whitespace, so offsets are located in this transcript
+            result = dict(cached, bias=self.verify_bias(transcript, cached['bias']))
+            self.metrics.record_analysis("fused", time.perf_counter() - start)
+            return result
+        
+        prompt = self._fused_prompt(transcript)
+        
+        data = None
+        try:
+            response = self._generate("fused", prompt)
+            data = extract_json(response.text)
+        except Exception:
+            # Every section falls back to its own call below
+            data = None
+        data = data or {}
+        
+        summary = data.get('summary')
+        bias = {"bias_items": data.get('bias_items')}
+        recommendations = data.get('recommendations')
+        
+        fused_ok = True
+        if validate_summary(summary):
+            summary = self.generate_summary(transcript)
+            fused_ok = False
+        
+        if validate_bias(bias):
+            bias = self.detect_bias(transcript)
+            fused_ok = False
+        unverified_bias = bias
+        bias = self.verify_bias(transcript, bias)
+        
+        if not bias.get('bias_items'):
+            # Same canned response the per-call path gives for a clean interview
+            recommendations = self.generate_recommendations(bias)
+        elif validate_recommendations(recommendations):
+            recommendations = self.generate_recommendations(bias)
+            fused_ok = False
+        elif bias.get('unverified'):
+            # The fused recommendations may address findings that were dropped
+            recommendations = self.generate_recommendations(bias)
+        
+        result = {"summary": summary, "bias": bias, "recommendations": recommendations}
+        self.metrics.record_parse("fused", "ok" if fused_ok else "fallback")
+        if fused_ok:
+            # Cached before verification, so no offsets into this transcript are stored
+            self._cache_set(cache_key, dict(result, bias=unverified_bias))
+        self.metrics.record_analysis("fused", time.perf_counter() - start)
+        return result
+    
+    def stream_summary(self, transcript: str) -> Iterator[Tuple[str, Any]]:
+        """
+        Stream the structured summary, yielding fields as soon as they close
+        Yields: ("executive_summary", str), ("strength", str), ("improvement", str)
+        and ("recommendation", str) events, then ("result", full summary dict)
+        """
+        if not self.model:
+            raise Exception("API key not configured")
+        
+        cache_key = self._cache_key("summary", transcript)
+        cached = self._cache_get(cache_key, "summary")
+        if cached is not None:
+            yield "result", cached
+            return
+        
+        state = {}
+        try:
+            yield from self._stream_events("summary", self._summary_prompt(transcript), _summary_event, state)
+            result = self._parse_response("summary", state["text"], parsed=state["result"])
+            if result is not None:
+                self._cache_set(cache_key, result)
+            else:
+                result = self._parse_summary_fallback(state["text"])
+        except Exception as e:
+            result = self._summary_error(e)
+        
+        yield "result", result
+    
+    def stream_bias(self, transcript: str) -> Iterator[Tuple[str, Any]]:
+        """
+        Stream bias detection, yielding each bias item as soon as it closes
+        Yields: ("bias_item", dict) events, then ("result", {"bias_items": [...]})
+        """
+        if not self.model:
+            raise Exception("API key not configured")
+        
+        screened = self._screened_bias(transcript)
+        if screened is not None:
+            yield "result", screened
+            return
+        
+        transcript = self._bias_input(transcript)
+        cache_key = self._cache_key("bias", transcript)
+        cached = self._cache_get(cache_key, "bias")
+        if cached is not None:
+            yield "result", cached
+            return
+        
+        state = {}
+        try:
+            yield from self._stream_events("bias", self._bias_prompt(transcript), _bias_event, state)
+            result = self._parse_response("bias", state["text"], parsed=state["result"])
+            if result is not None:
+                self._cache_set(cache_key, result)
+            else:
+                result = _UNPARSED_BIAS.copy()
+        except Exception as e:
+            result = self._bias_error(e)
+        
+        yield "result", result
+    
+    def iter_analysis_events(self, transcript: str) -> Iterator[Tuple[str, str, Any]]:
+        """
+        Streaming counterpart of iter_analysis
+        Summary and bias detection stream concurrently; recommendations start
+        once the bias result is complete.
+        Yields: (section, event, value) triples from stream_summary and
+        stream_bias, plus ("recommendations", "result", list); streamed bias
+        items are verified against the transcript as they arrive and only
+        those found are yielded
+        Long transcripts use the chunked path, and tiered analyzers route
+        through iter_analysis; both only yield "result" events.
+        """
+        if not self.model:
+            raise Exception("API key not configured")
+        
+        if len(transcript) > self.max_chunk_chars or self.tiers:
+            for section, result in self.iter_analysis(transcript):
+                yield section, "result", result
+            return
+        
+        start = time.perf_counter()
+        events = queue.Queue()
+        # Built on the first streamed bias item and shared with the final result
+        index = None
+        
+        def pump(section, stream):
+            try:
+                for event, value in stream:
+                    events.put((section, event, value))
+            except Exception as e:
+                events.put((section, "error", e))
+            finally:
+                events.put((section, None, None))
+        
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            pool.submit(pump, "summary", self.stream_summary(transcript))
+            pool.submit(pump, "bias", self.stream_bias(transcript))
+            open_streams = 2
+            
+            while open_streams:
+                section, event, value = events.get()
+                if event is None:
+                    open_streams -= 1
+                    continue
+                if event == "error":
+                    raise value
+                
+                if section == "bias" and event == "bias_item" and self.min_match_score is not None:
+                    index = index or PhraseIndex(transcript)
+                    verified, _ = verify_bias_items(transcript, [value], index, self.min_match_score)
+                    if not verified:
+                        continue
+                    value = verified[0]
+                elif section == "bias" and event == "result":
+                    value = self.verify_bias(transcript, value, index=index)
+                    pool.submit(pump, "recommendations", self._recommendation_events(value))
+                    open_streams += 1
+                
+                yield section, event, value
+        
+        self.metrics.record_analysis("streaming", time.perf_counter() - start)
+    
+    def _recommendation_events(self, bias_data: Dict[str, Any]) -> Iterator[Tuple[str, Any]]:
+        """Adapt generate_recommendations to the (event, value) stream shape"""
+        yield "result", self.generate_recommendations(bias_data)
+    
+    def _stream_events(self, kind: str, prompt: str, event_for_path,
+                       state: Dict[str, Any]) -> Iterator[Tuple[str, Any]]:
+        """
+        Stream a prompt through the incremental JSON parser
+        Yields (event, value) for every completed value event_for_path names,
+        then leaves the parsed root in state["result"] (None if the stream never
+        produced a complete document) and the raw text in state["text"].
+        """
+        parser = IncrementalJSONParser()
+        chunks = []
+        for chunk in self._stream(kind, prompt):
+            chunks.append(chunk)
+            if parser is None:
+                continue
+            try:
+                completed = parser.feed(chunk)
+            except (ValueError, IndexError):
+                # Malformed output: keep collecting text for the regex fallback
+                parser = None
+                continue
+            for path, value in completed:
+                event = event_for_path(path)
+                if event:
+                    yield event, value
+        
+        state["result"] = parser.result if parser is not None else None
+        state["text"] = "".join(chunks)
+    
+    def _generate(self, kind: str, prompt: str):
+        """Make one model call, recording its latency, size, token usage and any error"""
+        start = time.perf_counter()
+        try:
+            response = self.model.generate_content(prompt)
+            response_chars = len(response.text)
+        except Exception as e:
+            self.metrics.record_call(kind, self.model_name, time.perf_counter() - start, len(prompt), error=e)
+            raise
+        self.metrics.record_call(kind, self.model_name, time.perf_counter() - start, len(prompt),
+                                 response_chars, usage=getattr(response, 'usage_metadata', None))
+        return response
+    
+    def _stream(self, kind: str, prompt: str) -> Iterator[str]:
+        """Streaming counterpart of _generate; the call is recorded once the stream ends"""
+        start = time.perf_counter()
+        first_chunk = None
+        response_chars = 0
+        try:
+            for chunk in self.model.stream_content(prompt):
+                if first_chunk is None:
+                    first_chunk = time.perf_counter() - start
+                response_chars += len(chunk)
+                yield chunk
+        except Exception as e:
+            self.metrics.record_call(kind, self.model_name, time.perf_counter() - start, len(prompt),
+                                     response_chars, error=e, first_chunk_latency=first_chunk)
+            raise
+        self.metrics.record_call(kind, self.model_name, time.perf_counter() - start, len(prompt),
+                                 response_chars, first_chunk_latency=first_chunk)
+    
+    def _summary_prompt(self, transcript: str) -> str:
+        """Build the structured summary prompt"""
+        return f"""
         Analyze this interview transcript and provide a structured summary in JSON format.
         
         Interview Transcript:
@@ -50,33 +808,10 @@ class InterviewAnalyzer:
         
         Keep it concise and professional. Return only valid JSON.
         """
-        
-        try:
-            response = self.model.generate_content(prompt)
-            # Extract JSON from response
-            json_match = re.search(r'\{.*\}', response.text, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
-            else:
-                # Fallback if JSON parsing fails
-                return self._parse_summary_fallback(response.text)
-        except Exception as e:
-            return {
-                "executive_summary": "Analysis failed. Please check your API key and try again.",
-                "strengths": [],
-                "improvements": [],
-                "recommendation": f"Error: {str(e)}"
-            }
     
-    def detect_bias(self, transcript: str) -> Dict[str, Any]:
-        """
-        Detect potential biases in interview questions and discussion
-        Returns: Dictionary with bias_items list
-        """
-        if not self.model:
-            raise Exception("API key not configured")
-            
-        prompt = f"""
+    def _bias_prompt(self, transcript: str) -> str:
+        """Build the bias detection prompt"""
+        return f"""
         Analyze this interview transcript for potential biases and discriminatory language.
         
         Interview Transcript:
@@ -102,53 +837,24 @@ class InterviewAnalyzer:
                     "Example_Phrase": "exact phrase from transcript",
                     "Severity": "Low/Medium/High"
                 }}
-            ]
+            ],
+            "confidence": 0.0
         }}
         
         Only include clear examples of bias. If no significant biases are found, return empty bias_items array.
         Be specific about phrases and accurate about severity levels.
+        Set confidence to a number from 0 to 1 saying how sure you are that bias_items is complete and correct.
         Return only valid JSON.
         """
-        
-        try:
-            response = self.model.generate_content(prompt)
-            # Extract JSON from response
-            json_match = re.search(r'\{.*\}', response.text, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
-            else:
-                return {"bias_items": []}
-        except Exception as e:
-            return {
-                "bias_items": [{
-                    "Bias_Type": "Analysis Error",
-                    "Example_Phrase": f"Failed to analyze: {str(e)}",
-                    "Severity": "Unknown"
-                }]
-            }
     
-    def generate_recommendations(self, bias_data: Dict[str, Any]) -> List[str]:
-        """
-        Generate actionable recommendations based on bias detection results
-        Returns: List of recommendation strings
-        """
-        if not self.model:
-            return ["API key not configured"]
-            
-        bias_items = bias_data.get('bias_items', [])
-        
-        if not bias_items:
-            return [
-                "Great job! No significant biases were detected in this interview.",
-                "Continue following structured interview practices and focusing on job-relevant skills.",
-                "Consider using standardized questions to maintain consistency across all candidates."
-            ]
-        
-        prompt = f"""
+    def _recommendations_prompt(self, profile: List[Tuple[str, str]]) -> str:
+        """Build the recommendations prompt from a canonical bias profile"""
+        bias_lines = "\n        ".join(f"- {category} (highest severity: {severity})" for category, severity in profile)
+        return f"""
         Based on these detected biases in an interview, provide 3-5 specific, actionable recommendations for improvement:
         
-        Detected Biases:
-        {json.dumps(bias_items, indent=2)}
+        Detected Bias Categories:
+        {bias_lines}
         
         Provide recommendations that are:
         - Specific and actionable
@@ -161,18 +867,206 @@ class InterviewAnalyzer:
         
         Each recommendation should be 1-2 sentences maximum.
         """
+    
+    def _reduce_summary_prompt(self, partials: List[Dict[str, Any]]) -> str:
+        """Build the prompt that merges per-chunk summaries into one"""
+        return f"""
+        The following are structured summaries of consecutive segments of a single interview,
+        in order. Combine them into one summary of the whole interview.
+        
+        Segment Summaries:
+        {json.dumps(partials, indent=2)}
+        
+        Please return a JSON object with these exact keys:
+        {{
+            "executive_summary": "2-3 sentence overview of the interview",
+            "strengths": ["list", "of", "candidate", "strengths"],
+            "improvements": ["areas", "for", "improvement"],
+            "recommendation": "overall hiring recommendation with brief reasoning"
+        }}
+        
+        Merge duplicate strengths and improvements, and base the recommendation on the
+        interview as a whole. Keep it concise and professional. Return only valid JSON.
+        """
+    
+    def _update_summary_prompt(self, summary: Dict[str, Any], new_turns: str) -> str:
+        """Build the prompt that folds newly spoken turns into a running summary"""
+        return f"""
+        Below is a structured summary of an interview in progress, followed by the
+        turns spoken since it was written. Update the summary to cover the whole
+        interview so far.
+        
+        Current Summary:
+        {json.dumps(summary, indent=2)}
+        
+        New Turns:
+        {new_turns}
+        
+        Please return a JSON object with these exact keys:
+        {{
+            "executive_summary": "2-3 sentence overview of the interview",
+            "strengths": ["list", "of", "candidate", "strengths"],
+            "improvements": ["areas", "for", "improvement"],
+            "recommendation": "overall hiring recommendation with brief reasoning"
+        }}
+        
+        Keep strengths and improvements that still hold, add what the new turns show,
+        and revise the recommendation if they change it. Keep it concise and
+        professional. Return only valid JSON.
+        """
+    
+    def _repair_prompt(self, kind: str, text: str, errors: List[str]) -> str:
+        """Build the prompt asking the model to fix a malformed response"""
+        error_lines = "\n".join(f"- {error}" for error in errors[:10])
+        return f"""
+        The response below was supposed to be valid JSON with this structure:
+        {_RESPONSE_SHAPES[kind]}
+        
+        It has these problems:
+        {error_lines}
+        
+        Response:
+        {text}
+        
+        Return only the corrected JSON, keeping the original content wherever possible.
+        """
+    
+    def _fused_prompt(self, transcript: str) -> str:
+        """Build the single-call prompt covering all three sections"""
+        return f"""
+        Analyze this interview transcript. Produce a structured summary of the candidate,
+        detect potential biases and discriminatory language by the interviewer, and
+        recommend improvements to the interview practice.
+        
+        Interview Transcript:
+        {transcript}
+        
+        For the summary, focus on technical skills, communication abilities, problem-solving
+        approach, cultural fit indicators and professional experience relevance.
         
+        For bias detection, look for biases related to Gender/Sex, Age, Race/Ethnicity, Religion,
+        Sexual Orientation, Disability, Education Background, Socioeconomic Status, Appearance
+        and Personal Life. Only include clear examples of bias; use an empty array if none are found.
+        
+        If biases are found, give 3-5 specific, actionable, constructive recommendations
+        (1-2 sentences each) aimed at fair and inclusive hiring. If none are found, use an empty array.
+        
+        Return a single JSON object with this exact structure:
+        {{
+            "summary": {{
+                "executive_summary": "2-3 sentence overview of the interview",
+                "strengths": ["list", "of", "candidate", "strengths"],
+                "improvements": ["areas", "for", "improvement"],
+                "recommendation": "overall hiring recommendation with brief reasoning"
+            }},
+            "bias_items": [
+                {{
+                    "Bias_Type": "specific bias category",
+                    "Example_Phrase": "exact phrase from transcript",
+                    "Severity": "Low/Medium/High"
+                }}
+            ],
+            "recommendations": ["recommendation 1", "recommendation 2", "recommendation 3"]
+        }}
+        
+        Keep it concise and professional. Return only valid JSON.
+        """
+    
+    def _parse_response(self, kind: str, text: str, parsed: Any = None) -> Optional[Any]:
+        """
+        Extract and validate a summary, bias or recommendations response
+        A response that fails validation gets one repair request, which sends
+        only the broken output and the schema errors, not the transcript.
+        Returns: the validated result, or None if it could not be recovered
+        """
+        opener, validate = _RESPONSE_SCHEMAS[kind]
+        data = parsed if parsed is not None else _extract_result(kind, text, opener)
+        errors = validate(data) if data is not None else ["no JSON value found in the response"]
+        if not errors:
+            self.metrics.record_parse(kind, "ok")
+            return data
+        
+        response = self._generate(f"{kind}_repair", self._repair_prompt(kind, text, errors))
+        data = _extract_result(kind, response.text, opener)
+        if data is not None and not validate(data):
+            self.metrics.record_parse(kind, "repaired")
+            return data
+        self.metrics.record_parse(kind, "failed")
+        return None
+    
+    def _screened_bias(self, transcript: str) -> Optional[Dict[str, Any]]:
+        """Bias result decided by the local pre-screen alone, or None when the model is needed"""
+        if self.bias_mode in ("llm", "interviewer"):
+            return None
+        local = self.prescreen_bias(transcript)
+        if self.bias_mode == "fast":
+            return local
+        if local['bias_items'] or has_bias_cues(transcript):
+            return None
+        return local
+    
+    def _bias_input(self, transcript: str) -> str:
+        """Text sent for bias detection: the interviewer excerpt in "interviewer" mode, else the transcript"""
+        if self.bias_mode != "interviewer":
+            return transcript
+        # Transcripts without recognizable interviewer turns are sent whole
+        return interviewer_excerpt(transcript) or transcript
+    
+    def _reduce_summaries(self, cache_key: str, partials: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Combine per-chunk summaries with one transcript-free model call"""
         try:
-            response = self.model.generate_content(prompt)
-            # Extract JSON array from response
-            json_match = re.search(r'\[.*\]', response.text, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
+            response = self._generate("summary_reduce", self._reduce_summary_prompt(partials))
+            result = self._parse_response("summary", response.text)
+            if result is not None:
+                self._cache_set(cache_key, result)
+                return result
             else:
-                # Fallback recommendations
-                return self._generate_fallback_recommendations(bias_items)
+                return self._parse_summary_fallback(response.text)
         except Exception as e:
-            return [f"Error generating recommendations: {str(e)}"]
+            return self._summary_error(e)
+    
+    def _reuse_scope(self, fused: bool = False) -> str:
+        """
+        Near-duplicate index partition: results only carry over between identical configurations
+        Fused analyses ignore bias_mode, so they are kept apart from split ones.
+        """
+        return f"{self.PROMPT_VERSION}:{self.model_name}:{self.bias_mode}:{'fused' if fused else 'split'}"
+    
+    def _cache_key(self, kind: str, payload: str) -> str:
+        """Build the content-addressed cache key for one analyzer call"""
+        return ResponseCache.make_key(kind, payload, self.PROMPT_VERSION, self.model_name)
+    
+    def _cache_get(self, key: str, kind: str) -> Optional[Any]:
+        """Look up a parsed result, returning None when caching is disabled or on a miss"""
+        if self.cache is None:
+            return None
+        value = self.cache.get(key)
+        self.metrics.record_cache(kind, value is not None)
+        return value
+    
+    def _cache_set(self, key: str, value: Any):
+        """Store a successfully parsed result; fallbacks and errors are never cached"""
+        if self.cache is not None:
+            self.cache.set(key, value)
+    
+    def _summary_error(self, error: Exception) -> Dict[str, Any]:
+        """Placeholder summary shown when the model call fails"""
+        return {
+            "executive_summary": "Analysis failed. Please check your API key and try again.",
+            "strengths": [],
+            "improvements": [],
+            "recommendation": f"Error: {str(error)}"
+        }
+    
+    def _bias_error(self, error: Exception) -> Dict[str, Any]:
+        """Placeholder bias result shown when the model call fails"""
+        return {
+            "bias_items": [{
+                "Bias_Type": "Analysis Error",
+                "Example_Phrase": f"Failed to analyze: {str(error)}",
+                "Severity": "Unknown"
+            }]
+        }
     
     def _parse_summary_fallback(self, text: str) -> Dict[str, Any]:
         """Fallback parser if JSON extraction fails"""
@@ -201,4 +1095,56 @@ class InterviewAnalyzer:
         recommendations.append("Use structured interviews with standardized questions for all candidates.")
         recommendations.append("Consider having multiple interviewers to reduce individual bias.")
         
-        return recommendations[:5]  # Return max 5 recommendations
\ No newline at end of file
+        return recommendations[:5]  # Return max 5 recommendations
+
+# Bias result when no valid response was recovered: nothing was found, but
+# with no confidence, so a tiered analyzer escalates it
+_UNPARSED_BIAS = {"bias_items": [], "confidence": 0.0}
+
+def analysis_failed(results: Dict[str, Any]) -> bool:
+    """Whether any section holds an error placeholder instead of a real result"""
+    summary = results.get('summary', {})
+    bias_items = results.get('bias', {}).get('bias_items', [])
+    recommendations = results.get('recommendations', [])
+    return (
+        str(summary.get('recommendation', '')).startswith("Error:")
+        or any(item.get('Bias_Type') == "Analysis Error" for item in bias_items)
+        or any(str(rec).startswith("Error generating") for rec in recommendations)
+    )
+
+def _summary_event(path: Tuple) -> Optional[str]:
+    """Map a parsed summary path to its streaming event name"""
+    if path in (("executive_summary",), ("recommendation",)):
+        return path[0]
+    if len(path) == 2 and path[0] in ("strengths", "improvements"):
+        return path[0][:-1]
+    return None
+
+def _bias_event(path: Tuple) -> Optional[str]:
+    """Map a parsed bias path to its streaming event name"""
+    if len(path) == 2 and path[0] == "bias_items":
+        return "bias_item"
+    return None
+
+# Expected top-level JSON kind and validator for each response type
+_RESPONSE_SCHEMAS = {
+    "summary": ("{", validate_summary),
+    "bias": ("{", validate_bias),
+    "recommendations": ("[", validate_recommendations),
+}
+
+# Shapes quoted back to the model in repair requests
+_RESPONSE_SHAPES = {
+    "summary": '{"executive_summary": "...", "strengths": ["..."], "improvements": ["..."], "recommendation": "..."}',
+    "bias": '{"bias_items": [{"Bias_Type": "...", "Example_Phrase": "...", "Severity": "Low/Medium/High"}], "confidence": 0.9}',
+    "recommendations": '["recommendation 1", "recommendation 2", "recommendation 3"]',
+}
+
+def _extract_result(kind: str, text: str, opener: str) -> Optional[Any]:
+    """Extract a response value, unwrapping {"recommendations": [...]} objects"""
+    data = extract_json(text, opener)
+    if data is None and kind == "recommendations":
+        wrapper = extract_json(text, "{")
+        if isinstance(wrapper, dict):
+            data = wrapper.get("recommendations")
+    return data
@@ -1,40 +1,138 @@
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
-import matplotlib.pyplot as plt
-import pandas as pd
+import html
 import os
-from collections import Counter
+import time
+import uuid
+from datetime import datetime, timedelta
 from dotenv import load_dotenv
-from analyzer import InterviewAnalyzer
+from analytics import suspicious_phrases, suspicious_word_counts
+from analyzer import InterviewAnalyzer, analysis_failed
+from backends import api_keys_from_env, fake_backend_from_env, gemini_backend, model_tiers_from_env
+from cache import ResponseCache
+from ingest import TRANSCRIPT_EXTENSIONS, read_transcript
+from jobs import FINISHED_STATES, JobQueue
+from recommendations import BIAS_CATEGORIES, load_recommendation_table
 from sample_data import SAMPLE_INTERVIEWS
+from scheduler import ScheduledBackend, combined_stats, scheduler_from_env
+from store import AnalysisStore
+from verification import MIN_MATCH_SCORE
 
 load_dotenv()
 
+# Longest transcript excerpt echoed back into the page
+PREVIEW_CHARS = 20000
+
 # Configure page
 st.set_page_config(
     page_title="AI Interview Analyzer",
     layout="wide"
 )
 
+@st.cache_resource(show_spinner=False)
+def get_response_cache():
+    """Open the on-disk model response cache once per server process"""
+    return ResponseCache(os.getenv('ANALYZER_CACHE_PATH', '.cache/responses.sqlite3'))
+
+@st.cache_resource(show_spinner=False)
+def get_result_cache():
+    """Bounded in-memory memo of finished analyses, shared by every session"""
+    return ResponseCache(
+        max_memory_items=int(os.getenv('ANALYZER_RESULT_CACHE_SIZE', '128')),
+        ttl_seconds=3600
+    )
+
+@st.cache_resource(show_spinner=False)
+def get_analysis_store():
+    """Open the searchable history of completed analyses once per server process"""
+    return AnalysisStore(os.getenv('ANALYZER_STORE_PATH', '.cache/analyses.sqlite3'))
+
+@st.cache_resource(show_spinner=False)
+def get_bias_dataset():
+    """Open the columnar cross-interview bias dataset once per server process"""
+    # Imported here so app startup does not pay for pandas and pyarrow
+    from bias_dataset import BiasDataset
+    return BiasDataset(os.getenv('ANALYZER_ANALYTICS_PATH', '.cache/bias_analytics'))
+
+@st.cache_resource(show_spinner=False)
+def get_near_duplicate_index():
+    """Open the near-duplicate transcript index once per server process"""
+    # Imported here so app startup does not pay for numpy
+    from near_duplicates import NearDuplicateIndex
+    return NearDuplicateIndex(
+        os.getenv('ANALYZER_NEAR_DUPLICATE_PATH', '.cache/near_duplicates.sqlite3'),
+        threshold=float(os.getenv('ANALYZER_NEAR_DUPLICATE_THRESHOLD', '0.7'))
+    )
+
+@st.cache_resource(show_spinner=False)
+def get_schedulers():
+    """Rate limiter, circuit breaker and in-flight table per API key and model, shared by every session"""
+    return {}
+
+def scheduled(api_key, backend):
+    """Route a backend through the scheduler for its API key and model"""
+    schedulers = get_schedulers()
+    key = (api_key, backend.model_name)
+    if key not in schedulers:
+        # setdefault keeps the first one if two sessions race here
+        schedulers.setdefault(key, scheduler_from_env())
+    return ScheduledBackend(backend, schedulers[key])
+
+@st.cache_resource(show_spinner=False)
+def get_job_queue():
+    """One analysis job queue and worker pool for every session"""
+    per_user_limit = os.getenv('ANALYZER_JOB_PER_USER_LIMIT')
+    return JobQueue(
+        concurrency=int(os.getenv('ANALYZER_JOB_CONCURRENCY', '4')),
+        per_user_limit=int(per_user_limit) if per_user_limit else None
+    )
+
+@st.cache_resource(show_spinner=False)
+def get_analyzer(api_keys, use_fake_backend, bias_mode):
+    """Configure one analyzer per key set, backend and bias mode, shared by every session"""
+    analyzer = InterviewAnalyzer(cache=get_response_cache(), bias_mode=bias_mode,
+                                 near_duplicates=get_near_duplicate_index(),
+                                 escalation_threshold=float(os.getenv('ANALYZER_ESCALATION_THRESHOLD', '0.7')),
+                                 min_match_score=float(os.getenv('ANALYZER_MIN_MATCH_SCORE', str(MIN_MATCH_SCORE))))
+    
+    def backend(model_name, tier=None):
+        if use_fake_backend:
+            return scheduled("fake", fake_backend_from_env(model_name=f"fake-{tier}" if tier else "fake"))
+        # Calls rotate across every configured API key, each with its own rate limits
+        return gemini_backend(list(api_keys), model_name, wrap=scheduled)
+    
+    tiers = model_tiers_from_env()
+    if tiers:
+        analyzer.set_tiers([(tier, backend(model_name, tier)) for tier, model_name in tiers])
+    else:
+        analyzer.set_backend(backend(analyzer.model_name))
+    
+    table_path = os.getenv('ANALYZER_RECOMMENDATION_TABLE')
+    if table_path and os.path.exists(table_path):
+        analyzer.prewarm_recommendations(load_recommendation_table(table_path))
+    return analyzer
+
 def main():
     with st.container():
         st.title("AI-Powered Interview Analyzer")
         st.markdown("*Structured summaries with bias detection for fair hiring practices*")
         st.divider()
     
-    # Initialize analyzer with API key from .env
-    analyzer = InterviewAnalyzer()
-    api_key = os.getenv('GEMINI_API_KEY')
-    
-    if not api_key:
-        st.error("GEMINI_API_KEY not found in .env file. Please add your API key to the .env file.")
+    view = st.sidebar.radio("View", ["Analyze", "Search past interviews", "Organization analytics"])
+    if view == "Search past interviews":
+        display_search_view(get_analysis_store())
+        return
+    if view == "Organization analytics":
+        display_analytics_view(get_bias_dataset())
         return
     
-    try:
-        analyzer.set_api_key(api_key)
-    except Exception as e:
-        st.error(f"Failed to configure API key: {str(e)}")
+    api_keys = tuple(api_keys_from_env())
+    use_fake_backend = os.getenv('ANALYZER_BACKEND') == 'fake'
+    
+    if use_fake_backend:
+        # Offline mode with simulated model latency, for load testing and profiling
+        st.warning("Using the local fake model backend - results are canned, not real analysis.")
+    elif not api_keys:
+        st.error("GEMINI_API_KEY not found in .env file. Please add your API key to the .env file.")
         return
     
     with st.container():
@@ -50,21 +148,42 @@ def main():
                     options=list(SAMPLE_INTERVIEWS.keys()),
                     help="Select from various interview scenarios"
                 )
+            interviewer = st.text_input(
+                "Interviewer (optional)",
+                help="Attributes this interview's findings in the organization analytics view"
+            )
         
         with col1:
             if use_sample:
                 transcript = SAMPLE_INTERVIEWS[sample_choice]
                 st.text_area("Interview Transcript", value=transcript, height=200, disabled=True)
             else:
-                transcript = st.text_area(
-                    "Paste the interview transcript here:",
-                    height=200,
-                    placeholder="Enter the complete interview conversation between interviewer and candidate..."
+                uploaded = st.file_uploader(
+                    "Upload a transcript file",
+                    type=[extension.lstrip(".") for extension in TRANSCRIPT_EXTENSIONS],
+                    help="Plain text or WebVTT/SubRip subtitles; timestamps and cue numbers are removed"
                 )
+                if uploaded is not None:
+                    transcript = read_transcript(uploaded)
+                    # Only a preview goes to the browser
+                    st.text_area("Interview Transcript", value=transcript[:PREVIEW_CHARS], height=200, disabled=True)
+                    if len(transcript) > PREVIEW_CHARS:
+                        st.caption(f"Showing the first {PREVIEW_CHARS:,} of {len(transcript):,} characters")
+                else:
+                    transcript = st.text_area(
+                        "Paste the interview transcript here:",
+                        height=200,
+                        placeholder="Enter the complete interview conversation between interviewer and candidate..."
+                    )
         
         st.markdown("---")
         
         col_btn1, col_btn2, col_btn3 = st.columns([1, 2, 1])
+        with col_btn1:
+            fused_mode = st.toggle(
+                "Single-call analysis",
+                help="Request summary, bias detection and recommendations in one model call"
+            )
         with col_btn2:
             analyze_button = st.button(
                 "Analyze Interview", 
@@ -72,39 +191,337 @@ def main():
                 disabled=not transcript,
                 width='stretch'
             )
+        with col_btn3:
+            bias_mode = st.selectbox(
+                "Bias detection",
+                options=["llm", "triage", "fast", "interviewer"],
+                format_func={"llm": "Full (model)", "triage": "Triage", "fast": "Fast (local only)",
+                             "interviewer": "Interviewer turns"}.get,
+                help="Triage skips the model when the local phrase scan finds nothing; "
+                     "Fast returns local phrase matches only; "
+                     "Interviewer turns sends only the interviewer's questions with brief candidate context"
+            )
+    
+    try:
+        analyzer = get_analyzer(api_keys, use_fake_backend, bias_mode)
+    except Exception as e:
+        st.error(f"Failed to configure API key: {str(e)}")
+        return
+    
+    result_cache = get_result_cache()
+    result_key = None
+    if transcript and transcript.strip():
+        result_key = result_cache.make_key(
+            f"analysis:{'fused' if fused_mode else 'split'}:{bias_mode}",
+            transcript, analyzer.PROMPT_VERSION, analyzer.model_name
+        )
+    
+    # Jobs are scheduled fairly between browser sessions
+    user_id = st.session_state.setdefault('user_id', uuid.uuid4().hex)
+    jobs = get_job_queue()
     
     if analyze_button:
         if not transcript.strip():
             st.error("Please provide an interview transcript to analyze")
             return
-            
-        with st.spinner("Analyzing interview transcript..."):
-            try:
-                summary_data = analyzer.generate_summary(transcript)
-                bias_data = analyzer.detect_bias(transcript)
-                recommendations = analyzer.generate_recommendations(bias_data)
-                
-                st.divider()
-                st.header("Analysis Results")
-                
-                tab1, tab2, tab3 = st.tabs(["Summary", "Bias Detection", "Recommendations"])
-                
-                with tab1:
-                    with st.container():
-                        display_summary(summary_data)
-                
-                with tab2:
-                    with st.container():
-                        display_bias_dashboard(bias_data)
-                
-                with tab3:
-                    with st.container():
-                        display_recommendations(recommendations)
-                
-            except Exception as e:
-                st.error(f"Analysis failed: {str(e)}")
-                st.info("Please check your API key and internet connection")
-                return
+        
+        results = result_cache.get(result_key)
+        if results is None:
+            # The queue runs the analysis; this session only polls it
+            job_id = jobs.submit(
+                user_id, analyzer, transcript, fused=fused_mode,
+                on_complete=save_analysis(analyzer, result_key, transcript, fused_mode, interviewer)
+            )
+            st.session_state['job'] = {"key": result_key, "id": job_id}
+            st.session_state.pop('analysis', None)
+        else:
+            results = relocate_bias(analyzer, transcript, results)
+            st.session_state['analysis'] = {"key": result_key, "transcript": transcript, "results": results}
+            st.session_state.pop('job', None)
+    
+    job = st.session_state.get('job')
+    if job and job['key'] == result_key:
+        # Also resumes polling after a rerun triggered by another widget
+        status = follow_job(jobs, job['id'], create_result_tabs())
+        del st.session_state['job']
+        if status is None or status['state'] == "cancelled":
+            st.warning("The analysis job is no longer available. Please analyze the transcript again.")
+            return
+        if status['state'] == "failed":
+            st.error(f"Analysis failed: {status['error']}")
+            st.info("Please check your API key and internet connection")
+            return
+        
+        if status['callback_error']:
+            st.warning(f"The analysis finished but could not be saved: {status['callback_error']}")
+        display_reuse_notice(status['results'])
+        display_highlighted_transcript(transcript, status['results']['bias'].get('bias_items', []))
+        
+        # Keep the results on screen across reruns triggered by other widgets
+        st.session_state['analysis'] = {"key": result_key, "transcript": transcript, "results": status['results']}
+        
+        cache_stats = analyzer.cache.stats()
+        st.caption(
+            f"Response cache: {cache_stats['memory_hits'] + cache_stats['disk_hits']} hits, "
+            f"{cache_stats['misses']} misses"
+        )
+    
+    elif result_key and st.session_state.get('analysis', {}).get('key') == result_key:
+        if st.session_state['analysis']['transcript'] != transcript:
+            # Edited only in whitespace, which the key ignores; the offsets moved
+            st.session_state['analysis'] = {
+                "key": result_key, "transcript": transcript,
+                "results": relocate_bias(analyzer, transcript, st.session_state['analysis']['results'])
+            }
+        display_results(st.session_state['analysis']['results'], create_result_tabs())
+        display_reuse_notice(st.session_state['analysis']['results'])
+        display_highlighted_transcript(transcript, st.session_state['analysis']['results']['bias'].get('bias_items', []))
+    
+    if os.getenv('ANALYZER_DEBUG_PANEL') == '1':
+        display_metrics_panel(analyzer.metrics, get_schedulers().values())
+
+def render_section(section, data):
+    """Render one finished result section"""
+    renderers = {
+        "summary": display_summary,
+        "bias": display_bias_dashboard,
+        "recommendations": display_recommendations,
+    }
+    renderers[section](data)
+
+def create_result_tabs():
+    """Lay out the result tabs with one placeholder per section"""
+    st.divider()
+    st.header("Analysis Results")
+    
+    tab1, tab2, tab3 = st.tabs(["Summary", "Bias Detection", "Recommendations"])
+    
+    placeholders = {}
+    for section, tab, message in [
+        ("summary", tab1, "Generating summary..."),
+        ("bias", tab2, "Detecting biases..."),
+        ("recommendations", tab3, "Waiting for bias results..."),
+    ]:
+        with tab:
+            placeholders[section] = st.empty()
+            placeholders[section].info(message)
+    return placeholders
+
+def display_results(results, placeholders):
+    """Render finished results into their tabs"""
+    for section, result in results.items():
+        if section in placeholders:
+            with placeholders[section].container():
+                render_section(section, result)
+
+def save_analysis(analyzer, result_key, transcript, fused_mode, interviewer):
+    """
+    Completion callback for an analysis job, which caches and stores the results
+    Shared resources are looked up here because the callback runs on a
+    queue worker thread, outside any Streamlit session.
+    """
+    result_cache = get_result_cache()
+    store = get_analysis_store()
+    dataset = get_bias_dataset()
+    
+    def on_complete(results, timings):
+        if analysis_failed(results):
+            return
+        result_cache.set(result_key, results)
+        if 'reuse' not in results:
+            # reuse_analysis() indexes the results it returns itself
+            analyzer.remember_analysis(transcript, results, fused_mode)
+        store.add(
+            transcript, results, mode="fused" if fused_mode else "split",
+            model_name=analyzer.model_name, elapsed_seconds=max(timings.values(), default=None),
+            timings=timings
+        )
+        dataset.append(results['bias'].get('bias_items', []), interviewer=interviewer)
+    
+    return on_complete
+
+def relocate_bias(analyzer, transcript, results):
+    """
+    Results with their bias findings located again in this transcript
+    Result cache keys ignore whitespace, so cached Start/End offsets may
+    point into a different spacing of the same transcript.
+    """
+    return dict(results, bias=analyzer.verify_bias(transcript, results['bias']))
+
+def follow_job(jobs, job_id, placeholders, poll_seconds=0.25):
+    """
+    Poll an analysis job, rendering each section into its placeholder as it arrives
+    Partial summaries and bias findings are shown until a section finishes.
+    Returns: the job's final status, or None if the queue no longer has it
+    """
+    progress = st.empty()
+    shown = {}
+    while True:
+        status = jobs.status(job_id)
+        if status is None:
+            progress.empty()
+            return None
+        
+        if status['state'] == "queued":
+            ahead = status['position']
+            progress.info(f"Queued behind {ahead} other analys{'is' if ahead == 1 else 'es'}...")
+        elif status['state'] == "running":
+            progress.info("Analyzing interview transcript...")
+        
+        finished = status['results'] or status['sections']
+        for section, placeholder in placeholders.items():
+            if section in finished:
+                view = ("result", finished[section])
+            elif section == "summary" and status['partial_summary']:
+                view = ("partial", status['partial_summary'])
+            elif section == "bias" and status['partial_bias']:
+                view = ("partial", status['partial_bias'])
+            else:
+                continue
+            # Redraw only what changed since the last poll
+            if shown.get(section) == view:
+                continue
+            shown[section] = view
+            with placeholder.container():
+                if view[0] == "result":
+                    render_section(section, view[1])
+                elif section == "summary":
+                    display_partial_summary(view[1])
+                else:
+                    display_partial_bias(view[1])
+        
+        if status['state'] in FINISHED_STATES:
+            progress.empty()
+            return status
+        time.sleep(poll_seconds)
+
+def display_reuse_notice(results):
+    """Say when results came from a near-duplicate of an earlier transcript"""
+    reuse = results.get('reuse')
+    if not reuse:
+        return
+    if reuse['action'] == "reused":
+        st.info(f"Reused the analysis of a {reuse['similarity']:.0%} similar transcript; no model calls were needed.")
+    elif reuse.get('summary_stale'):
+        st.warning(
+            f"Updated the analysis of a {reuse['similarity']:.0%} similar transcript: "
+            f"{reuse['changed_turns']} new or edited turns were re-checked for bias, but the summary "
+            "could not be refreshed and still describes the earlier transcript."
+        )
+    else:
+        st.info(
+            f"Updated the analysis of a {reuse['similarity']:.0%} similar transcript: "
+            f"{reuse['changed_turns']} new or edited turns were re-checked for bias and folded into the summary."
+        )
+
+def display_search_view(store):
+    """Search completed analyses by phrase, bias type, severity and date"""
+    st.header("Past Interviews")
+    
+    col1, col2, col3, col4 = st.columns([3, 2, 2, 2])
+    with col1:
+        text = st.text_input("Phrase", placeholder="e.g. at your age")
+    with col2:
+        bias_types = st.multiselect("Bias type", options=[name for name, _ in BIAS_CATEGORIES] + ["Other"])
+    with col3:
+        severities = st.multiselect("Severity", options=["High", "Medium", "Low"])
+    with col4:
+        dates = st.date_input("Date range", value=())
+    
+    since = until = None
+    if len(dates) >= 1:
+        since = datetime.combine(dates[0], datetime.min.time()).timestamp()
+    if len(dates) == 2:
+        until = datetime.combine(dates[1] + timedelta(days=1), datetime.min.time()).timestamp()
+    
+    filters = dict(text=text or None, bias_type=bias_types or None, severity=severities or None,
+                   since=since, until=until)
+    total = store.count(**filters)
+    facets = store.facets(text=filters['text'], since=since, until=until)
+    
+    st.caption(f"{total} matching analyses")
+    if facets['bias_type']:
+        st.caption("By bias type: " + ", ".join(
+            f"{name} {count}" for name, count in sorted(facets['bias_type'].items(), key=lambda kv: -kv[1])
+        ))
+    
+    page_size = 25
+    page = st.number_input("Page", min_value=1, max_value=max(1, -(-total // page_size)), value=1)
+    
+    for entry in store.search(**filters, limit=page_size, offset=(page - 1) * page_size):
+        results = entry['results']
+        summary = results.get('summary', {})
+        bias_items = results.get('bias', {}).get('bias_items', [])
+        stored_at = datetime.fromtimestamp(entry['created_at']).strftime("%Y-%m-%d %H:%M")
+        
+        with st.expander(f"{stored_at} · {len(bias_items)} bias findings · {summary.get('executive_summary', '')[:80]}"):
+            st.write(summary.get('executive_summary', ''))
+            st.write(f"**Recommendation:** {summary.get('recommendation', '')}")
+            for item in bias_items:
+                st.write(f"• **{item.get('Bias_Type', 'Unknown')}** ({item.get('Severity', 'Unknown')}): \"{item.get('Example_Phrase', '')}\"")
+            for i, rec in enumerate(results.get('recommendations', []), 1):
+                st.write(f"{i}. {rec}")
+            st.caption(f"Transcript {entry['transcript_hash'][:12]} · {entry['mode']} · {entry['model_name']}")
+
+def display_analytics_view(dataset):
+    """Bias trends, top phrases and severity per interviewer across every stored analysis"""
+    # Imported here so app startup does not pay for pandas and plotly
+    import plotly.express as px
+    from bias_dataset import bias_trends, filter_frame, severity_by_interviewer, top_phrases
+    
+    st.header("Organization Analytics")
+    frame = dataset.load()
+    if not len(frame):
+        st.info("No bias findings recorded yet. Analyses you run are added here.")
+        return
+    
+    col1, col2, col3 = st.columns([2, 3, 1])
+    with col1:
+        dates = st.date_input("Date range", value=())
+    with col2:
+        interviewers = st.multiselect("Interviewers", options=list(frame['interviewer'].cat.categories))
+    with col3:
+        freq = st.selectbox("Trend by", options=["W", "M", "D"],
+                            format_func={"D": "Day", "W": "Week", "M": "Month"}.get)
+    
+    since = until = None
+    if len(dates) >= 1:
+        since = datetime.combine(dates[0], datetime.min.time()).timestamp()
+    if len(dates) == 2:
+        until = datetime.combine(dates[1] + timedelta(days=1), datetime.min.time()).timestamp()
+    frame = filter_frame(frame, since=since, until=until, interviewers=interviewers)
+    st.caption(f"{len(frame):,} bias findings")
+    if not len(frame):
+        return
+    
+    st.subheader("Bias Categories Over Time")
+    trends = bias_trends(frame, freq)
+    fig = px.line(trends, x=trends.index, y=list(trends.columns),
+                  labels={'period': 'Period', 'value': 'Findings', 'variable': 'Bias Type'})
+    fig.update_layout(height=400, margin=dict(l=0, r=0, t=20, b=0))
+    st.plotly_chart(fig, width='stretch')
+    
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        st.subheader("Top Phrases")
+        phrases = top_phrases(frame)
+        fig = px.bar(x=phrases.values, y=phrases.index, orientation='h',
+                     labels={'x': 'Findings', 'y': 'Phrase'})
+        fig.update_layout(height=400, showlegend=False, margin=dict(l=0, r=0, t=20, b=0),
+                          yaxis={'categoryorder': 'total ascending'})
+        st.plotly_chart(fig, width='stretch')
+    
+    with col2:
+        st.subheader("Severity by Interviewer")
+        severities = severity_by_interviewer(frame)
+        fig = px.bar(severities.head(20), x=severities.head(20).index, y=list(severities.columns),
+                     labels={'value': 'Findings', 'variable': 'Severity'},
+                     color_discrete_map={'High': '#d62728', 'Medium': '#ff7f0e', 'Low': '#2ca02c', 'Unknown': '#7f7f7f'})
+        fig.update_layout(height=400, margin=dict(l=0, r=0, t=20, b=0))
+        st.plotly_chart(fig, width='stretch')
+    
+    with st.expander("Severity table"):
+        st.dataframe(severities, width='stretch')
 
 def display_summary(summary_data):
     """Display the structured interview summary"""
@@ -144,15 +561,44 @@ def display_summary(summary_data):
         else:
             st.info(recommendation)
 
+def display_partial_summary(partial_summary):
+    """Render summary fields received so far while the response streams in"""
+    if 'executive_summary' in partial_summary:
+        st.subheader("Executive Summary")
+        st.write(partial_summary['executive_summary'])
+    
+    for key, title in [("strength", "Candidate Strengths"), ("improvement", "Areas for Improvement")]:
+        if partial_summary.get(key):
+            st.subheader(title)
+            for item in partial_summary[key]:
+                st.write(f"• {item}")
+    
+    if 'recommendation' in partial_summary:
+        st.subheader("Overall Recommendation")
+        st.info(partial_summary['recommendation'])
+    
+    st.caption("Receiving summary...")
+
+def display_partial_bias(bias_items):
+    """Render the verified bias items received so far while the response streams in"""
+    st.subheader("Detected Biases")
+    for item in bias_items:
+        st.write(f"• **{item.get('Bias_Type', 'Unknown')}** ({item.get('Severity', 'Unknown')}): \"{item.get('Example_Phrase', '')}\"")
+    st.caption("Scanning for more...")
+
 def display_bias_dashboard(bias_data):
     """Display bias detection dashboard with visualizations"""
     bias_items = bias_data.get('bias_items', [])
     
     if bias_items:
+        # Imported here so app startup does not pay for pandas and plotly
+        import pandas as pd
+        import plotly.express as px
+        
         st.subheader("Detected Biases")
         with st.container(border=True):
             df = pd.DataFrame(bias_items)
-            st.dataframe(df, width='stretch')
+            st.dataframe(df.drop(columns=['Start', 'End'], errors='ignore'), width='stretch')
         
         col1, col2 = st.columns([1, 1])
         
@@ -172,45 +618,152 @@ def display_bias_dashboard(bias_data):
         
         with col2:
             st.subheader("Suspicious Phrases Analysis")
-            suspicious_phrases = [item.get('Example_Phrase', '') for item in bias_items if item.get('Example_Phrase', '').strip()]
+            phrases = suspicious_phrases(bias_items)
             
-            if suspicious_phrases:
-                all_words = []
-                for phrase in suspicious_phrases:
-                    words = phrase.lower().split()
-                    filtered_words = [word.strip('.,!?;:"()[]') for word in words 
-                                    if len(word) > 3 and word not in ['this', 'that', 'with', 'have', 'will', 'they', 'what', 'your', 'from', 'they', 'were', 'been', 'said']]
-                    all_words.extend(filtered_words)
+            if phrases:
+                top_words = suspicious_word_counts(phrases)
                 
-                if all_words:
-                    word_counts = Counter(all_words)
-                    top_words = dict(word_counts.most_common(10))
-                    
-                    if top_words:
-                        fig = px.bar(
-                            x=list(top_words.values()),
-                            y=list(top_words.keys()),
-                            orientation='h',
-                            labels={'x': 'Frequency', 'y': 'Suspicious Words'},
-                            title="Most Frequent Suspicious Words",
-                            color=list(top_words.values()),
-                            color_continuous_scale='Reds'
-                        )
-                        fig.update_layout(height=400, showlegend=False, margin=dict(l=0, r=0, t=40, b=0))
-                        st.plotly_chart(fig, width='stretch')
-                    else:
-                        st.info("No significant word patterns detected")
+                if top_words:
+                    fig = px.bar(
+                        x=list(top_words.values()),
+                        y=list(top_words.keys()),
+                        orientation='h',
+                        labels={'x': 'Frequency', 'y': 'Suspicious Words'},
+                        title="Most Frequent Suspicious Words",
+                        color=list(top_words.values()),
+                        color_continuous_scale='Reds'
+                    )
+                    fig.update_layout(height=400, showlegend=False, margin=dict(l=0, r=0, t=40, b=0))
+                    st.plotly_chart(fig, width='stretch')
                 else:
                     st.info("No significant word patterns detected")
             else:
                 st.info("No suspicious phrases detected")
         
         with st.expander("View All Suspicious Phrases"):
-            for i, phrase in enumerate(suspicious_phrases, 1):
+            for i, phrase in enumerate(phrases, 1):
                 st.write(f"{i}. \"{phrase}\"")
     else:
         with st.container(border=True):
             st.success("No significant biases detected in this interview")
+    
+    if bias_data.get('unverified'):
+        st.caption(
+            f"{bias_data['unverified']} reported finding(s) were dropped because the quoted phrase "
+            "could not be found in the transcript"
+        )
+
+def display_highlighted_transcript(transcript, bias_items, context_chars=200):
+    """
+    Show the transcript with each verified bias phrase highlighted
+    Transcripts longer than PREVIEW_CHARS are shown as excerpts around the
+    findings instead of in full.
+    """
+    spans = sorted((item for item in bias_items if 'Start' in item), key=lambda item: (item['Start'], item['End']))
+    if not spans:
+        return
+    
+    if len(transcript) <= PREVIEW_CHARS:
+        windows = [[0, len(transcript)]]
+    else:
+        windows = []
+        for item in spans:
+            start, end = max(0, item['Start'] - context_chars), min(len(transcript), item['End'] + context_chars)
+            if windows and start <= windows[-1][1]:
+                windows[-1][1] = max(windows[-1][1], end)
+            else:
+                windows.append([start, end])
+    
+    excerpts = []
+    remaining = iter(spans)
+    item = next(remaining, None)
+    for window_start, window_end in windows:
+        pieces = ["…" if window_start else ""]
+        position = window_start
+        while item is not None and item['End'] <= window_end:
+            # Overlapping findings share the first one's highlight
+            if item['Start'] >= position:
+                label = f"{item.get('Bias_Type', '')} ({item.get('Severity', '')}), match {item.get('Match_Score', 1.0):.0%}"
+                pieces.append(html.escape(transcript[position:item['Start']]))
+                pieces.append(f'<mark title="{html.escape(label)}">{html.escape(transcript[item["Start"]:item["End"]])}</mark>')
+                position = item['End']
+            item = next(remaining, None)
+        pieces.append(html.escape(transcript[position:window_end]))
+        pieces.append("…" if window_end < len(transcript) else "")
+        excerpts.append("".join(pieces))
+    
+    with st.expander(f"Transcript with {len(spans)} verified phrase(s) highlighted"):
+        st.html('<div style="white-space: pre-wrap">' + "<hr>".join(excerpts) + "</div>")
+
+def display_metrics_panel(metrics, schedulers):
+    """Sidebar debug panel with model call metrics for this server process"""
+    snapshot = metrics.snapshot()
+    scheduler_stats = combined_stats(list(schedulers))
+    
+    with st.sidebar:
+        st.header("Model Call Metrics")
+        
+        col1, col2 = st.columns(2)
+        col1.metric("Estimated cost", f"${sum(snapshot['cost_usd'].values()):.4f}")
+        col2.metric("Per analysis", f"${snapshot['cost_per_analysis_usd']:.5f}")
+        
+        rows = []
+        for series, latency in sorted(snapshot['latency'].items()):
+            kind, model = series.split("/")
+            rows.append({
+                "Call": kind,
+                "Count": latency['count'],
+                "Errors": snapshot['calls'].get(f"{kind}/{model}/error", 0),
+                "p50 (s)": round(latency['p50'], 3),
+                "p95 (s)": round(latency['p95'], 3),
+                "Tokens in": snapshot['tokens'].get(f"{kind}/{model}/prompt", 0),
+                "Tokens out": snapshot['tokens'].get(f"{kind}/{model}/response", 0),
+            })
+        if rows:
+            st.dataframe(rows, hide_index=True)
+        else:
+            st.caption("No model calls yet")
+        
+        if snapshot['tiers']:
+            st.subheader("Model tiers")
+            st.dataframe([
+                {
+                    "Tier": tier,
+                    "Model": stats['model'],
+                    "Runs": stats['runs'],
+                    "Escalated": f"{stats['escalation_rate']:.0%}",
+                    "Reasons": ", ".join(f"{reason} {count}" for reason, count in sorted(stats['escalated'].items())),
+                    "Bias p95 (s)": round(stats['latency'].get('bias', {}).get('p95', 0.0), 3),
+                    "Cost": f"${stats['cost_usd']:.4f}",
+                }
+                for tier, stats in snapshot['tiers'].items()
+            ], hide_index=True)
+        
+        for title, key in [("Analyses", 'analysis'), ("Time to first chunk", 'first_chunk')]:
+            if snapshot[key]:
+                st.caption(title + ": " + ", ".join(
+                    f"{series} p95 {summary['p95']:.2f}s over {summary['count']}"
+                    for series, summary in sorted(snapshot[key].items())
+                ))
+        for title, key in [("Parse results", 'parse'), ("Cache lookups", 'cache'), ("Quoted phrases", 'phrases'),
+                           ("Errors", 'errors')]:
+            if snapshot[key]:
+                st.caption(title + ": " + ", ".join(
+                    f"{series} {count}" for series, count in sorted(snapshot[key].items())
+                ))
+        st.caption(
+            f"Schedulers: circuits {scheduler_stats['circuit']}, "
+            f"{scheduler_stats['upstream_calls']} upstream calls for {scheduler_stats['requests']} requests, "
+            f"{scheduler_stats['coalesced']} coalesced, {scheduler_stats['retries']} retries, "
+            f"{scheduler_stats['throttled_seconds']:.1f}s throttled"
+        )
+        
+        st.download_button(
+            "Download OpenMetrics",
+            data=metrics.to_openmetrics(),
+            file_name="interview_analyzer_metrics.txt",
+            mime="text/plain"
+        )
 
 def display_recommendations(recommendations):
     """Display actionable recommendations"""
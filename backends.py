@@ -0,0 +1,279 @@
+"""
+Model backends behind InterviewAnalyzer.model
+Every backend exposes generate_content(prompt) returning an object with a
+.text attribute and, where available, .usage_metadata token counts.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from types import SimpleNamespace
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+class ModelBackend:
+    """Interface every model backend implements"""
+
+    model_name = "unknown"
+
+    def generate_content(self, prompt: str, **kwargs):
+        raise NotImplementedError
+
+    def stream_content(self, prompt: str) -> Iterator[str]:
+        """Yield the response text in chunks; non-streaming backends yield it whole"""
+        yield self.generate_content(prompt).text
+
+class GeminiBackend(ModelBackend):
+    """
+    Google Gemini through a generative language API client of its own
+    genai.configure() sets one API key for the whole process, so each
+    backend builds its own GenerativeServiceClient with its key instead;
+    backends for different keys can then be used side by side.
+    """
+
+    def __init__(self, api_key: str, model_name: str = 'gemini-2.5-flash-lite'):
+        # The SDK is slow to import, so load it only when a Gemini backend is built
+        from google.ai import generativelanguage as glm
+        self.model_name = model_name
+        self._glm = glm
+        self._client = glm.GenerativeServiceClient(client_options={"api_key": api_key})
+
+    def generate_content(self, prompt: str, **kwargs):
+        """kwargs are further GenerateContentRequest fields, e.g. generation_config"""
+        response = self._client.generate_content(request=self._request(prompt, **kwargs))
+        return SimpleNamespace(text=_response_text(response), usage_metadata=response.usage_metadata)
+
+    def stream_content(self, prompt: str) -> Iterator[str]:
+        for chunk in self._client.stream_generate_content(request=self._request(prompt)):
+            text = _response_text(chunk, allow_empty=True)
+            if text:
+                yield text
+
+    def _request(self, prompt: str, **kwargs):
+        """A single-turn GenerateContentRequest for prompt"""
+        glm = self._glm
+        return glm.GenerateContentRequest(
+            model=f"models/{self.model_name}",
+            contents=[glm.Content(role="user", parts=[glm.Part(text=prompt)])],
+            **kwargs
+        )
+
+def _response_text(response, allow_empty: bool = False) -> str:
+    """
+    Text of a GenerateContentResponse's first candidate
+    Raises ValueError, as the SDK's response.text does, when a complete
+    response has no candidate, e.g. because the prompt was blocked.
+    """
+    if not response.candidates:
+        if allow_empty:
+            return ""
+        raise ValueError(f"Response has no candidates: {response.prompt_feedback}")
+    return "".join(part.text for part in response.candidates[0].content.parts)
+
+class RoundRobinBackend(ModelBackend):
+    """
+    Spread calls for one model across several backends in turn, e.g. one per API key
+    Each key's quota then only sees its share of the traffic, raising the
+    aggregate request rate. calls counts the calls sent to each backend.
+    """
+
+    def __init__(self, backends: List[ModelBackend]):
+        if not backends:
+            raise ValueError("RoundRobinBackend needs at least one backend")
+        self.backends = list(backends)
+        self.model_name = self.backends[0].model_name
+        self.calls = [0] * len(self.backends)
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt: str, **kwargs):
+        return self._pick().generate_content(prompt, **kwargs)
+
+    def stream_content(self, prompt: str) -> Iterator[str]:
+        return self._pick().stream_content(prompt)
+
+    def _pick(self) -> ModelBackend:
+        """The backend whose turn it is"""
+        with self._lock:
+            index = self._next
+            self._next = (index + 1) % len(self.backends)
+            self.calls[index] += 1
+        return self.backends[index]
+
+def gemini_backend(api_keys: List[str], model_name: str = 'gemini-2.5-flash-lite',
+                   wrap: Optional[Callable[[str, ModelBackend], ModelBackend]] = None) -> ModelBackend:
+    """
+    A GeminiBackend for one key, or a RoundRobinBackend over one per key
+    wrap(api_key, backend), if given, replaces each key's backend, e.g. to
+    route it through a ScheduledBackend holding that key's rate limits.
+    """
+    backends = [GeminiBackend(api_key, model_name) for api_key in api_keys]
+    if wrap is not None:
+        backends = [wrap(api_key, backend) for api_key, backend in zip(api_keys, backends)]
+    return backends[0] if len(backends) == 1 else RoundRobinBackend(backends)
+
+def api_keys_from_env(env: Optional[Dict[str, str]] = None) -> List[str]:
+    """API keys from GEMINI_API_KEYS (comma-separated), else GEMINI_API_KEY"""
+    env = os.environ if env is None else env
+    keys = [key.strip() for key in env.get('GEMINI_API_KEYS', '').split(',') if key.strip()]
+    if not keys and env.get('GEMINI_API_KEY'):
+        keys = [env['GEMINI_API_KEY']]
+    return keys
+
+def model_tiers_from_env(env: Optional[Dict[str, str]] = None) -> List[Tuple[str, str]]:
+    """
+    (tier, model name) pairs from ANALYZER_MODEL_TIERS, cheapest first
+    The variable reads like "triage=gemini-2.5-flash-lite,strong=gemini-2.5-pro";
+    a bare model name is used as its own tier name.
+    Returns: the tiers, or an empty list when routing is not configured
+    """
+    env = os.environ if env is None else env
+    tiers = []
+    for entry in env.get('ANALYZER_MODEL_TIERS', '').split(','):
+        name, _, model_name = entry.strip().rpartition('=')
+        if model_name:
+            tiers.append((name.strip() or model_name, model_name.strip()))
+    return tiers
+
+class FakeBackendError(Exception):
+    """Injected failure raised by FakeBackend, shaped like a retryable 503 from the API"""
+
+    code = 503
+
+# Canned responses per prompt kind, shaped like real model output
+DEFAULT_FAKE_RESPONSES = {
+    "summary": json.dumps({
+        "executive_summary": "The candidate described relevant project experience and answered technical questions clearly.",
+        "strengths": ["Clear communication", "Relevant technical experience", "Structured problem solving"],
+        "improvements": ["Could quantify impact in more examples"],
+        "recommendation": "Recommend advancing to the next round based on demonstrated skills."
+    }),
+    "bias": json.dumps({
+        "bias_items": [
+            {"Bias_Type": "Age", "Example_Phrase": "at your age", "Severity": "High"},
+            {"Bias_Type": "Personal Life", "Example_Phrase": "Are you married?", "Severity": "Medium"}
+        ],
+        "confidence": 0.9
+    }),
+    "recommendations": json.dumps([
+        "Remove questions about age and personal life from the interview guide.",
+        "Use a structured scorecard tied to job-relevant competencies.",
+        "Have a second interviewer review questions for bias before interviews."
+    ]),
+}
+
+def detect_prompt_kind(prompt: str) -> str:
+    """Classify an analyzer prompt as summary, bias, recommendations or fused"""
+    if "Return only the corrected JSON" in prompt:
+        # Repair requests quote the expected shape before the broken response
+        shape = prompt[:prompt.find("Response:")]
+        if '"bias_items"' in shape:
+            return "bias"
+        if '["recommendation 1"' in shape:
+            return "recommendations"
+        return "summary"
+    if "Return a single JSON object" in prompt:
+        return "fused"
+    if "actionable recommendations for improvement" in prompt:
+        return "recommendations"
+    if "potential biases and discriminatory language" in prompt:
+        return "bias"
+    return "summary"
+
+class FakeBackend(ModelBackend):
+    """
+    Deterministic local stand-in for load testing and profiling
+    Returns canned JSON per prompt kind (or the output of a custom responder)
+    after a simulated latency, and can inject failures at a given rate.
+    With a fixed seed, latencies and failures are reproducible. Streamed
+    responses deliver the first chunk after first_chunk_fraction of the
+    latency and spread the rest over stream_chunks pieces.
+    """
+
+    model_name = "fake"
+
+    def __init__(self, responses: Optional[Dict[str, str]] = None,
+                 responder: Optional[Callable[[str], str]] = None,
+                 latency: float = 0.0, jitter: float = 0.0,
+                 failure_rate: float = 0.0, seed: int = 0,
+                 first_chunk_fraction: float = 0.25, stream_chunks: int = 8,
+                 model_name: str = "fake"):
+        # Distinct names keep fake model tiers apart in the cache and metrics
+        self.model_name = model_name
+        self.responses = dict(DEFAULT_FAKE_RESPONSES)
+        if responses:
+            self.responses.update(responses)
+        self.responder = responder
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.first_chunk_fraction = first_chunk_fraction
+        self.stream_chunks = stream_chunks
+        self.calls = 0
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt: str, **kwargs):
+        delay, fail = self._draw()
+        if delay:
+            time.sleep(delay)
+        if fail:
+            raise FakeBackendError("Injected failure from FakeBackend")
+
+        text = self.responder(prompt) if self.responder else self._canned(prompt)
+        return SimpleNamespace(
+            text=text,
+            usage_metadata=SimpleNamespace(
+                prompt_token_count=max(1, len(prompt) // 4),
+                candidates_token_count=max(1, len(text) // 4),
+                total_token_count=max(1, len(prompt) // 4) + max(1, len(text) // 4),
+            ),
+        )
+
+    def stream_content(self, prompt: str) -> Iterator[str]:
+        delay, fail = self._draw()
+        first = delay * self.first_chunk_fraction
+        if fail:
+            time.sleep(first)
+            raise FakeBackendError("Injected failure from FakeBackend")
+
+        text = self.responder(prompt) if self.responder else self._canned(prompt)
+        pieces = max(1, self.stream_chunks)
+        size = -(-len(text) // pieces)
+        per_chunk = (delay - first) / pieces
+
+        time.sleep(first)
+        for start in range(0, len(text), size):
+            yield text[start:start + size]
+            if per_chunk:
+                time.sleep(per_chunk)
+
+    def _draw(self):
+        """Draw this call's simulated latency and failure outcome"""
+        with self._lock:
+            self.calls += 1
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+            fail = self._random.random() < self.failure_rate
+        return delay, fail
+
+    def _canned(self, prompt: str) -> str:
+        """Look up the canned response for the prompt's kind"""
+        kind = detect_prompt_kind(prompt)
+        if kind == "fused" and "fused" not in self.responses:
+            summary = json.loads(self.responses["summary"])
+            bias_items = json.loads(self.responses["bias"]).get("bias_items", [])
+            recommendations = json.loads(self.responses["recommendations"]) if bias_items else []
+            return json.dumps({"summary": summary, "bias_items": bias_items, "recommendations": recommendations})
+        return self.responses[kind]
+
+def fake_backend_from_env(env: Optional[Dict[str, str]] = None, model_name: str = "fake") -> FakeBackend:
+    """Build a FakeBackend from FAKE_MODEL_LATENCY, FAKE_MODEL_JITTER and FAKE_MODEL_FAILURE_RATE"""
+    env = os.environ if env is None else env
+    return FakeBackend(
+        latency=float(env.get('FAKE_MODEL_LATENCY', '1.0')),
+        jitter=float(env.get('FAKE_MODEL_JITTER', '0.25')),
+        failure_rate=float(env.get('FAKE_MODEL_FAILURE_RATE', '0.0')),
+        model_name=model_name,
+    )
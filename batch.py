@@ -0,0 +1,362 @@
+"""
+Headless batch analysis of interview transcripts
+Reads transcripts from a directory of .txt/.vtt/.srt files, a single such
+file or a JSONL file, analyzes them on a bounded worker pool and streams
+one JSON result per line to the output file as each transcript completes.
+Transcript files above a size limit are analyzed chunk by chunk as they
+are read, so memory use does not grow with the file.
+
+Usage:
+    python batch.py transcripts/ --output results.jsonl --workers 8
+    python batch.py transcripts.jsonl --output results.jsonl --no-resume
+
+Re-running with the same output file skips transcripts that already
+completed, so an interrupted run picks up where it left off.
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from dotenv import load_dotenv
+from analyzer import InterviewAnalyzer, analysis_failed
+from backends import FakeBackend, api_keys_from_env, gemini_backend, model_tiers_from_env
+from cache import ResponseCache
+from ingest import TRANSCRIPT_EXTENSIONS, iter_chunks, iter_turns, read_transcript
+from recommendations import load_recommendation_table
+from scheduler import RequestScheduler, ScheduledBackend, combined_stats
+from store import AnalysisStore, turns_hash
+from verification import MIN_MATCH_SCORE
+
+class LargeTranscript:
+    """A transcript file too large to read whole, analyzed chunk by chunk from its path"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+def _read_file(path: str, stream_above: Optional[int]):
+    """The file's transcript text, or a LargeTranscript when it is bigger than stream_above bytes"""
+    if stream_above is not None and os.path.getsize(path) > stream_above:
+        return LargeTranscript(path)
+    return read_transcript(path)
+
+def iter_transcripts(source: str, stream_above: Optional[int] = None) -> Iterator[Tuple[str, object, Optional[str]]]:
+    """
+    Lazily yield (transcript_id, transcript, interviewer) from a directory, transcript file or JSONL file
+    Directory entries and single .txt/.vtt/.srt files are read through
+    ingest.read_transcript(), or yielded as a LargeTranscript when larger
+    than stream_above bytes; they use the file name as ID and have no
+    interviewer. JSONL lines use their "id" field, falling back to the line
+    number, and an optional "interviewer" field.
+    """
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            path = os.path.join(source, name)
+            if name.lower().endswith(TRANSCRIPT_EXTENSIONS) and os.path.isfile(path):
+                yield name, _read_file(path, stream_above), None
+        return
+    if source.lower().endswith(TRANSCRIPT_EXTENSIONS):
+        yield os.path.basename(source), _read_file(source, stream_above), None
+        return
+
+    with open(source, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            yield str(record.get("id", line_number)), record["transcript"], record.get("interviewer")
+
+def load_checkpoint(output_path: str) -> Set[str]:
+    """Return the IDs a previous run wrote to output_path without an error"""
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A crash mid-write can leave a truncated final line
+                continue
+            if "error" not in record and not analysis_failed(record):
+                completed.add(record["id"])
+    return completed
+
+def _ends_with_newline(path: str) -> bool:
+    """Check whether the last byte of a non-empty file is a newline"""
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+def analyze_one(analyzer: InterviewAnalyzer, transcript_id: str, transcript,
+                fused: bool = False, store: Optional[AnalysisStore] = None,
+                interviewer: Optional[str] = None) -> Dict:
+    """
+    Analyze a single transcript, capturing latency and any failure
+    A near-duplicate of an earlier transcript reuses its analysis when the
+    analyzer has a near-duplicate index. A LargeTranscript is streamed
+    through InterviewAnalyzer.analyze_chunks() instead, without reuse.
+    """
+    if isinstance(transcript, LargeTranscript):
+        return _analyze_large(analyzer, transcript_id, transcript.path, store, interviewer)
+
+    start = time.perf_counter()
+    analyze = analyzer.analyze_fused if fused else analyzer.analyze_all
+    record = {"id": transcript_id}
+    if interviewer:
+        record["interviewer"] = interviewer
+    try:
+        results = analyzer.reuse_analysis(transcript, fused)
+        if results is None:
+            results = analyze(transcript)
+            analyzer.remember_analysis(transcript, results, fused)
+        record.update(results)
+        if analysis_failed(results):
+            # Failed model calls come back as placeholder sections; keep them
+            # out of the completed set so a resumed run retries the transcript
+            record["error"] = "analysis returned error placeholders"
+    except Exception as e:
+        results = None
+        record["error"] = str(e)
+    record["latency_seconds"] = round(time.perf_counter() - start, 4)
+
+    # Error placeholders would show up in searches and facets as findings
+    if store is not None and results is not None and not analysis_failed(results):
+        store.add(transcript, results, mode="fused" if fused else "split",
+                  model_name=analyzer.model_name, elapsed_seconds=record["latency_seconds"])
+    return record
+
+def _analyze_large(analyzer: InterviewAnalyzer, transcript_id: str, path: str,
+                   store: Optional[AnalysisStore] = None, interviewer: Optional[str] = None) -> Dict:
+    """analyze_one() for a file streamed chunk by chunk, so it is never held whole"""
+    start = time.perf_counter()
+    record = {"id": transcript_id}
+    if interviewer:
+        record["interviewer"] = interviewer
+    try:
+        results = analyzer.analyze_chunks(
+            iter_chunks(path, max_chars=analyzer.max_chunk_chars, overlap_turns=analyzer.chunk_overlap_turns)
+        )
+        record.update(results)
+        if analysis_failed(results):
+            record["error"] = "analysis returned error placeholders"
+    except Exception as e:
+        results = None
+        record["error"] = str(e)
+    record["latency_seconds"] = round(time.perf_counter() - start, 4)
+
+    if store is not None and results is not None and not analysis_failed(results):
+        # A second streaming pass hashes the transcript the same way AnalysisStore.add() would
+        store.add_many([{
+            "transcript_hash": turns_hash(iter_turns(path)), "results": results, "mode": "streamed",
+            "model_name": analyzer.model_name, "elapsed_seconds": record["latency_seconds"],
+        }])
+    return record
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of values (0 when empty)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = math.ceil(pct / 100 * len(ordered))
+    return ordered[min(max(rank, 1), len(ordered)) - 1]
+
+def run_batch(analyzer: InterviewAnalyzer, source: str, output_path: str,
+              workers: int = 4, resume: bool = True, fused: bool = False,
+              store: Optional[AnalysisStore] = None, analytics=None,
+              stream_above: Optional[int] = None) -> Dict:
+    """
+    Analyze every transcript in source, appending results to output_path
+    At most 2 * workers transcripts are held in memory at once; files over
+    stream_above bytes are not held at all but streamed in chunks. Bias items
+    from successful analyses are also appended to analytics, a
+    bias_dataset.BiasDataset, when one is given.
+    Returns: Dictionary with throughput and latency statistics
+    """
+    completed = load_checkpoint(output_path) if resume else set()
+    mode = "a" if resume else "w"
+
+    latencies = []
+    failures = 0
+    skipped = 0
+    start = time.perf_counter()
+
+    with open(output_path, mode, encoding="utf-8") as out, ThreadPoolExecutor(max_workers=workers) as pool:
+        if resume and out.tell() > 0 and not _ends_with_newline(output_path):
+            # Terminate a line truncated by a crash so new records stay parseable
+            out.write("\n")
+        pending = set()
+
+        def drain(return_when):
+            nonlocal pending, failures
+            done, pending = wait(pending, return_when=return_when)
+            for future in done:
+                record = future.result()
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+                latencies.append(record["latency_seconds"])
+                if "error" in record or analysis_failed(record):
+                    failures += 1
+                elif analytics is not None:
+                    # Only real findings; placeholders would skew every aggregate
+                    analytics.append(record.get("bias", {}).get("bias_items", []),
+                                     interviewer=record.get("interviewer"))
+
+        for transcript_id, transcript, interviewer in iter_transcripts(source, stream_above):
+            if transcript_id in completed:
+                skipped += 1
+                continue
+            pending.add(pool.submit(analyze_one, analyzer, transcript_id, transcript, fused, store, interviewer))
+            if len(pending) >= workers * 2:
+                drain(FIRST_COMPLETED)
+
+        while pending:
+            drain(FIRST_COMPLETED)
+
+    elapsed = time.perf_counter() - start
+    return {
+        "processed": len(latencies),
+        "failed": failures,
+        "skipped": skipped,
+        "elapsed_seconds": round(elapsed, 3),
+        "transcripts_per_second": round(len(latencies) / elapsed, 3) if elapsed else 0.0,
+        "p50_latency_seconds": percentile(latencies, 50),
+        "p95_latency_seconds": percentile(latencies, 95),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze interview transcripts in bulk")
+    parser.add_argument("source", help="Directory of .txt/.vtt/.srt transcripts, one such file, "
+                                           "or a JSONL file with id/transcript fields")
+    parser.add_argument("--output", "-o", required=True, help="JSONL file results are appended to")
+    parser.add_argument("--workers", "-w", type=int, default=4, help="Number of transcripts analyzed concurrently")
+    parser.add_argument("--fused", action="store_true", help="Use one model call per transcript")
+    parser.add_argument("--bias-mode", choices=InterviewAnalyzer.BIAS_MODES, default="llm",
+                        help="'triage' skips the model for transcripts the local pre-screen finds clean; "
+                             "'fast' uses the pre-screen only; 'interviewer' sends only interviewer turns "
+                             "with brief candidate context")
+    parser.add_argument("--stream-above-mb", type=float, default=20.0,
+                        help="Analyze transcript files larger than this chunk by chunk as they are read")
+    parser.add_argument("--no-resume", action="store_true", help="Ignore existing output and start over")
+    parser.add_argument("--cache-path", default=os.getenv('ANALYZER_CACHE_PATH', '.cache/responses.sqlite3'),
+                        help="SQLite response cache location")
+    parser.add_argument("--backend", choices=["gemini", "fake"], default="gemini",
+                        help="Model backend; 'fake' runs offline with simulated latency")
+    parser.add_argument("--fake-latency", type=float, default=1.0, help="Mean simulated latency per call (fake backend)")
+    parser.add_argument("--fake-jitter", type=float, default=0.25, help="Latency jitter in seconds (fake backend)")
+    parser.add_argument("--fake-failure-rate", type=float, default=0.0, help="Fraction of calls that fail (fake backend)")
+    parser.add_argument("--recommendation-table", default=os.getenv('ANALYZER_RECOMMENDATION_TABLE'),
+                        help="Precomputed recommendations by bias profile, built with recommendations.py")
+    parser.add_argument("--store", help="Also save every completed analysis to this searchable SQLite store")
+    parser.add_argument("--analytics",
+                        help="Also append detected bias items to this columnar analytics dataset directory")
+    parser.add_argument("--near-duplicates",
+                        help="Near-duplicate index location; transcripts similar to one already analyzed reuse its results")
+    parser.add_argument("--similarity-threshold", type=float, default=0.7,
+                        help="Minimum estimated similarity for reusing an analysis (with --near-duplicates)")
+    parser.add_argument("--tiers", default=os.getenv('ANALYZER_MODEL_TIERS'),
+                        help="Model tiers, cheapest first, e.g. 'triage=gemini-2.5-flash-lite,strong=gemini-2.5-pro'; "
+                             "only flagged transcripts reach later tiers (default: ANALYZER_MODEL_TIERS)")
+    parser.add_argument("--escalation-threshold", type=float,
+                        default=float(os.getenv('ANALYZER_ESCALATION_THRESHOLD', '0.7')),
+                        help="Bias results with lower self-reported confidence escalate to the next tier")
+    parser.add_argument("--min-match-score", type=float,
+                        default=float(os.getenv('ANALYZER_MIN_MATCH_SCORE', str(MIN_MATCH_SCORE))),
+                        help="Drop bias findings whose quoted phrase matches the transcript less well than this (0-1)")
+    parser.add_argument("--keep-unverified", action="store_true",
+                        help="Keep bias findings whose quoted phrase is not in the transcript")
+    parser.add_argument("--metrics", help="Write model call metrics in OpenMetrics text format to this file")
+    parser.add_argument("--requests-per-minute", type=float,
+                        default=float(os.getenv('ANALYZER_REQUESTS_PER_MINUTE') or 0) or None,
+                        help="Model request rate limit per API key and model (default: ANALYZER_REQUESTS_PER_MINUTE, "
+                             "else unlimited)")
+    parser.add_argument("--tokens-per-minute", type=float,
+                        default=float(os.getenv('ANALYZER_TOKENS_PER_MINUTE') or 0) or None,
+                        help="Model token rate limit per API key and model (default: ANALYZER_TOKENS_PER_MINUTE, "
+                             "else unlimited)")
+    args = parser.parse_args(argv)
+
+    near_duplicates = None
+    if args.near_duplicates:
+        # numpy is only needed for the near-duplicate index
+        from near_duplicates import NearDuplicateIndex
+        near_duplicates = NearDuplicateIndex(args.near_duplicates, threshold=args.similarity_threshold)
+    analyzer = InterviewAnalyzer(cache=ResponseCache(args.cache_path), bias_mode=args.bias_mode,
+                                 near_duplicates=near_duplicates, escalation_threshold=args.escalation_threshold,
+                                 min_match_score=None if args.keep_unverified else args.min_match_score)
+
+    api_keys = []
+    if args.backend != "fake":
+        load_dotenv()
+        api_keys = api_keys_from_env()
+        if not api_keys:
+            print("GEMINI_API_KEY not found in environment or .env file", file=sys.stderr)
+            return 1
+
+    # Rate limits apply per API key and model, so each of those backends gets its own scheduler
+    schedulers = []
+
+    def scheduled(api_key, backend):
+        schedulers.append(RequestScheduler(requests_per_minute=args.requests_per_minute,
+                                           tokens_per_minute=args.tokens_per_minute))
+        return ScheduledBackend(backend, schedulers[-1])
+
+    def backend(model_name, tier=None):
+        if args.backend == "fake":
+            return scheduled("fake", FakeBackend(latency=args.fake_latency, jitter=args.fake_jitter,
+                                                 failure_rate=args.fake_failure_rate,
+                                                 model_name=f"fake-{tier}" if tier else "fake"))
+        # Calls rotate across every configured API key
+        return gemini_backend(api_keys, model_name, wrap=scheduled)
+
+    tiers = model_tiers_from_env({'ANALYZER_MODEL_TIERS': args.tiers or ''})
+    if tiers:
+        analyzer.set_tiers([(tier, backend(model_name, tier)) for tier, model_name in tiers])
+    else:
+        analyzer.set_backend(backend(analyzer.model_name))
+    if args.recommendation_table:
+        analyzer.prewarm_recommendations(load_recommendation_table(args.recommendation_table))
+
+    store = AnalysisStore(args.store) if args.store else None
+    analytics = None
+    if args.analytics:
+        # pandas and pyarrow are only needed for the analytics dataset
+        from bias_dataset import BiasDataset
+        analytics = BiasDataset(args.analytics)
+    stats = run_batch(analyzer, args.source, args.output, workers=args.workers, resume=not args.no_resume,
+                      fused=args.fused, store=store, analytics=analytics,
+                      stream_above=int(args.stream_above_mb * 1024 * 1024))
+
+    print(
+        f"Processed {stats['processed']} transcripts ({stats['failed']} failed, {stats['skipped']} resumed) "
+        f"in {stats['elapsed_seconds']}s\n"
+        f"Throughput: {stats['transcripts_per_second']} transcripts/sec\n"
+        f"Latency: p50 {stats['p50_latency_seconds']}s, p95 {stats['p95_latency_seconds']}s"
+    )
+    snapshot = analyzer.metrics.snapshot()
+    print(f"Estimated model cost: ${sum(snapshot['cost_usd'].values()):.4f} "
+          f"(${snapshot['cost_per_analysis_usd']:.5f} per analysis)")
+    reused = {action: snapshot['analysis'].get(action, {}).get('count', 0) for action in ("reused", "updated")}
+    if near_duplicates is not None:
+        print(f"Near-duplicates: {reused['reused']} analyses reused, {reused['updated']} updated")
+    for tier, tier_stats in snapshot['tiers'].items():
+        reasons = ", ".join(f"{reason} {count}" for reason, count in sorted(tier_stats['escalated'].items()))
+        print(f"Tier {tier} ({tier_stats['model']}): {tier_stats['runs']} sections, "
+              f"{tier_stats['escalation_rate']:.0%} escalated{' (' + reasons + ')' if reasons else ''}, "
+              f"bias p95 {tier_stats['latency'].get('bias', {}).get('p95', 0.0):.2f}s, ${tier_stats['cost_usd']:.4f}")
+    scheduler_stats = combined_stats(schedulers)
+    print(f"Schedulers ({len(schedulers)}): {scheduler_stats['upstream_calls']} upstream calls, {scheduler_stats['retries']} retries, "
+          f"{scheduler_stats['coalesced']} coalesced, {scheduler_stats['throttled_seconds']:.1f}s throttled")
+
+    if args.metrics:
+        with open(args.metrics, "w", encoding="utf-8") as f:
+            f.write(analyzer.metrics.to_openmetrics())
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
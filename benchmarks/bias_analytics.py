@@ -0,0 +1,105 @@
+"""
+Benchmark: organization-wide bias analytics over a large BiasDataset
+
+Fills a dataset with synthetic bias items (phrases from the sample
+interviews' vocabulary, a few dozen interviewers, timestamps spread over
+a year), then times a cold load, a dashboard refresh after one new
+analysis is appended, and each aggregate the analytics view computes.
+
+Usage:
+    python benchmarks/bias_analytics.py [--items 1000000] [--path /tmp/bias_dataset] [--json results.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bias_dataset import (
+    BIAS_TYPE_DTYPE, COLUMNS, SEVERITY_DTYPE, BiasDataset, bias_trends, filter_frame,
+    normalize_phrase, severity_by_interviewer, top_phrases,
+)
+from benchmarks.store_queries import PHRASES
+
+def synthetic_frame(count: int, start_time: float, seed: int = 0) -> pd.DataFrame:
+    """count synthetic dataset rows spread over the year after start_time"""
+    rng = np.random.default_rng(seed)
+    interviewers = np.array([f"interviewer-{index:02d}" for index in range(40)])
+    phrases = np.array([normalize_phrase(phrase) for phrase in PHRASES])
+    return pd.DataFrame({
+        "created_at": pd.to_datetime(np.sort(rng.uniform(start_time, start_time + 365 * 86400, count)), unit="s"),
+        "interviewer": pd.Categorical(interviewers[rng.integers(0, len(interviewers), count)]),
+        "bias_type": pd.Categorical.from_codes(rng.integers(0, len(BIAS_TYPE_DTYPE.categories), count),
+                                               dtype=BIAS_TYPE_DTYPE),
+        "severity": pd.Categorical.from_codes(rng.integers(1, len(SEVERITY_DTYPE.categories), count),
+                                              dtype=SEVERITY_DTYPE),
+        "phrase": pd.Categorical(phrases[rng.integers(0, len(phrases), count)]),
+    })[COLUMNS]
+
+def timed(func, repeat: int = 5) -> float:
+    """Best wall time in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return round(best * 1000, 2)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark bias analytics aggregates")
+    parser.add_argument("--items", type=int, default=1000000, help="Number of synthetic bias items")
+    parser.add_argument("--path", help="Dataset directory (default: a temporary directory)")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args(argv)
+
+    path = args.path or tempfile.mkdtemp()
+    existing = len(BiasDataset(path).load())
+    start = time.perf_counter()
+    if existing < args.items:
+        BiasDataset(path).append_frame(synthetic_frame(args.items - existing, time.time() - 365 * 86400))
+    fill_seconds = round(time.perf_counter() - start, 1)
+
+    month = time.time() - 30 * 86400
+    new_items = [{"Bias_Type": "Age", "Severity": "High", "Example_Phrase": PHRASES[1]}]
+
+    def cold_load():
+        return BiasDataset(path).load()
+
+    dataset = BiasDataset(path)
+    frame = dataset.load()
+
+    def refresh():
+        dataset.append(new_items, interviewer="interviewer-00")
+        current = dataset.load()
+        bias_trends(current)
+        top_phrases(current)
+        severity_by_interviewer(current)
+
+    results = {
+        "cold_load": timed(cold_load),
+        "bias_trends": timed(lambda: bias_trends(frame)),
+        "top_phrases": timed(lambda: top_phrases(frame)),
+        "severity_by_interviewer": timed(lambda: severity_by_interviewer(frame)),
+        "filtered_last_month": timed(lambda: severity_by_interviewer(filter_frame(frame, since=month))),
+        "append_and_refresh": timed(refresh),
+    }
+
+    report = {"items": len(dataset.load()), "fill_seconds": fill_seconds, "ms": results}
+    print(f"{report['items']} bias items (filled in {fill_seconds}s)")
+    for name, ms in results.items():
+        print(f"  {name:<26}{ms:>10} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
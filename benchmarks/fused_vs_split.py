@@ -0,0 +1,130 @@
+"""
+Side-by-side benchmark of the fused single-call analysis against the
+three-call path (generate_summary + detect_bias + generate_recommendations)
+
+Runs both paths over SAMPLE_INTERVIEWS with caching disabled and reports
+model calls, prompt/output tokens and wall-clock latency per transcript.
+Token counts come from the response usage metadata when available and
+fall back to a 4-characters-per-token estimate otherwise.
+
+Usage:
+    python benchmarks/fused_vs_split.py [--repeat 3] [--json results.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+from analyzer import InterviewAnalyzer
+from backends import FakeBackend
+from sample_data import SAMPLE_INTERVIEWS
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate used when the backend reports no usage metadata"""
+    return max(1, len(text) // 4)
+
+class RecordingModel:
+    """Wraps a model and records tokens and latency for every generate_content call"""
+
+    def __init__(self, model):
+        self.model = model
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt, **kwargs):
+        start = time.perf_counter()
+        response = self.model.generate_content(prompt, **kwargs)
+        elapsed = time.perf_counter() - start
+
+        usage = getattr(response, 'usage_metadata', None)
+        prompt_tokens = getattr(usage, 'prompt_token_count', None) or estimate_tokens(prompt)
+        output_tokens = getattr(usage, 'candidates_token_count', None) or estimate_tokens(response.text)
+
+        with self._lock:
+            self.calls.append({
+                "latency_seconds": elapsed,
+                "prompt_tokens": prompt_tokens,
+                "output_tokens": output_tokens,
+            })
+        return response
+
+def measure(analyzer: InterviewAnalyzer, run, transcript: str) -> dict:
+    """Run one analysis path and summarize the model calls it made"""
+    recorder = RecordingModel(analyzer.model)
+    analyzer.model = recorder
+    try:
+        start = time.perf_counter()
+        run(transcript)
+        wall = time.perf_counter() - start
+    finally:
+        analyzer.model = recorder.model
+
+    return {
+        "calls": len(recorder.calls),
+        "prompt_tokens": sum(call["prompt_tokens"] for call in recorder.calls),
+        "output_tokens": sum(call["output_tokens"] for call in recorder.calls),
+        "wall_seconds": round(wall, 4),
+    }
+
+def run_benchmark(analyzer: InterviewAnalyzer, repeat: int = 1) -> dict:
+    """Benchmark both paths over every sample interview"""
+    results = {"split": [], "fused": []}
+    for _ in range(repeat):
+        for name, transcript in SAMPLE_INTERVIEWS.items():
+            for path, run in (("split", analyzer.analyze_all), ("fused", analyzer.analyze_fused)):
+                row = measure(analyzer, run, transcript)
+                row["sample"] = name
+                results[path].append(row)
+
+    totals = {}
+    for path, rows in results.items():
+        totals[path] = {
+            "calls": sum(row["calls"] for row in rows),
+            "prompt_tokens": sum(row["prompt_tokens"] for row in rows),
+            "output_tokens": sum(row["output_tokens"] for row in rows),
+            "mean_wall_seconds": round(sum(row["wall_seconds"] for row in rows) / len(rows), 4),
+        }
+    return {"runs": results, "totals": totals}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare fused vs three-call analysis")
+    parser.add_argument("--repeat", type=int, default=1, help="Passes over the sample interviews")
+    parser.add_argument("--json", help="Write the full results to this file")
+    parser.add_argument("--backend", choices=["gemini", "fake"], default="gemini",
+                        help="Model backend; 'fake' runs offline with simulated latency")
+    parser.add_argument("--fake-latency", type=float, default=1.0, help="Mean simulated latency per call (fake backend)")
+    args = parser.parse_args(argv)
+
+    # No cache: every run must reach the model to be measured
+    analyzer = InterviewAnalyzer()
+
+    if args.backend == "fake":
+        analyzer.set_backend(FakeBackend(latency=args.fake_latency))
+    else:
+        load_dotenv()
+        api_key = os.getenv('GEMINI_API_KEY')
+        if not api_key:
+            print("GEMINI_API_KEY not found in environment or .env file", file=sys.stderr)
+            return 1
+        analyzer.set_api_key(api_key)
+
+    report = run_benchmark(analyzer, repeat=args.repeat)
+
+    print(f"{'path':<8}{'calls':>8}{'prompt tok':>12}{'output tok':>12}{'mean wall s':>13}")
+    for path, total in report["totals"].items():
+        print(f"{path:<8}{total['calls']:>8}{total['prompt_tokens']:>12}"
+              f"{total['output_tokens']:>12}{total['mean_wall_seconds']:>13}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+Cold-start guard: measure what importing a module costs with -X importtime
+
+Imports the target module (app by default) in a fresh interpreter, reports
+its cumulative import time and the slowest modules it pulls in, and fails
+when a heavy library that should load lazily is imported at startup or the
+import exceeds its time budget. Modules imported by streamlit itself are
+not attributed to the app.
+
+Usage:
+    python benchmarks/import_time.py [--module app] [--budget-ms 1500] [--json report.json]
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Libraries that must only load on the code path that needs them
+LAZY_MODULES = ("pandas", "plotly", "matplotlib", "google.generativeai", "google.ai.generativelanguage")
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+def parse_importtime(stderr: str) -> list:
+    """
+    Turn -X importtime output into a forest of {name, self_us, cumulative_us, children}
+    The output is post-order: a module's line follows the lines of the
+    modules it imported, which are indented one level deeper.
+    """
+    pending = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        level = len(indent) // 2
+        children = []
+        while pending and pending[-1][0] > level:
+            children.insert(0, pending.pop()[1])
+        pending.append((level, {
+            "name": name,
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+            "children": children,
+        }))
+    return [node for _, node in pending]
+
+def walk(node: dict, skip: tuple = ()):
+    """Yield every module in a subtree, not descending into skipped packages"""
+    yield node
+    for child in node["children"]:
+        if child["name"].split(".")[0] in skip:
+            continue
+        yield from walk(child, skip)
+
+def measure(module: str) -> dict:
+    """Import module in a fresh interpreter and summarize its import cost"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{completed.stderr[-2000:]}")
+
+    roots = [node for node in parse_importtime(completed.stderr) if node["name"] == module]
+    if not roots:
+        raise RuntimeError(f"no importtime entry for {module}")
+    root = roots[0]
+
+    own_modules = list(walk(root, skip=("streamlit",)))
+    eager = sorted({
+        node["name"] for node in own_modules
+        if any(node["name"] == lazy or node["name"].startswith(lazy + ".") for lazy in LAZY_MODULES)
+    })
+    slowest = sorted(own_modules[1:], key=lambda node: node["self_us"], reverse=True)[:15]
+
+    return {
+        "module": module,
+        "cumulative_ms": round(root["cumulative_us"] / 1000, 2),
+        "eager_heavy_imports": eager,
+        "slowest": [{"name": node["name"], "self_ms": round(node["self_us"] / 1000, 2)} for node in slowest],
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Guard against import-time regressions")
+    parser.add_argument("--module", default="app", help="Module to import")
+    parser.add_argument("--budget-ms", type=float, help="Fail if the cumulative import time exceeds this")
+    parser.add_argument("--repeat", type=int, default=3, help="Take the best of this many fresh imports")
+    parser.add_argument("--json", help="Write the report to this file")
+    args = parser.parse_args(argv)
+
+    report = min((measure(args.module) for _ in range(args.repeat)), key=lambda r: r["cumulative_ms"])
+
+    print(f"import {report['module']}: {report['cumulative_ms']} ms cumulative")
+    for node in report["slowest"]:
+        print(f"  {node['self_ms']:>9} ms  {node['name']}")
+
+    failures = []
+    if report["eager_heavy_imports"]:
+        failures.append("heavy modules imported at startup: " + ", ".join(report["eager_heavy_imports"]))
+    if args.budget_ms is not None and report["cumulative_ms"] > args.budget_ms:
+        failures.append(f"import took {report['cumulative_ms']} ms, budget is {args.budget_ms} ms")
+    report["failures"] = failures
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+Benchmark: streaming ingestion of large subtitle files
+
+Writes synthetic WebVTT files of increasing size, then streams each
+through ingest.iter_chunks() and, for comparison, reads it whole with
+read_transcript(). Reports throughput and peak Python heap allocation
+(tracemalloc) of both; streaming peak should stay flat as files grow.
+
+Usage:
+    python benchmarks/ingest.py [--sizes-mb 5 20 50] [--json results.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chunking import split_turns
+from ingest import iter_chunks, read_transcript
+from benchmarks.suite import synthetic_transcript
+
+def write_vtt(path: str, size_mb: float) -> int:
+    """Write a WebVTT file of about size_mb megabytes, one cue per speaker turn"""
+    turns = split_turns(synthetic_transcript(20))
+    target = size_mb * 1024 * 1024
+    cue = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("WEBVTT\n\n")
+        while f.tell() < target:
+            for turn in turns:
+                speaker, _, text = turn.partition(": ")
+                seconds = cue * 4
+                f.write(f"{cue + 1}\n{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}.000 --> "
+                        f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60 + 3:02d}.500\n"
+                        f"<v {speaker}>{text}\n\n")
+                cue += 1
+    return os.path.getsize(path)
+
+def measure(func) -> dict:
+    """Seconds and peak traced allocation of one call"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": round(elapsed, 3), "peak_mb": round(peak / 1024 / 1024, 2)}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark streaming transcript ingestion")
+    parser.add_argument("--sizes-mb", type=float, nargs="+", default=[5, 20, 50], help="File sizes to test")
+    parser.add_argument("--max-chars", type=int, default=20000, help="Chunk size for iter_chunks()")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args(argv)
+
+    report = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size_mb in args.sizes_mb:
+            path = os.path.join(directory, f"interview-{size_mb}.vtt")
+            size = write_vtt(path, size_mb)
+
+            chunks = 0
+
+            def stream():
+                nonlocal chunks
+                for _ in iter_chunks(path, max_chars=args.max_chars):
+                    chunks += 1
+
+            streamed = measure(stream)
+            whole = measure(lambda: read_transcript(path))
+            report.append({
+                "file_mb": round(size / 1024 / 1024, 1),
+                "chunks": chunks,
+                "stream": streamed,
+                "read_whole": whole,
+            })
+
+    for row in report:
+        mb_per_second = row["file_mb"] / max(row["stream"]["seconds"], 1e-9)
+        print(f"{row['file_mb']:>7} MB  {row['chunks']:>6} chunks  "
+              f"stream {row['stream']['seconds']:>7.2f}s ({mb_per_second:.1f} MB/s, peak {row['stream']['peak_mb']} MB)  "
+              f"read whole peak {row['read_whole']['peak_mb']} MB")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Benchmark: prompt size of interviewer-only bias scanning
+
+Runs bias detection over the sample interviews and synthetic transcripts
+with bias_mode "llm" (whole transcript) and "interviewer" (interviewer
+turns plus candidate context), using the fake backend without a response
+cache, and compares the prompt characters sent. Tokens are estimated at
+four characters each. It also reports how many local pre-screen findings
+lie inside interviewer turns, i.e. would still be seen by the model, how
+many of them verification.PhraseIndex locates in the transcript, and
+how long parsing takes.
+
+Usage:
+    python benchmarks/interviewer_scan.py [--synthetic 50] [--scale 5] [--json results.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzer import InterviewAnalyzer
+from backends import FakeBackend
+from metrics import MetricsRegistry
+from prescreen import prescreen
+from sample_data import SAMPLE_INTERVIEWS
+from turns import INTERVIEWER, parse_turns
+from verification import PhraseIndex
+from benchmarks.suite import synthetic_transcript
+
+CHARS_PER_TOKEN = 4
+
+def bias_prompt_chars(transcripts, bias_mode: str) -> int:
+    """Prompt characters sent for bias detection of every transcript in one mode"""
+    metrics = MetricsRegistry()
+    analyzer = InterviewAnalyzer(bias_mode=bias_mode, metrics=metrics, max_chunk_chars=10 ** 9)
+    analyzer.set_backend(FakeBackend())
+    for transcript in transcripts:
+        analyzer.detect_bias(transcript)
+    return metrics.snapshot()["chars"].get("bias/prompt", 0)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure prompt savings of interviewer-only bias scanning")
+    parser.add_argument("--synthetic", type=int, default=50, help="Number of synthetic transcripts")
+    parser.add_argument("--scale", type=int, default=5, help="Synthetic transcript length in multiples of a sample")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args(argv)
+
+    corpora = {
+        "samples": list(SAMPLE_INTERVIEWS.values()),
+        "synthetic": [synthetic_transcript(args.scale, seed=seed) for seed in range(args.synthetic)],
+    }
+
+    report = {}
+    for name, transcripts in corpora.items():
+        full = bias_prompt_chars(transcripts, "llm")
+        interviewer = bias_prompt_chars(transcripts, "interviewer")
+
+        findings = located = in_interviewer = 0
+        parse_ms = []
+        for transcript in transcripts:
+            start = time.perf_counter()
+            index = parse_turns(transcript)
+            parse_ms.append((time.perf_counter() - start) * 1000)
+            phrases = PhraseIndex(transcript, index)
+            for item in prescreen(transcript):
+                span = phrases.find(item.get('Example_Phrase', ''))
+                findings += 1
+                if span is not None:
+                    located += 1
+                    turn = index.turn_at(span[0])
+                    in_interviewer += turn is not None and index.roles[turn] == INTERVIEWER
+
+        report[name] = {
+            "transcripts": len(transcripts),
+            "full_prompt_tokens": full // CHARS_PER_TOKEN,
+            "interviewer_prompt_tokens": interviewer // CHARS_PER_TOKEN,
+            "savings": round(1 - interviewer / max(1, full), 3),
+            "prescreen_findings": findings,
+            "located": round(located / max(1, findings), 3),
+            "in_interviewer_turns": round(in_interviewer / max(1, findings), 3),
+            "parse_p50_ms": round(statistics.median(parse_ms), 3),
+        }
+
+    for name, stats in report.items():
+        print(f"{name} ({stats['transcripts']} transcripts)")
+        print(f"  bias prompt tokens  full {stats['full_prompt_tokens']:>10,}  "
+              f"interviewer {stats['interviewer_prompt_tokens']:>10,}  saved {stats['savings']:.1%}")
+        print(f"  pre-screen findings {stats['prescreen_findings']:>6}  located {stats['located']:.1%}  "
+              f"in interviewer turns {stats['in_interviewer_turns']:.1%}  parse p50 {stats['parse_p50_ms']} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+Benchmark: fair scheduling in the analysis job queue
+
+One bulk user submits a batch of analyses at once; interactive users then
+submit one analysis each at intervals while the batch is still queued.
+The same workload runs twice through jobs.JobQueue with the fake backend:
+once with every job under one user ID, which makes the queue first in,
+first out, and once with real user IDs, so jobs are dispatched
+round-robin across users. Reports how long interactive and bulk jobs
+waited in the queue and how long the whole batch took.
+
+Usage:
+    python benchmarks/job_queue.py [--bulk 60] [--interactive 6] [--json results.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzer import InterviewAnalyzer
+from backends import FakeBackend
+from jobs import JobQueue
+from metrics import MetricsRegistry
+from sample_data import SAMPLE_INTERVIEWS
+
+def run(fair: bool, bulk: int, interactive: int, interval: float, concurrency: int, latency: float) -> dict:
+    """Run the workload once; return queue wait statistics per kind of user"""
+    analyzer = InterviewAnalyzer(metrics=MetricsRegistry())
+    analyzer.set_backend(FakeBackend(latency=latency))
+    queue = JobQueue(concurrency=concurrency)
+    transcripts = list(SAMPLE_INTERVIEWS.values())
+
+    def submit(user: str, number: int) -> str:
+        # A unique closing question keeps every job a distinct transcript
+        transcript = transcripts[number % len(transcripts)] + f"\n\nInterviewer: Question {user} {number}?"
+        return queue.submit(user if fair else "everyone", analyzer, transcript, fused=True)
+
+    start = time.perf_counter()
+    bulk_jobs = [submit("bulk", number) for number in range(bulk)]
+    interactive_jobs = []
+    for number in range(interactive):
+        time.sleep(interval)
+        interactive_jobs.append(submit(f"interactive-{number}", number))
+
+    while queue.stats()["queued"] or queue.stats()["running"]:
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - start
+    queue.shutdown()
+
+    def waits(job_ids):
+        statuses = [queue.status(job_id) for job_id in job_ids]
+        assert all(status["state"] == "done" for status in statuses)
+        return sorted(status["started_at"] - status["submitted_at"] for status in statuses)
+
+    report = {"total_seconds": round(elapsed, 3)}
+    for name, job_ids in [("interactive", interactive_jobs), ("bulk", bulk_jobs)]:
+        seconds = waits(job_ids)
+        report[name] = {
+            "wait_p50_seconds": round(statistics.median(seconds), 3),
+            "wait_max_seconds": round(seconds[-1], 3),
+        }
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark fair scheduling in the analysis job queue")
+    parser.add_argument("--bulk", type=int, default=60, help="Analyses submitted at once by the bulk user")
+    parser.add_argument("--interactive", type=int, default=6, help="Interactive users, one analysis each")
+    parser.add_argument("--interval", type=float, default=0.1, help="Seconds between interactive submissions")
+    parser.add_argument("--concurrency", type=int, default=4, help="Jobs run at once")
+    parser.add_argument("--latency", type=float, default=0.1, help="Simulated model call latency")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args(argv)
+
+    report = {}
+    for name, fair in [("fifo", False), ("fair", True)]:
+        report[name] = run(fair, args.bulk, args.interactive, args.interval, args.concurrency, args.latency)
+
+    print(f"{args.bulk} bulk jobs, {args.interactive} interactive jobs, concurrency {args.concurrency}")
+    for name, stats in report.items():
+        print(f"  {name:<5} interactive wait p50 {stats['interactive']['wait_p50_seconds']:.3f}s "
+              f"max {stats['interactive']['wait_max_seconds']:.3f}s  "
+              f"bulk wait p50 {stats['bulk']['wait_p50_seconds']:.3f}s  total {stats['total_seconds']:.2f}s")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Micro-benchmark: balanced-bracket extract_json vs the greedy DOTALL regex
+it replaced, over large, prose-wrapped and malformed model responses
+
+For each case it reports the mean time per extraction and whether each
+approach recovered the expected value. The truncated cases show the
+regex's quadratic backtracking as the input grows; the stray-brace cases
+show it grabbing the wrong span.
+
+Usage:
+    python benchmarks/json_extraction.py [--json results.json]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parsing import extract_json
+
+def regex_extract(text: str):
+    """The previous approach: greedy match from the first '{' to the last '}'"""
+    match = re.search(r'\{.*\}', text, re.DOTALL)
+    if not match:
+        return None
+    try:
+        return json.loads(match.group())
+    except ValueError:
+        return None
+
+def build_cases():
+    """(name, response text, expected value) triples"""
+    bias = {"bias_items": [
+        {"Bias_Type": "Age", "Example_Phrase": "at your age {sic}", "Severity": "High"}
+        for _ in range(5)
+    ]}
+    large = {"bias_items": [
+        {"Bias_Type": "Age", "Example_Phrase": "phrase %d" % i, "Severity": "Low"}
+        for i in range(20000)
+    ]}
+    payload = json.dumps(bias)
+
+    cases = [
+        ("clean", payload, bias),
+        ("code_fence", "```json\n" + payload + "\n```", bias),
+        ("prose_with_braces", "Here is the {result} you asked for:\n" + payload + "\nLet me know if {anything} else.", bias),
+        ("large_1mb", "Result:\n" + json.dumps(large), large),
+    ]
+    for size in (1000, 4000, 16000):
+        cases.append((f"stray_braces_{size}", "{ " * size + payload, bias))
+    for size in (1000, 4000, 16000):
+        # Output cut off with no closing brace anywhere: the regex backtracks from every '{'
+        cases.append((f"truncated_{size}", '{"executive_summary": "The candidate' + " {" * size, None))
+    return cases
+
+def run_benchmark(min_time: float = 0.2) -> dict:
+    """Time both extractors on every case"""
+    results = []
+    for name, text, expected in build_cases():
+        row = {"case": name, "chars": len(text)}
+        for label, extractor in (("balanced", extract_json), ("regex", regex_extract)):
+            timer = timeit.Timer(lambda: extractor(text))
+            number, elapsed = timer.autorange()
+            while elapsed < min_time and number < 1_000_000:
+                number *= 2
+                elapsed = timer.timeit(number)
+            row[f"{label}_ms"] = round(elapsed / number * 1000, 4)
+            row[f"{label}_correct"] = extractor(text) == expected
+        results.append(row)
+    return {"results": results}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark JSON extraction from model responses")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark()
+
+    print(f"{'case':<24}{'chars':>10}{'balanced ms':>14}{'ok':>5}{'regex ms':>12}{'ok':>5}")
+    for row in report["results"]:
+        print(f"{row['case']:<24}{row['chars']:>10}{row['balanced_ms']:>14}{str(row['balanced_correct'])[0]:>5}"
+              f"{row['regex_ms']:>12}{str(row['regex_correct'])[0]:>5}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
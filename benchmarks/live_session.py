@@ -0,0 +1,79 @@
+"""
+Benchmark: live incremental analysis versus re-analyzing the whole transcript
+
+Replays a synthetic interview a few turns at a time. After each batch of
+turns one analyzer re-runs analyze_all() on the transcript so far, and
+another calls LiveSession.update(). Both use the fake backend without a
+response cache, so every model call is paid for; the report compares
+model calls and prompt characters sent.
+
+Usage:
+    python benchmarks/live_session.py [--scale 10] [--turns-per-update 2] [--json results.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzer import InterviewAnalyzer
+from backends import FakeBackend
+from chunking import split_turns
+from metrics import MetricsRegistry
+from benchmarks.suite import synthetic_transcript
+
+def usage(metrics: MetricsRegistry) -> dict:
+    """Model calls and prompt characters recorded so far"""
+    snapshot = metrics.snapshot()
+    return {
+        "calls": sum(snapshot["calls"].values()),
+        "prompt_chars": sum(count for key, count in snapshot["chars"].items() if key.endswith("/prompt")),
+    }
+
+def replay(turns, turns_per_update: int, analyze) -> None:
+    """Feed turns_per_update turns at a time to analyze(new_text, transcript_so_far)"""
+    for start in range(0, len(turns), turns_per_update):
+        new_text = "\n\n".join(turns[start:start + turns_per_update])
+        analyze(new_text, "\n\n".join(turns[:start + turns_per_update]))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare live session updates with full re-analysis")
+    parser.add_argument("--scale", type=int, default=10, help="Interview length in multiples of a sample")
+    parser.add_argument("--turns-per-update", type=int, default=2, help="Turns appended between updates")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args(argv)
+
+    turns = split_turns(synthetic_transcript(args.scale))
+    report = {"turns": len(turns), "turns_per_update": args.turns_per_update}
+
+    full = InterviewAnalyzer(metrics=MetricsRegistry())
+    full.set_backend(FakeBackend())
+    replay(turns, args.turns_per_update, lambda new_text, transcript: full.analyze_all(transcript))
+    report["full_reanalysis"] = usage(full.metrics)
+
+    live = InterviewAnalyzer(metrics=MetricsRegistry())
+    live.set_backend(FakeBackend())
+    session = live.start_session()
+
+    def update(new_text, transcript):
+        session.append(new_text)
+        session.update()
+
+    replay(turns, args.turns_per_update, update)
+    report["live_session"] = usage(live.metrics)
+
+    print(f"{report['turns']} turns, update every {args.turns_per_update}")
+    for name in ("full_reanalysis", "live_session"):
+        print(f"  {name:<18}{report[name]['calls']:>6} calls {report[name]['prompt_chars']:>12,} prompt chars")
+    ratio = report["full_reanalysis"]["prompt_chars"] / max(1, report["live_session"]["prompt_chars"])
+    print(f"  live session sends {ratio:.1f}x fewer prompt characters")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+Benchmark: near-duplicate index accuracy and latency
+
+Indexes synthetic transcripts, then queries re-exports of some of them
+(reformatted whitespace, added timestamps, a few edited turns) and
+unrelated transcripts. Reports how often each kind matched, the mean
+reported similarity and per-query latency.
+
+Usage:
+    python benchmarks/near_duplicates.py [--transcripts 2000] [--threshold 0.7] [--json results.json]
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chunking import split_turns
+from near_duplicates import NearDuplicateIndex
+from benchmarks.suite import synthetic_transcript
+
+EDIT = " Just to confirm, how old are you, and are you married?"
+
+def variants(transcript: str, rng: random.Random) -> dict:
+    """Re-exports of a transcript that should match it"""
+    turns = split_turns(transcript)
+    edited = list(turns)
+    for index in rng.sample(range(len(turns)), min(2, len(turns))):
+        edited[index] += EDIT
+    return {
+        "whitespace": "\n".join("  " + turn.replace(" ", "  ") for turn in turns),
+        "timestamps": "\n".join(f"[00:{index // 60:02d}:{index % 60:02d}] {turn}" for index, turn in enumerate(turns)),
+        "two_edited_turns": "\n\n".join(edited),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark near-duplicate transcript detection")
+    parser.add_argument("--transcripts", type=int, default=2000, help="Number of indexed transcripts")
+    parser.add_argument("--queries", type=int, default=100, help="Number of transcripts re-exported as queries")
+    parser.add_argument("--scale", type=int, default=5, help="Transcript length in multiples of a sample")
+    parser.add_argument("--threshold", type=float, default=0.7, help="Similarity threshold")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    index = NearDuplicateIndex(threshold=args.threshold)
+    transcripts = [synthetic_transcript(args.scale, seed=seed) for seed in range(args.transcripts)]
+    start = time.perf_counter()
+    for transcript in transcripts:
+        index.add(transcript, {"bias": {"bias_items": []}})
+    add_ms = (time.perf_counter() - start) * 1000 / len(transcripts)
+
+    queries = {"whitespace": [], "timestamps": [], "two_edited_turns": [], "unrelated": []}
+    for transcript in rng.sample(transcripts, args.queries):
+        for kind, variant in variants(transcript, rng).items():
+            queries[kind].append(variant)
+    queries["unrelated"] = [synthetic_transcript(args.scale, seed=args.transcripts + seed) for seed in range(args.queries)]
+
+    report = {"transcripts": len(index), "threshold": args.threshold, "add_ms": round(add_ms, 2), "queries": {}}
+    for kind, texts in queries.items():
+        latencies = []
+        similarities = []
+        for text in texts:
+            start = time.perf_counter()
+            match = index.query(text)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if match is not None:
+                similarities.append(match["similarity"])
+        report["queries"][kind] = {
+            "match_rate": round(len(similarities) / len(texts), 3),
+            "mean_similarity": round(statistics.mean(similarities), 3) if similarities else None,
+            "p50_ms": round(statistics.median(latencies), 2),
+        }
+
+    print(f"{report['transcripts']} transcripts indexed ({report['add_ms']} ms each), threshold {args.threshold}")
+    for kind, stats in report["queries"].items():
+        print(f"  {kind:<18} matched {stats['match_rate']:>6.1%}  similarity {stats['mean_similarity']}  "
+              f"p50 {stats['p50_ms']} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
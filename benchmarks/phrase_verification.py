@@ -0,0 +1,143 @@
+"""
+Benchmark: verifying quoted bias phrases against long transcripts
+
+Builds synthetic transcripts of several hours (about 54,000 characters
+per hour of speech) and, for each, a set of findings shaped like model
+output: exact quotes of interviewer text, paraphrased quotes (a word
+inflected or dropped, case and punctuation changed) and invented quotes
+that do not occur. Times verification.verify_bias_items(), including
+building the index, against locating each phrase with one regex scan of
+the transcript (its words, case-insensitively, with any punctuation or
+whitespace between them), and reports how many of each kind of quote were
+kept.
+
+Usage:
+    python benchmarks/phrase_verification.py [--hours 1 3 8] [--items 60] [--json results.json]
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chunking import split_turns
+from sample_data import SAMPLE_INTERVIEWS
+from verification import PhraseIndex, verify_bias_items
+from benchmarks.suite import synthetic_transcript
+
+CHARS_PER_HOUR = 54000
+
+INVENTED = [
+    "Do you attend church on Sundays?",
+    "What year did you graduate from high school?",
+    "Where were your parents born?",
+    "Would your wife mind the relocation?",
+    "Is English your first language?",
+    "How would you feel reporting to someone younger?",
+    "Do you have any health conditions we should know about?",
+    "We usually look for culture fit with our founders.",
+]
+
+def quotes(transcript: str, count: int, rng: random.Random) -> list:
+    """Runs of 5 to 10 consecutive words from random interviewer turns, as transcript text"""
+    turns = [turn for turn in split_turns(transcript) if turn.startswith("Interviewer:")]
+    picked = []
+    while len(picked) < count:
+        words = list(re.finditer(r"\w+", rng.choice(turns).partition(":")[2]))
+        if len(words) < 10:
+            continue
+        length = rng.randint(5, 10)
+        first = rng.randrange(len(words) - length + 1)
+        text = words[first].string
+        picked.append(text[words[first].start():words[first + length - 1].end()])
+    return picked
+
+def regex_scan(transcript: str, phrase: str):
+    """Baseline: the first case-insensitive match of the phrase's words, or None"""
+    pattern = r"\b" + r"\W+".join(map(re.escape, re.findall(r"\w+", phrase))) + r"\b"
+    match = re.search(pattern, transcript, re.IGNORECASE)
+    return match.span() if match else None
+
+def paraphrase(phrase: str, rng: random.Random) -> str:
+    """Inflect or drop one word, lowercase and strip punctuation"""
+    words = re.findall(r"\w+", phrase.lower())
+    index = rng.randrange(len(words))
+    if rng.random() < 0.5 and len(words) > 5:
+        del words[index]
+    else:
+        words[index] = words[index][:-1] if len(words[index]) > 4 and words[index].endswith("s") else words[index] + "s"
+    return " ".join(words)
+
+def findings(transcript: str, count: int, seed: int) -> list:
+    """Equal numbers of exact, paraphrased and invented quotes, as bias items"""
+    rng = random.Random(seed)
+    per_kind = count // 3
+    exact = quotes(transcript, per_kind, rng)
+    paraphrased = [paraphrase(phrase, rng) for phrase in quotes(transcript, per_kind, rng)]
+    invented = [rng.choice(INVENTED) for _ in range(per_kind)]
+    items = []
+    for kind, phrases in [("exact", exact), ("paraphrased", paraphrased), ("invented", invented)]:
+        items += [{"Bias_Type": kind, "Example_Phrase": phrase, "Severity": "Medium"} for phrase in phrases]
+    return items
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark verification of quoted bias phrases")
+    parser.add_argument("--hours", type=float, nargs="+", default=[1, 3, 8], help="Transcript lengths in hours")
+    parser.add_argument("--items", type=int, default=60, help="Findings per transcript, split across three kinds")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per transcript; the fastest is reported")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args(argv)
+
+    # synthetic_transcript() scales the average sample interview
+    sample_chars = sum(len(transcript) for transcript in SAMPLE_INTERVIEWS.values()) / len(SAMPLE_INTERVIEWS)
+    report = []
+    for hours in args.hours:
+        transcript = synthetic_transcript(max(1, round(hours * CHARS_PER_HOUR / sample_chars)))
+        items = findings(transcript, args.items, seed=int(hours * 10))
+
+        build = verify = scan = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            index = PhraseIndex(transcript)
+            built = time.perf_counter()
+            verified, dropped = verify_bias_items(transcript, items, index)
+            done = time.perf_counter()
+            for item in items:
+                regex_scan(transcript, item['Example_Phrase'])
+            scanned = time.perf_counter()
+            build, verify, scan = min(build, built - start), min(verify, done - built), min(scan, scanned - done)
+
+        kept = {kind: 0 for kind in ("exact", "paraphrased", "invented")}
+        for item in verified:
+            kept[item['Bias_Type']] += 1
+        report.append({
+            "hours": hours,
+            "chars": len(transcript),
+            "items": len(items),
+            "index_ms": round(build * 1000, 2),
+            "verify_ms": round(verify * 1000, 2),
+            "per_item_us": round(verify / len(items) * 1e6, 1),
+            "regex_scan_ms": round(scan * 1000, 2),
+            "kept": kept,
+            "dropped": dropped,
+        })
+
+    for row in report:
+        per_kind = row['items'] // 3
+        print(f"{row['hours']:>4}h {row['chars']:>9,} chars  index {row['index_ms']:>7.1f} ms  "
+              f"verify {row['verify_ms']:>6.1f} ms ({row['per_item_us']:.0f} us/item)  "
+              f"regex scan {row['regex_scan_ms']:>7.1f} ms  kept exact {row['kept']['exact']}/{per_kind}, "
+              f"paraphrased {row['kept']['paraphrased']}/{per_kind}, invented {row['kept']['invented']}/{per_kind}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
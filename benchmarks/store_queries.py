@@ -0,0 +1,124 @@
+"""
+Benchmark: AnalysisStore search latency over a large synthetic history
+
+Fills a store with synthetic analyses (bias items drawn from the sample
+interviews' vocabulary, timestamps spread over a year), then times phrase,
+category, severity, date-range and combined queries plus facet counts.
+
+Usage:
+    python benchmarks/store_queries.py [--analyses 300000] [--path /tmp/store.sqlite3] [--json results.json]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from recommendations import BIAS_CATEGORIES
+from store import AnalysisStore
+
+PHRASES = [
+    "Are you planning to have kids anytime soon?",
+    "at your age, learning new programming languages must be tough",
+    "this might be a young person's game",
+    "Our clients expect a certain pedigree.",
+    "Where are you originally from?",
+    "Your husband okay with you working late nights?",
+    "We usually hire from top-tier schools.",
+    "Do you go to church on Sundays?",
+]
+SUMMARY_WORDS = ("python react backend leadership communication testing kubernetes design "
+                 "databases mentoring architecture debugging product stakeholder cloud").split()
+
+def synthetic_entries(count: int, start_time: float, spacing: float, seed: int = 0):
+    """Yield count synthetic add_many() entries, spacing seconds apart from start_time"""
+    rng = random.Random(seed)
+    categories = [name for name, _ in BIAS_CATEGORIES]
+    for index in range(count):
+        items = [
+            {"Bias_Type": rng.choice(categories), "Example_Phrase": rng.choice(PHRASES),
+             "Severity": rng.choice(["Low", "Medium", "High"])}
+            for _ in range(rng.choice([0, 0, 1, 1, 2, 3]))
+        ]
+        summary = {
+            "executive_summary": " ".join(rng.choices(SUMMARY_WORDS, k=20)),
+            "strengths": [" ".join(rng.choices(SUMMARY_WORDS, k=3))],
+            "improvements": [" ".join(rng.choices(SUMMARY_WORDS, k=3))],
+            "recommendation": "Recommend advancing to the next round.",
+        }
+        yield {
+            "transcript": f"synthetic transcript {seed} {index}",
+            "results": {"summary": summary, "bias": {"bias_items": items},
+                        "recommendations": ["Use structured interviews."]},
+            "mode": "split",
+            "model_name": "fake",
+            "elapsed_seconds": rng.uniform(1, 10),
+            # Stored in arrival order, like a live history
+            "created_at": start_time + index * spacing,
+        }
+
+def fill(store: AnalysisStore, count: int, batch: int = 10000):
+    """Insert count synthetic analyses, spread over the past year, in batches"""
+    spacing = 365 * 86400 / count
+    start_time = time.time() - 365 * 86400
+    for start in range(0, count, batch):
+        store.add_many(synthetic_entries(min(batch, count - start), start_time + start * spacing, spacing, seed=start))
+
+def timed(func, repeat: int = 5) -> float:
+    """Best wall time in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return round(best * 1000, 2)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark AnalysisStore queries")
+    parser.add_argument("--analyses", type=int, default=300000, help="Number of synthetic analyses to store")
+    parser.add_argument("--path", help="Store location (default: a temporary file)")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args(argv)
+
+    path = args.path or os.path.join(tempfile.mkdtemp(), "analyses.sqlite3")
+    store = AnalysisStore(path)
+    existing = store.count()
+    start = time.perf_counter()
+    if existing < args.analyses:
+        fill(store, args.analyses - existing)
+    fill_seconds = round(time.perf_counter() - start, 1)
+    now = time.time()
+    month = now - 30 * 86400
+
+    queries = {
+        "recent_page": lambda: store.search(),
+        "phrase_rare": lambda: store.search("go to church"),
+        "phrase_common": lambda: store.search("structured interviews"),
+        "bias_type": lambda: store.search(bias_type="Religion"),
+        "severity": lambda: store.search(severity="High"),
+        "type_and_severity": lambda: store.search(bias_type=["Age", "Gender/Sex"], severity="High"),
+        "date_range": lambda: store.search(since=month, until=now),
+        "combined": lambda: store.search("kids", bias_type="Personal Life", severity="High", since=month),
+        "count_type_and_severity": lambda: store.count(bias_type="Age", severity="High"),
+        "facets_last_month": lambda: store.facets(since=month),
+        "facets_phrase": lambda: store.facets("go to church", since=month),
+    }
+    results = {name: timed(query) for name, query in queries.items()}
+
+    report = {"analyses": store.count(), "fill_seconds": fill_seconds, "query_ms": results}
+    print(f"{report['analyses']} analyses (filled in {fill_seconds}s)")
+    for name, ms in results.items():
+        print(f"  {name:<26}{ms:>10} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
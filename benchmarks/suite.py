@@ -0,0 +1,193 @@
+"""
+Offline benchmark suite for InterviewAnalyzer
+
+Drives the analyzer end to end against the local FakeBackend (zero
+simulated latency, so only the app's own overhead is measured) over
+SAMPLE_INTERVIEWS and synthetic transcripts at 1x/10x/100x length, and
+times the individual stages:
+
+    prompt_build        building the summary, bias and recommendation prompts
+    response_parse      extracting and validating model responses
+    fallback_recs       _generate_fallback_recommendations
+    word_frequency      the suspicious-word aggregation behind the bias dashboard
+    prescreen           the local bias lexicon scan
+    end_to_end          analyze_all with the fake backend and no cache
+
+Results are written as JSON. With --baseline, any metric slower than the
+baseline by more than --tolerance fails the run. Both runs are normalized
+by a fixed pure-Python reference workload timed alongside them, so a
+slower or busier machine does not read as a regression.
+
+Usage:
+    python benchmarks/suite.py --output bench.json
+    python benchmarks/suite.py --baseline bench.json --tolerance 0.5
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics import suspicious_phrases, suspicious_word_counts
+from analyzer import InterviewAnalyzer
+from backends import FakeBackend
+from chunking import split_turns
+from recommendations import bias_profile
+from sample_data import SAMPLE_INTERVIEWS
+
+SCALES = (1, 10, 100)
+
+def synthetic_transcript(scale: int, seed: int = 0) -> str:
+    """
+    Build a transcript about scale times the length of an average sample
+    Speaker turns are drawn from every sample interview, so the text has
+    the same turn structure and a realistic mix of biased and clean turns.
+    """
+    rng = random.Random(seed)
+    turns = [turn for transcript in SAMPLE_INTERVIEWS.values() for turn in split_turns(transcript)]
+    target = scale * sum(len(t) for t in SAMPLE_INTERVIEWS.values()) // len(SAMPLE_INTERVIEWS)
+
+    picked = []
+    size = 0
+    while size < target:
+        turn = rng.choice(turns)
+        picked.append(turn)
+        size += len(turn) + 2
+    return "\n\n".join(picked)
+
+def synthetic_bias_items(count: int, seed: int = 0) -> list:
+    """Bias items shaped like model output, for the parsing and aggregation stages"""
+    rng = random.Random(seed)
+    types = ["Gender/Sex", "Age", "Race/Ethnicity", "Education Background", "Personal Life", "Appearance"]
+    phrases = [
+        "Are you planning to have kids anytime soon?",
+        "at your age, learning new programming languages must be tough",
+        "this might be a young person's game",
+        "Our clients expect a certain pedigree.",
+        "You look Hispanic.",
+        "Your husband okay with you working late nights?",
+    ]
+    return [
+        {"Bias_Type": rng.choice(types), "Example_Phrase": rng.choice(phrases),
+         "Severity": rng.choice(["Low", "Medium", "High"])}
+        for _ in range(count)
+    ]
+
+def time_call(func, min_time: float = 0.05, repeat: int = 5) -> float:
+    """
+    Microseconds per call, best of repeat runs of at least min_time each
+    Taking the minimum filters out scheduler noise, so the numbers are
+    stable enough to compare against a baseline.
+    """
+    timer = timeit.Timer(func)
+    func()
+    start = time.perf_counter()
+    func()
+    single = max(time.perf_counter() - start, 1e-7)
+    number = max(1, int(min_time / single))
+    return round(min(timer.repeat(repeat, number)) / number * 1e6, 2)
+
+def reference_workload():
+    """Fixed CPU-bound work used to normalize timings across machines and runs"""
+    return sorted(str(i * 7919 % 10007) for i in range(2000))
+
+def benchmark_transcript(analyzer: InterviewAnalyzer, transcript: str, item_count: int) -> dict:
+    """Time every stage for one transcript"""
+    bias_items = synthetic_bias_items(item_count)
+    bias_response = "Here are the results:\n```json\n" + json.dumps({"bias_items": bias_items}) + "\n```"
+    summary_response = json.loads(analyzer.model.responses["summary"])
+    summary_response = "Sure! " + json.dumps(summary_response)
+    phrases = suspicious_phrases(bias_items)
+
+    return {
+        "chars": len(transcript),
+        "prompt_build_us": time_call(lambda: (
+            analyzer._summary_prompt(transcript),
+            analyzer._bias_prompt(transcript),
+            analyzer._recommendations_prompt(bias_profile(bias_items)),
+        )),
+        "response_parse_us": time_call(lambda: (
+            analyzer._parse_response("summary", summary_response),
+            analyzer._parse_response("bias", bias_response),
+        )),
+        "fallback_recs_us": time_call(lambda: analyzer._generate_fallback_recommendations(bias_items)),
+        "word_frequency_us": time_call(lambda: suspicious_word_counts(suspicious_phrases(bias_items))),
+        "prescreen_us": time_call(lambda: analyzer.prescreen_bias(transcript)),
+        "end_to_end_us": time_call(lambda: analyzer.analyze_all(transcript)),
+        "top_words": len(suspicious_word_counts(phrases)),
+    }
+
+def run_suite() -> dict:
+    """Benchmark the sample interviews and every synthetic scale"""
+    analyzer = InterviewAnalyzer()
+    analyzer.set_backend(FakeBackend())
+
+    results = {}
+    for name, transcript in SAMPLE_INTERVIEWS.items():
+        results[f"sample:{name}"] = benchmark_transcript(analyzer, transcript, item_count=5)
+    for scale in SCALES:
+        results[f"synthetic:{scale}x"] = benchmark_transcript(
+            analyzer, synthetic_transcript(scale), item_count=5 * scale
+        )
+
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "reference_us": time_call(reference_workload),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list:
+    """List metrics that got slower than baseline by more than tolerance, after normalization"""
+    scale = baseline["environment"]["reference_us"] / report["environment"]["reference_us"]
+    regressions = []
+    for case, metrics in report["results"].items():
+        previous = baseline.get("results", {}).get(case)
+        if not previous:
+            continue
+        for metric, value in metrics.items():
+            if not metric.endswith("_us") or not previous.get(metric):
+                continue
+            ratio = value * scale / previous[metric]
+            if ratio > 1 + tolerance:
+                regressions.append(f"{case} {metric}: {previous[metric]} -> {value} us ({ratio:.2f}x)")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline InterviewAnalyzer benchmark suite")
+    parser.add_argument("--output", "-o", help="Write the JSON report to this file (default: stdout)")
+    parser.add_argument("--baseline", help="Previous JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="Allowed slowdown per metric before failing (0.5 = 50%%)")
+    args = parser.parse_args(argv)
+
+    report = run_suite()
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        report["regressions"] = regressions
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    for regression in regressions:
+        print(f"REGRESSION: {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
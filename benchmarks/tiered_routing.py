@@ -0,0 +1,154 @@
+"""
+Benchmark: tiered model routing and API key round-robin
+
+Analyzes the sample interviews plus synthetic transcripts (half of them
+scrubbed of biased questions) with the fake backend, once with only the
+strong tier and once per escalation threshold with a cheap triage tier in
+front. Fake models answer bias prompts with the local pre-screen's
+findings; the triage tier's self-reported confidence varies per
+transcript. Tier calls are priced as gemini-2.5-flash-lite and
+gemini-2.5-pro. Reports cost, latency and escalation rate per run.
+
+A second part measures bias-call throughput when each API key serves one
+request at a time, for 1, 2 and 4 keys in round-robin.
+
+Usage:
+    python benchmarks/tiered_routing.py [--synthetic 40] [--json results.json]
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzer import InterviewAnalyzer
+from backends import FakeBackend, ModelBackend, RoundRobinBackend, detect_prompt_kind
+from metrics import MODEL_PRICES, MetricsRegistry
+from prescreen import prescreen
+from sample_data import SAMPLE_INTERVIEWS
+from benchmarks.suite import synthetic_transcript
+
+PRICES = {
+    "fake-triage": MODEL_PRICES["gemini-2.5-flash-lite"],
+    "fake-strong": MODEL_PRICES["gemini-2.5-pro"],
+}
+
+_TRANSCRIPT = re.compile(r"Interview Transcript:\n(.*?)\n\s*Look for biases", re.DOTALL)
+
+def responder(confident: bool):
+    """Fake model answering bias prompts from the pre-screen, with a confidence per transcript"""
+    canned = FakeBackend()
+
+    def respond(prompt: str) -> str:
+        if detect_prompt_kind(prompt) != "bias":
+            return canned._canned(prompt)
+        match = _TRANSCRIPT.search(prompt)
+        transcript = match.group(1) if match else prompt
+        if confident:
+            confidence = 0.95
+        else:
+            confidence = random.Random(zlib.crc32(transcript.encode("utf-8"))).uniform(0.5, 1.0)
+        return json.dumps({"bias_items": prescreen(transcript), "confidence": confidence})
+
+    return respond
+
+def corpus(synthetic: int) -> list:
+    """Sample interviews plus synthetic transcripts, every other one without its biased turns"""
+    transcripts = list(SAMPLE_INTERVIEWS.values())
+    for seed in range(synthetic):
+        transcript = synthetic_transcript(1, seed=seed)
+        if seed % 2:
+            transcript = "\n\n".join(turn for turn in transcript.split("\n\n") if not prescreen(turn))
+        transcripts.append(transcript)
+    return transcripts
+
+def run(transcripts, tiers, threshold: float) -> dict:
+    """Analyze every transcript; return cost, latency and routing statistics"""
+    metrics = MetricsRegistry(prices=PRICES)
+    analyzer = InterviewAnalyzer(metrics=metrics, escalation_threshold=threshold)
+    analyzer.set_tiers([
+        (name, FakeBackend(responder=responder(confident=name == "strong"), latency=latency,
+                           model_name=f"fake-{name}"))
+        for name, latency in tiers
+    ])
+    latencies = []
+    for transcript in transcripts:
+        start = time.perf_counter()
+        analyzer.analyze_all(transcript)
+        latencies.append(time.perf_counter() - start)
+
+    tier_stats = metrics.tier_stats()
+    bias_runs = {tier: stats["latency"].get("bias", {}).get("count", 0) for tier, stats in tier_stats.items()}
+    return {
+        "cost_usd": round(sum(metrics.snapshot()["cost_usd"].values()), 6),
+        "p50_seconds": round(statistics.median(latencies), 3),
+        "p95_seconds": round(sorted(latencies)[int(0.95 * (len(latencies) - 1))], 3),
+        "bias_escalated": round(bias_runs.get("strong", 0) / len(transcripts), 3) if len(tiers) > 1 else None,
+        "escalations": {tier: stats["escalated"] for tier, stats in tier_stats.items()},
+    }
+
+class OneAtATimeBackend(ModelBackend):
+    """A key that serves one request at a time, like a tight per-key quota"""
+
+    def __init__(self, backend: ModelBackend):
+        self.backend = backend
+        self.model_name = backend.model_name
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt: str, **kwargs):
+        with self._lock:
+            return self.backend.generate_content(prompt, **kwargs)
+
+def key_throughput(keys: int, calls: int, latency: float) -> float:
+    """Bias calls per second from 8 concurrent callers over keys round-robin keys"""
+    backend = RoundRobinBackend([OneAtATimeBackend(FakeBackend(latency=latency)) for _ in range(keys)])
+    analyzer = InterviewAnalyzer(metrics=MetricsRegistry())
+    analyzer.set_backend(backend)
+    prompts = [f"Interviewer: Question {index}?" for index in range(calls)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(analyzer.detect_bias, prompts))
+    return calls / (time.perf_counter() - start)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark tiered model routing")
+    parser.add_argument("--synthetic", type=int, default=40, help="Number of synthetic transcripts")
+    parser.add_argument("--triage-latency", type=float, default=0.02, help="Simulated triage call latency")
+    parser.add_argument("--strong-latency", type=float, default=0.1, help="Simulated strong call latency")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.6, 0.7, 0.8, 0.9])
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args(argv)
+
+    transcripts = corpus(args.synthetic)
+    random.Random(0).shuffle(transcripts)
+    report = {"transcripts": len(transcripts), "runs": {}}
+    report["runs"]["strong only"] = run(transcripts, [("strong", args.strong_latency)], 0.7)
+    for threshold in args.thresholds:
+        report["runs"][f"tiered @ {threshold}"] = run(
+            transcripts, [("triage", args.triage_latency), ("strong", args.strong_latency)], threshold
+        )
+    report["keys"] = {keys: round(key_throughput(keys, 80, args.triage_latency), 1) for keys in (1, 2, 4)}
+
+    print(f"{report['transcripts']} transcripts")
+    for name, stats in report["runs"].items():
+        escalated = "" if stats["bias_escalated"] is None else f"  escalated {stats['bias_escalated']:.0%}"
+        print(f"  {name:<16} cost ${stats['cost_usd']:.4f}  p50 {stats['p50_seconds']:.3f}s  "
+              f"p95 {stats['p95_seconds']:.3f}s{escalated}")
+    print("  bias calls/sec by API key count: " + ", ".join(f"{keys}: {rate}" for keys, rate in report["keys"].items()))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+"""
+Columnar dataset of bias items across every analyzed interview
+Each detected bias item becomes one row (timestamp, interviewer, canonical
+category, severity, normalized phrase) in a directory of Parquet files.
+Organization-wide aggregates - category trends over time, the most
+common phrases and the severity mix per interviewer - are computed with
+vectorized pandas and NumPy operations on categorical codes, so they stay fast
+at millions of rows.
+
+Appends write small Parquet files that are merged into larger ones as
+they accumulate, and BiasDataset.load() only reads files it has not seen.
+"""
+
+import os
+import re
+import threading
+import time
+import uuid
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from recommendations import BIAS_CATEGORIES, SEVERITY_ORDER, canonical_bias_type, canonical_severity
+
+BIAS_TYPE_DTYPE = pd.CategoricalDtype([name for name, _ in BIAS_CATEGORIES] + ["Other"])
+SEVERITY_DTYPE = pd.CategoricalDtype(SEVERITY_ORDER, ordered=True)
+COLUMNS = ["created_at", "interviewer", "bias_type", "severity", "phrase"]
+UNKNOWN_INTERVIEWER = "Unknown"
+
+_PUNCTUATION = re.compile(r"[^\w\s']+")
+_FILE_NAME = re.compile(r"^L(\d+)-.+\.parquet$")
+
+def normalize_phrase(phrase: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace so rephrased quotes group together"""
+    return " ".join(_PUNCTUATION.sub(" ", (phrase or "").lower()).split())
+
+def bias_frame(bias_items: Iterable[Dict], interviewer: Optional[str] = None,
+               created_at: Optional[float] = None) -> pd.DataFrame:
+    """
+    Turn one analysis's bias_items into dataset rows
+    Returns: DataFrame with COLUMNS, categories canonicalized
+    """
+    bias_items = list(bias_items)
+    count = len(bias_items)
+    return _with_dtypes(pd.DataFrame({
+        "created_at": pd.to_datetime([created_at or time.time()] * count, unit="s"),
+        "interviewer": [(interviewer or "").strip() or UNKNOWN_INTERVIEWER] * count,
+        "bias_type": [canonical_bias_type(item.get('Bias_Type', '')) for item in bias_items],
+        "severity": [canonical_severity(item.get('Severity', '')) for item in bias_items],
+        "phrase": [normalize_phrase(item.get('Example_Phrase', '')) for item in bias_items],
+    }))
+
+def _with_dtypes(frame: pd.DataFrame) -> pd.DataFrame:
+    """Cast a frame to the dataset's column types"""
+    return frame.astype({
+        "created_at": "datetime64[ns]",
+        "interviewer": "category",
+        "bias_type": BIAS_TYPE_DTYPE,
+        "severity": SEVERITY_DTYPE,
+        "phrase": "category",
+    })[COLUMNS]
+
+def _concat(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenate dataset frames, keeping every column categorical
+    pd.concat falls back to object columns when category sets differ, which
+    would make every later aggregate slow; union_categoricals merges them.
+    """
+    frames = [frame for frame in frames if len(frame)]
+    if not frames:
+        return _with_dtypes(pd.DataFrame({column: [] for column in COLUMNS}))
+    if len(frames) == 1:
+        return frames[0]
+    columns = {}
+    for column in COLUMNS:
+        if column in ("interviewer", "phrase"):
+            # Open-ended categories: merge the category sets
+            columns[column] = pd.Series(union_categoricals([frame[column] for frame in frames]))
+        else:
+            # Fixed dtypes concatenate as they are
+            columns[column] = pd.concat([frame[column] for frame in frames], ignore_index=True)
+    return pd.DataFrame(columns)
+
+class BiasDataset:
+    """
+    Append-only Parquet dataset in a directory
+    Files are named by level; once fanout files pile up at one level they
+    are merged into a single file at the next, so the file count grows
+    logarithmically with the number of appends. load() caches the frame
+    and extends it with new files, rereading everything only after a merge.
+    Appends are serialized within a process; run one writing process per
+    directory.
+    """
+
+    def __init__(self, path: str, fanout: int = 16):
+        self.path = path
+        self.fanout = fanout
+        os.makedirs(path, exist_ok=True)
+        self._lock = threading.Lock()
+        self._loaded = {}
+        self._frame = None
+
+    def append(self, bias_items: Iterable[Dict], interviewer: Optional[str] = None,
+               created_at: Optional[float] = None) -> int:
+        """
+        Add one analysis's bias items
+        Returns: the number of rows written
+        """
+        return self.append_frame(bias_frame(bias_items, interviewer, created_at))
+
+    def append_frame(self, frame: pd.DataFrame) -> int:
+        """Add rows already shaped by bias_frame()"""
+        if not len(frame):
+            return 0
+        with self._lock:
+            self._write(frame, 0)
+            self._compact()
+        return len(frame)
+
+    def load(self) -> pd.DataFrame:
+        """
+        Every row in the dataset
+        Returns: DataFrame with COLUMNS; created_at is naive UTC
+        """
+        with self._lock:
+            try:
+                return self._load()
+            except FileNotFoundError:
+                # Another process merged files while we were reading them
+                self._frame = None
+                return self._load()
+
+    def _load(self) -> pd.DataFrame:
+        """load() body; the caller holds the lock"""
+        files = self._files()
+        if self._frame is None or not set(self._loaded) <= set(files):
+            # First load, or files were merged since: start over
+            self._loaded = {}
+            self._frame = None
+        new = [name for name in files if name not in self._loaded]
+        if new or self._frame is None:
+            frames = [self._frame] if self._frame is not None else []
+            for name in new:
+                frames.append(_with_dtypes(pd.read_parquet(os.path.join(self.path, name))))
+            self._frame = _concat(frames)
+            self._loaded.update(dict.fromkeys(new, True))
+        return self._frame
+
+    def _files(self, level: Optional[int] = None) -> List[str]:
+        """Dataset file names, roughly oldest rows first, optionally only those at one level"""
+        names = {}
+        for name in os.listdir(self.path):
+            match = _FILE_NAME.match(name)
+            if match and (level is None or int(match.group(1)) == level):
+                names[name] = int(match.group(1))
+        # Higher levels hold merged, older rows
+        return sorted(names, key=lambda name: (-names[name], name))
+
+    def _write(self, frame: pd.DataFrame, level: int):
+        """Write one file atomically; the caller holds the lock"""
+        name = f"L{level}-{time.time_ns():020d}-{uuid.uuid4().hex[:8]}.parquet"
+        temp_path = os.path.join(self.path, f".{name}.tmp")
+        frame.to_parquet(temp_path, index=False)
+        os.replace(temp_path, os.path.join(self.path, name))
+
+    def _compact(self):
+        """Merge full levels into the next one; the caller holds the lock"""
+        level = 0
+        while True:
+            names = self._files(level)
+            if len(names) < self.fanout:
+                return
+            merged = _concat([_with_dtypes(pd.read_parquet(os.path.join(self.path, name))) for name in names])
+            self._write(merged, level + 1)
+            for name in names:
+                os.remove(os.path.join(self.path, name))
+            level += 1
+
+def filter_frame(frame: pd.DataFrame, since: Optional[float] = None, until: Optional[float] = None,
+                 interviewers: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """Rows with created_at in [since, until) (Unix timestamps) and, optionally, from the given interviewers"""
+    mask = pd.Series(True, index=frame.index)
+    if since is not None:
+        mask &= frame["created_at"] >= pd.to_datetime(since, unit="s")
+    if until is not None:
+        mask &= frame["created_at"] < pd.to_datetime(until, unit="s")
+    if interviewers:
+        mask &= frame["interviewer"].isin(list(interviewers))
+    return frame if mask.all() else frame[mask]
+
+def _crosstab(row_codes: np.ndarray, row_count: int, column_codes: np.ndarray, column_count: int) -> np.ndarray:
+    """Count rows per (row code, column code) pair in one bincount pass"""
+    counts = np.bincount(row_codes.astype(np.int64) * column_count + column_codes, minlength=row_count * column_count)
+    return counts.reshape(row_count, column_count)
+
+def bias_trends(frame: pd.DataFrame, freq: str = "W") -> pd.DataFrame:
+    """
+    Bias items per period and category
+    freq is "D", "W" (weeks starting Monday) or "M".
+    Returns: DataFrame indexed by period start with one column per category seen
+    """
+    stamps = frame["created_at"].to_numpy()
+    if freq == "W":
+        # numpy weeks start on Thursdays (the epoch's weekday); shift to Mondays
+        shift = np.timedelta64(3, "D")
+        periods = (stamps + shift).astype("datetime64[W]").astype("datetime64[D]") - shift
+    else:
+        periods = stamps.astype(f"datetime64[{freq}]").astype("datetime64[D]")
+    if not len(periods):
+        return pd.DataFrame(index=pd.DatetimeIndex([], name="period"), columns=pd.Index([], name="bias_type"))
+
+    days = periods.astype(np.int64)
+    first = days.min()
+    counts = _crosstab(days - first, int(days.max() - first) + 1,
+                       frame["bias_type"].cat.codes.to_numpy(), len(BIAS_TYPE_DTYPE.categories))
+    rows = counts.sum(axis=1) > 0
+    columns = counts.sum(axis=0) > 0
+    index = pd.DatetimeIndex((first + np.flatnonzero(rows)).astype("datetime64[D]"), name="period")
+    return pd.DataFrame(counts[rows][:, columns], index=index,
+                        columns=pd.Index(BIAS_TYPE_DTYPE.categories[columns], name="bias_type"))
+
+def top_phrases(frame: pd.DataFrame, top_n: int = 10) -> pd.Series:
+    """Most frequent normalized phrases with their counts"""
+    counts = frame["phrase"].value_counts()
+    counts = counts[counts.index != ""]
+    return counts.head(top_n)
+
+def severity_by_interviewer(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Severity distribution per interviewer
+    Returns: DataFrame indexed by interviewer with High/Medium/Low/Unknown
+    count columns, most High findings first
+    """
+    interviewers = frame["interviewer"].cat
+    counts = _crosstab(interviewers.codes.to_numpy(), len(interviewers.categories),
+                       frame["severity"].cat.codes.to_numpy(), len(SEVERITY_ORDER))
+    present = counts.sum(axis=1) > 0
+    table = pd.DataFrame(counts[present][:, ::-1], columns=SEVERITY_ORDER[::-1],
+                         index=pd.Index(interviewers.categories[present], name="interviewer"))
+    return table.sort_values(SEVERITY_ORDER[::-1], ascending=False)
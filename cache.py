@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+def normalize_transcript(transcript: str) -> str:
+    """Collapse whitespace so cosmetic differences hash to the same key"""
+    return " ".join(transcript.split())
+
+class ResponseCache:
+    """
+    Content-addressed cache for parsed InterviewAnalyzer results
+    Keeps a small in-memory LRU tier in front of an on-disk SQLite tier.
+    Both tiers expire entries after ttl_seconds; the disk tier is also
+    trimmed to max_disk_items, evicting the least recently used rows.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_memory_items: int = 256,
+                 max_disk_items: int = 10000, ttl_seconds: float = 7 * 24 * 3600):
+        self.path = path
+        self.max_memory_items = max_memory_items
+        self.max_disk_items = max_disk_items
+        self.ttl_seconds = ttl_seconds
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+        self._db = None
+        if path:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_responses_created ON responses (created_at)")
+            self._db.commit()
+
+    @staticmethod
+    def make_key(kind: str, payload: str, prompt_version: str, model_name: str) -> str:
+        """Hash (kind, normalized payload, prompt version, model name) into a cache key"""
+        digest = hashlib.sha256()
+        for part in (kind, prompt_version, model_name, normalize_transcript(payload)):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss"""
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, created_at = entry
+                if now - created_at <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self._counters["memory_hits"] += 1
+                    return json.loads(value)
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value, created_at = row
+                    if now - created_at <= self.ttl_seconds:
+                        self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+                        self._db.commit()
+                        self._remember(key, value, created_at)
+                        self._counters["disk_hits"] += 1
+                        return json.loads(value)
+                    self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._db.commit()
+
+            self._counters["misses"] += 1
+            return None
+
+    def set(self, key: str, value: Any):
+        """Store a JSON-serializable value under key in both tiers"""
+        now = time.time()
+        serialized = json.dumps(value)
+
+        with self._lock:
+            self._remember(key, serialized, now)
+            self._counters["writes"] += 1
+
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, serialized, now, now)
+                )
+                self._evict_disk(now)
+                self._db.commit()
+
+    def clear(self):
+        """Drop every cached entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current tier sizes"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats["memory_items"] = len(self._memory)
+            stats["disk_items"] = (
+                self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+                if self._db is not None else 0
+            )
+
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    def _remember(self, key: str, serialized: str, created_at: float):
+        """Insert into the memory tier, evicting the least recently used entry"""
+        self._memory[key] = (serialized, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def _evict_disk(self, now: float):
+        """Drop expired rows, then trim the disk tier down to max_disk_items"""
+        expired = self._db.execute(
+            "DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,)
+        ).rowcount
+
+        overflow = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_disk_items
+        if overflow > 0:
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,)
+            )
+
+        self._counters["evictions"] += max(expired, 0) + max(overflow, 0)
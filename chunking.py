@@ -0,0 +1,97 @@
+"""
+Transcript chunking for map-reduce analysis of long interviews
+Transcripts are split on speaker turns ("Interviewer: ...", "Candidate: ...")
+and packed into overlapping chunks, so no turn is ever cut in half and
+phrases near a boundary are seen with their context.
+"""
+
+import re
+from typing import Dict, Iterable, Iterator, List
+
+SPEAKER_TURN = re.compile(r"^[ \t]*[A-Z][\w .'()-]{0,40}:[ \t]", re.MULTILINE)
+
+_SEVERITY_RANK = {"high": 3, "medium": 2, "low": 1}
+
+def split_turns(transcript: str) -> List[str]:
+    """
+    Split a transcript into speaker turns
+    Text before the first speaker label is kept as its own turn; lines
+    without a label are folded into the turn they follow.
+    """
+    starts = [match.start() for match in SPEAKER_TURN.finditer(transcript)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    starts.append(len(transcript))
+
+    turns = []
+    for start, end in zip(starts, starts[1:]):
+        turn = transcript[start:end].strip()
+        if turn:
+            turns.append(turn)
+    return turns
+
+def chunk_transcript(transcript: str, max_chars: int = 12000, overlap_turns: int = 1) -> List[str]:
+    """
+    Pack speaker turns into chunks of at most max_chars characters
+    Each chunk after the first repeats the last overlap_turns turns of the
+    previous chunk. A single turn longer than max_chars becomes its own chunk.
+    """
+    return list(pack_turns(split_turns(transcript), max_chars, overlap_turns))
+
+def pack_turns(turns: Iterable[str], max_chars: int = 12000, overlap_turns: int = 1) -> Iterator[str]:
+    """
+    Lazily pack a stream of speaker turns into chunks, as chunk_transcript() does
+    Only the chunk being built is held, so turns can come straight from a
+    file (see ingest.iter_turns()).
+    """
+    current = []
+    size = 0
+
+    for turn in turns:
+        if current and size + len(turn) > max_chars:
+            yield "\n\n".join(current)
+            current = current[-overlap_turns:] if overlap_turns else []
+            size = sum(len(t) + 2 for t in current)
+            # Drop overlap that would leave no room for the new turn
+            while current and size + len(turn) > max_chars:
+                size -= len(current.pop(0)) + 2
+        current.append(turn)
+        size += len(turn) + 2
+
+    if current:
+        yield "\n\n".join(current)
+
+def _normalize_phrase(phrase: str) -> str:
+    """Lowercase and strip punctuation/whitespace differences from a quoted phrase"""
+    return " ".join(re.sub(r"[^\w\s]", " ", phrase.lower()).split())
+
+def merge_bias_items(chunk_results: Iterable[List[Dict]]) -> List[Dict]:
+    """
+    Merge per-chunk bias_items, dropping duplicates found in overlapping chunks
+    Two items are duplicates when they share a Bias_Type and one normalized
+    phrase contains the other. The longer phrase and the higher severity win.
+    """
+    merged = []
+    keys = []
+
+    for items in chunk_results:
+        for item in items:
+            bias_type = item.get('Bias_Type', '').strip().lower()
+            phrase = _normalize_phrase(item.get('Example_Phrase', ''))
+
+            for index, (seen_type, seen_phrase) in enumerate(keys):
+                if seen_type == bias_type and (phrase in seen_phrase or seen_phrase in phrase):
+                    existing = merged[index]
+                    if len(phrase) > len(seen_phrase):
+                        existing = dict(existing, Example_Phrase=item.get('Example_Phrase', ''))
+                        keys[index] = (seen_type, phrase)
+                    if (_SEVERITY_RANK.get(item.get('Severity', '').lower(), 0)
+                            > _SEVERITY_RANK.get(existing.get('Severity', '').lower(), 0)):
+                        existing = dict(existing, Severity=item['Severity'])
+                    merged[index] = existing
+                    break
+            else:
+                merged.append(dict(item))
+                keys.append((bias_type, phrase))
+
+    return merged
@@ -0,0 +1,231 @@
+"""
+Streaming ingestion of transcript files
+Plain text, WebVTT and SubRip files are read a line at a time, from a
+memory-mapped local file or an uploaded file object, and turned into
+normalized speaker turns ("Interviewer: ..."): timestamps, cue numbers
+and markup are dropped, speaker labels are normalized, and consecutive
+cues from the same speaker are merged. Turns can be packed into chunks
+as they are read (iter_chunks()), so a file never has to be held whole.
+
+Usage:
+    python ingest.py recording.vtt > transcript.txt
+"""
+
+import argparse
+import io
+import mmap
+import os
+import re
+import sys
+from itertools import chain
+from typing import IO, Iterator, List, Optional, Union
+
+from chunking import pack_turns
+
+TRANSCRIPT_EXTENSIONS = (".txt", ".vtt", ".srt")
+
+# Turns longer than this are split (the label is repeated) so that a file
+# with no speaker labels still streams in bounded pieces
+MAX_TURN_CHARS = 4000
+
+_CUE_NUMBER = re.compile(r"^\d+$")
+# Timestamps at the start of a line: "[00:01:23]", "00:01:23.456 -", "(3:15 pm)"
+_LEADING_TIMESTAMP = re.compile(
+    r"^[\[(]?\d{1,2}:\d{2}(?::\d{2})?(?:[.,]\d{1,3})?(?:\s*[ap]\.?m\.?)?[\])]?\s*[-|]?\s*",
+    re.IGNORECASE
+)
+# "Jane Doe  0:03" on its own line, as exported by some transcription services
+_LABEL_WITH_TIME = re.compile(r"^([A-Z][\w .'()-]{0,40}?)\s+\(?\d{1,2}:\d{2}(?::\d{2})?\)?$")
+_VOICE_TAG = re.compile(r"<v(?:\.[\w.-]+)?\s+([^>]+)>")
+_MARKUP = re.compile(r"</?[^>]*>|\{\\[^}]*\}")
+# At most four words starting with a capital, like chunking.SPEAKER_TURN
+_LABEL_WORDS = r"[A-Z][\w.'()-]*(?: [\w.'()-]+){0,3}"
+_BRACKETED_LABEL = re.compile(r"^[\[(](" + _LABEL_WORDS + r")[\])]\s*:?\s*")
+_LABEL = re.compile(r"^(" + _LABEL_WORDS + r")\s*:(?:\s+|$)")
+
+Source = Union[str, os.PathLike, IO]
+
+def iter_lines(source: Source) -> Iterator[str]:
+    """
+    Yield the lines of a local path or file object without line endings
+    Local files are memory-mapped, so only the pages being read are
+    resident; file objects (e.g. Streamlit uploads) are read through a
+    small buffer. Bytes are decoded as UTF-8, dropping a byte order mark.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                first = True
+                for raw in iter(mapped.readline, b""):
+                    line = raw.decode("utf-8", errors="replace")
+                    if first:
+                        line = line.lstrip("﻿")
+                        first = False
+                    yield line.rstrip("\r\n")
+        return
+
+    if hasattr(source, "seek"):
+        source.seek(0)
+    sample = source.read(0)
+    if isinstance(sample, bytes):
+        text = io.TextIOWrapper(source, encoding="utf-8-sig", errors="replace", newline=None)
+        try:
+            for line in text:
+                yield line.rstrip("\r\n")
+        finally:
+            # Leave the caller's file object open
+            text.detach()
+    else:
+        for line in source:
+            yield line.rstrip("\r\n").lstrip("﻿")
+
+def detect_format(name: Optional[str], first_line: str) -> str:
+    """"vtt", "srt" or "txt", from the file extension, else from the first line"""
+    extension = os.path.splitext(name or "")[1].lower()
+    if extension in (".vtt", ".srt"):
+        return extension[1:]
+    if first_line.startswith("WEBVTT"):
+        return "vtt"
+    return "txt"
+
+def normalize_label(label: str) -> str:
+    """Speaker label with spacing collapsed and all-caps or snake_case labels title-cased"""
+    label = " ".join(label.replace("_", " ").split())
+    if label.isupper():
+        label = label.title()
+    return label
+
+def split_label(line: str):
+    """
+    Separate a leading speaker label from a line of text
+    Recognizes "Name: text", "NAME : text", "[Name] text", ">> Name: text"
+    and WebVTT voice tags ("<v Name>text").
+    Returns: (label or None, text)
+    """
+    voice = _VOICE_TAG.search(line)
+    if voice:
+        label = voice.group(1)
+        line = line[voice.end():]
+    else:
+        label = None
+    line = _MARKUP.sub("", line).strip()
+    line = line.lstrip(">").lstrip()
+    if line.startswith("- "):
+        line = line[2:]
+
+    if label is None:
+        match = _LABEL.match(line) or _BRACKETED_LABEL.match(line)
+        if match and not match.group(1).strip().isdigit():
+            label = match.group(1)
+            line = line[match.end():]
+    return (normalize_label(label) if label else None), line.strip()
+
+def _cue_lines(lines: Iterator[str], fmt: str) -> Iterator[str]:
+    """
+    The spoken text lines of a transcript, with timing, numbering and headers removed
+    Subtitle files are read block by block (blocks are separated by blank
+    lines); only text after a block's timing line is kept, which drops
+    cue numbers and identifiers, the WEBVTT header and NOTE/STYLE blocks.
+    A blank line is yielded between paragraphs of plain text.
+    """
+    if fmt == "txt":
+        for line in lines:
+            if "-->" in line:
+                continue
+            line = _LEADING_TIMESTAMP.sub("", line.strip())
+            yield line
+        return
+
+    timed = False
+    for line in lines:
+        line = line.strip()
+        if not line:
+            timed = False
+        elif "-->" in line:
+            timed = True
+        elif timed and not _CUE_NUMBER.match(line):
+            yield line
+
+def iter_turns(source: Source, name: Optional[str] = None,
+               max_turn_chars: int = MAX_TURN_CHARS) -> Iterator[str]:
+    """
+    Stream normalized speaker turns from a .txt, .vtt or .srt file
+    name is used to pick the format and defaults to the path or the file
+    object's name attribute. Consecutive cues by the same speaker become
+    one turn, and lines without a label continue the current turn. In plain
+    text, unlabeled paragraphs are kept as separate turns.
+    Yields: turn strings, "Speaker: text" when the speaker is known
+    """
+    if name is None:
+        name = os.fspath(source) if isinstance(source, (str, os.PathLike)) else getattr(source, "name", None)
+    lines = iter_lines(source)
+    first = next(lines, None)
+    if first is None:
+        return
+    fmt = detect_format(name, first)
+    separator = " " if fmt != "txt" else "\n"
+
+    speaker = None
+    parts: List[str] = []
+    size = 0
+
+    def turn():
+        text = separator.join(parts)
+        return f"{speaker}: {text}" if speaker else text
+
+    for line in _cue_lines(chain([first], lines), fmt):
+        if not line:
+            # Paragraph break in plain text ends an unlabeled turn
+            if parts and speaker is None:
+                yield turn()
+                parts, size = [], 0
+            continue
+
+        timed_label = _LABEL_WITH_TIME.match(line)
+        if timed_label:
+            label, text = normalize_label(timed_label.group(1)), ""
+        else:
+            label, text = split_label(line)
+
+        if label is not None and label != speaker:
+            if parts:
+                yield turn()
+            speaker, parts, size = label, [], 0
+        if not text:
+            continue
+        if parts and size + len(text) > max_turn_chars:
+            yield turn()
+            parts, size = [], 0
+        parts.append(text)
+        size += len(text) + 1
+
+    if parts:
+        yield turn()
+
+def iter_chunks(source: Source, name: Optional[str] = None, max_chars: int = 20000,
+                overlap_turns: int = 1) -> Iterator[str]:
+    """Stream a transcript file as overlapping chunks of whole turns, as chunking.chunk_transcript() would split it"""
+    return pack_turns(iter_turns(source, name), max_chars, overlap_turns)
+
+def read_transcript(source: Source, name: Optional[str] = None) -> str:
+    """
+    Read a whole transcript file as normalized text
+    Returns: turns separated by blank lines, the format the sample
+    transcripts use
+    """
+    return "\n\n".join(iter_turns(source, name))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert a .txt, .vtt or .srt transcript to normalized speaker turns")
+    parser.add_argument("path", help="Transcript file")
+    args = parser.parse_args(argv)
+
+    for index, turn in enumerate(iter_turns(args.path)):
+        sys.stdout.write(("\n\n" if index else "") + turn)
+    sys.stdout.write("\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+"""
+Local job queue for analyses, shared by every user of the server
+Submissions return a job ID at once. An asyncio event loop on a background
+thread runs up to `concurrency` jobs at a time, each on a worker thread
+because InterviewAnalyzer is synchronous, and clients poll status() for
+progress, partial results and the final result. Queued jobs are dispatched
+round-robin across users, so one user's bulk submissions take turns with
+everyone else's instead of running ahead of them.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+FINISHED_STATES = ("done", "failed", "cancelled")
+
+logger = logging.getLogger(__name__)
+
+class Job:
+    """One submitted analysis and everything known about its progress"""
+
+    def __init__(self, user: str, analyzer, transcript: str, fused: bool = False,
+                 on_complete: Optional[Callable[[Dict[str, Any], Dict[str, float]], None]] = None):
+        self.id = uuid.uuid4().hex
+        self.user = user
+        self.analyzer = analyzer
+        self.transcript = transcript
+        self.fused = fused
+        self.on_complete = on_complete
+
+        self.state = "queued"
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        # Finished sections, and seconds from start until each arrived
+        self.sections: Dict[str, Any] = {}
+        self.timings: Dict[str, float] = {}
+        # Streamed pieces of sections still in progress
+        self.partial_summary: Dict[str, Any] = {}
+        self.partial_bias = []
+        self.results = None
+        self.error = None
+        # Error raised by on_complete, which does not fail the job
+        self.callback_error = None
+
+class JobQueue:
+    """
+    Asyncio worker pool with per-user fair scheduling
+    per_user_limit optionally caps how many of one user's jobs run at
+    once. Up to keep_finished finished jobs are kept for polling; older ones
+    are forgotten.
+    """
+
+    def __init__(self, concurrency: int = 4, per_user_limit: Optional[int] = None, keep_finished: int = 500):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.concurrency = concurrency
+        self.per_user_limit = per_user_limit
+        self.keep_finished = keep_finished
+
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._queues: Dict[str, deque] = {}
+        # Users with queued jobs, in the order they next get a turn
+        self._rotation = deque()
+        self._running: Dict[str, int] = {}
+        self._finished = 0
+
+        self._loop = None
+        self._ready = None
+        self._closing = False
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="analysis-job")
+
+    def submit(self, user: str, analyzer, transcript: str, fused: bool = False,
+               on_complete: Optional[Callable[[Dict[str, Any], Dict[str, float]], None]] = None) -> str:
+        """
+        Queue an analysis of transcript for user
+        on_complete(results, timings) runs on the worker thread after a
+        successful analysis and before the job is marked done, e.g. to save
+        the results; if it raises, the job is still done and the error is
+        logged and reported as callback_error.
+        Returns: the job ID to poll with status()
+        """
+        job = Job(user, analyzer, transcript, fused, on_complete)
+        with self._lock:
+            if self._closing:
+                raise RuntimeError("JobQueue is shut down")
+            self._jobs[job.id] = job
+            if user not in self._queues:
+                self._queues[user] = deque()
+            if not self._queues[user]:
+                self._rotation.append(user)
+            self._queues[user].append(job)
+        self._start()
+        self._wake()
+        return job.id
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Poll a job
+        Returns: Dictionary with id, user, state ("queued", "running",
+        "done", "failed" or "cancelled"), position (jobs dispatched before
+        it, while queued), submitted_at/started_at/finished_at, sections and
+        timings so far, partial_summary, partial_bias, results, error and
+        callback_error; or None for an unknown or forgotten job
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            return {
+                "id": job.id,
+                "user": job.user,
+                "state": job.state,
+                "position": self._position(job) if job.state == "queued" else None,
+                "submitted_at": job.submitted_at,
+                "started_at": job.started_at,
+                "finished_at": job.finished_at,
+                "sections": dict(job.sections),
+                "timings": dict(job.timings),
+                "partial_summary": dict(job.partial_summary),
+                "partial_bias": list(job.partial_bias),
+                "results": job.results,
+                "error": job.error,
+                "callback_error": job.callback_error,
+            }
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job that has not started; running jobs finish normally"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.state != "queued":
+                return False
+            self._queues[job.user].remove(job)
+            if not self._queues[job.user]:
+                self._rotation.remove(job.user)
+            self._finish(job, "cancelled")
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Current load
+        Returns: Dictionary with concurrency, queued, running, finished and
+        queued_by_user
+        """
+        with self._lock:
+            return {
+                "concurrency": self.concurrency,
+                "queued": sum(len(queue) for queue in self._queues.values()),
+                "running": sum(self._running.values()),
+                "finished": self._finished,
+                "queued_by_user": {user: len(queue) for user, queue in self._queues.items() if queue},
+            }
+
+    def shutdown(self, wait: bool = True):
+        """Stop taking jobs; running jobs finish, queued ones are cancelled"""
+        with self._lock:
+            self._closing = True
+            for queue in self._queues.values():
+                while queue:
+                    self._finish(queue.popleft(), "cancelled")
+            self._rotation.clear()
+        self._wake()
+        self._executor.shutdown(wait=wait)
+
+    def _start(self):
+        """Start the event loop thread and its workers on first use"""
+        with self._lock:
+            if self._loop is not None:
+                return
+            self._loop = asyncio.new_event_loop()
+            started = threading.Event()
+
+            def run():
+                asyncio.set_event_loop(self._loop)
+                self._ready = asyncio.Event()
+                for _ in range(self.concurrency):
+                    self._loop.create_task(self._worker())
+                started.set()
+                self._loop.run_forever()
+
+            threading.Thread(target=run, name="analysis-job-loop", daemon=True).start()
+        started.wait()
+
+    def _wake(self):
+        """Tell idle workers from any thread that a job may be ready"""
+        if self._loop is not None and self._ready is not None:
+            self._loop.call_soon_threadsafe(self._ready.set)
+
+    async def _worker(self):
+        """Take jobs fairly and run each on the thread pool"""
+        while True:
+            with self._lock:
+                if self._closing:
+                    return
+                job = self._next_job()
+            if job is None:
+                await self._ready.wait()
+                self._ready.clear()
+                continue
+            # Another idle worker may be able to take the next job
+            self._ready.set()
+            await self._loop.run_in_executor(self._executor, self._run, job)
+            self._ready.set()
+
+    def _next_job(self) -> Optional[Job]:
+        """Pop the next job in round-robin user order; the caller holds the lock"""
+        for _ in range(len(self._rotation)):
+            user = self._rotation[0]
+            self._rotation.rotate(-1)
+            if self.per_user_limit is not None and self._running.get(user, 0) >= self.per_user_limit:
+                continue
+            job = self._queues[user].popleft()
+            if not self._queues[user]:
+                self._rotation.remove(user)
+            self._running[user] = self._running.get(user, 0) + 1
+            job.state = "running"
+            job.started_at = time.time()
+            return job
+        return None
+
+    def _run(self, job: Job):
+        """Analyze one job on a worker thread, recording progress as it streams in"""
+        analyzer = job.analyzer
+        start = time.perf_counter()
+        try:
+            results = analyzer.reuse_analysis(job.transcript, job.fused)
+            if results is None:
+                if job.fused:
+                    events = ((section, "result", result)
+                              for section, result in analyzer.analyze_fused(job.transcript).items())
+                else:
+                    events = analyzer.iter_analysis_events(job.transcript)
+                for section, event, value in events:
+                    with self._lock:
+                        if event == "result":
+                            job.sections[section] = value
+                            job.timings[section] = round(time.perf_counter() - start, 3)
+                        elif section == "summary":
+                            if event in ("strength", "improvement"):
+                                job.partial_summary.setdefault(event, []).append(value)
+                            else:
+                                job.partial_summary[event] = value
+                        elif section == "bias":
+                            job.partial_bias.append(value)
+                results = dict(job.sections)
+        except Exception as e:
+            with self._lock:
+                job.error = str(e)
+                self._finish(job, "failed")
+        else:
+            # Saved before the job is published as done, so pollers see the outcome;
+            # a failing callback is only reported
+            callback_error = None
+            if job.on_complete is not None:
+                with self._lock:
+                    timings = dict(job.timings)
+                try:
+                    job.on_complete(results, timings)
+                except Exception as e:
+                    logger.exception("on_complete failed for job %s", job.id)
+                    callback_error = str(e)
+            with self._lock:
+                job.results = results
+                job.callback_error = callback_error
+                self._finish(job, "done")
+        finally:
+            with self._lock:
+                self._running[job.user] -= 1
+                if not self._running[job.user]:
+                    del self._running[job.user]
+
+    def _finish(self, job: Job, state: str):
+        """Mark a job finished and forget the oldest finished jobs; the caller holds the lock"""
+        job.state = state
+        job.finished_at = time.time()
+        # The transcript is no longer needed once the job is done
+        job.transcript = None
+        self._finished += 1
+        finished = [job_id for job_id, kept in self._jobs.items() if kept.state in FINISHED_STATES]
+        for job_id in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[job_id]
+
+    def _position(self, job: Job) -> int:
+        """Jobs that round-robin dispatch will start before this queued one; the caller holds the lock"""
+        index = self._queues[job.user].index(job)
+        ahead = index
+        before_user = True
+        for user in self._rotation:
+            if user == job.user:
+                before_user = False
+                continue
+            # Users earlier in the rotation get one more turn before ours comes round
+            ahead += min(len(self._queues[user]), index + (1 if before_user else 0))
+        return ahead
@@ -0,0 +1,117 @@
+"""
+Incremental analysis of a live interview transcript
+A LiveSession is fed transcript text as it is spoken and re-analyzes only
+what is new: bias detection sees the new speaker turns plus a little
+preceding context, and the summary is refreshed from the previous
+summary and the new turns rather than the full text. Each update
+therefore costs about the same however long the interview runs.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from analyzer import InterviewAnalyzer, analysis_failed
+from chunking import merge_bias_items, split_turns
+
+class LiveSession:
+    """
+    Running analysis of one interview, built by InterviewAnalyzer.start_session()
+    append() may be called from a transcription thread while update() runs;
+    updates themselves are serialized.
+    """
+
+    def __init__(self, analyzer: InterviewAnalyzer, context_turns: int = 1):
+        self.analyzer = analyzer
+        self.context_turns = context_turns
+        # Speaker turns in order; text without a speaker label becomes its own
+        # turn, so turns already analyzed never change
+        self.turns: List[str] = []
+        self.analyzed_turns = 0
+        self.summarized_turns = 0
+        self.bias_items: List[Dict[str, Any]] = []
+        self.summary: Optional[Dict[str, Any]] = None
+        self.recommendations: List[str] = []
+
+        self._turns_lock = threading.Lock()
+        self._update_lock = threading.Lock()
+
+    @property
+    def transcript(self) -> str:
+        """The transcript so far"""
+        with self._turns_lock:
+            return "\n\n".join(self.turns)
+
+    def append(self, text: str) -> int:
+        """
+        Add newly transcribed text holding one or more speaker turns
+        Returns: the number of turns in the session
+        """
+        with self._turns_lock:
+            self.turns.extend(split_turns(text))
+            return len(self.turns)
+
+    def pending_turns(self) -> int:
+        """Turns appended since they were last analyzed for bias"""
+        with self._turns_lock:
+            return len(self.turns) - self.analyzed_turns
+
+    def update(self) -> Dict[str, Any]:
+        """
+        Analyze the turns appended since the last update
+        Bias detection and the summary refresh run concurrently. A section
+        whose model call fails keeps its previous result, and its turns are
+        retried on the next update.
+        Returns: Dictionary with summary, bias and recommendations keys for
+        the session so far
+        """
+        with self._update_lock:
+            with self._turns_lock:
+                turns = list(self.turns)
+            if len(turns) == self.analyzed_turns and len(turns) == self.summarized_turns:
+                return self.results()
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                summary_future = None
+                if len(turns) > self.summarized_turns:
+                    summary_future = pool.submit(
+                        self.analyzer.update_summary, self.summary, "\n\n".join(turns[self.summarized_turns:])
+                    )
+
+                if len(turns) > self.analyzed_turns:
+                    context = turns[max(0, self.analyzed_turns - self.context_turns):self.analyzed_turns]
+                    scanned = "\n\n".join(context + turns[self.analyzed_turns:])
+                    found = self.analyzer.detect_bias_chunked(scanned)
+                    if not analysis_failed({"bias": found}):
+                        # Checked against the scanned turns only, so each update stays the same cost
+                        found = self.analyzer.verify_bias(scanned, found, offsets=False)
+                        self.bias_items = merge_bias_items([self.bias_items, found.get('bias_items', [])])
+                        self.analyzed_turns = len(turns)
+                        # Memoized by bias profile, so this usually costs no model call
+                        self.recommendations = self.analyzer.generate_recommendations({"bias_items": self.bias_items})
+
+                if summary_future is not None:
+                    try:
+                        summary = summary_future.result()
+                    except Exception:
+                        # Already recorded by the analyzer's metrics; retried next update
+                        summary = None
+                    if summary is not None:
+                        self.summary = summary
+                        self.summarized_turns = len(turns)
+
+            self.analyzer.metrics.record_analysis("live", time.perf_counter() - start)
+            return self.results()
+
+    def results(self) -> Dict[str, Any]:
+        """
+        The latest analysis without calling the model
+        Returns: Dictionary with summary, bias and recommendations keys
+        """
+        return {
+            "summary": self.summary or {},
+            "bias": {"bias_items": list(self.bias_items)},
+            "recommendations": list(self.recommendations),
+        }
@@ -0,0 +1,291 @@
+"""
+In-process metrics for model calls made by InterviewAnalyzer
+Every call records its latency, prompt/response size, token usage (when
+the backend reports usage_metadata), estimated cost and error class; the
+analyzer also records parse outcomes, cache lookups and whole-analysis
+latency. The registry can be read as a dict snapshot or exported in the
+OpenMetrics text format for scraping.
+"""
+
+import math
+import threading
+from collections import defaultdict, deque
+from typing import Any, Dict, Optional, Tuple
+
+# Latency histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# USD per million (prompt, response) tokens; models not listed are not costed
+MODEL_PRICES = {
+    "gemini-2.5-flash-lite": (0.10, 0.40),
+    "gemini-2.5-flash": (0.30, 2.50),
+    "gemini-2.5-pro": (1.25, 10.00),
+    "fake": (0.0, 0.0),
+}
+
+def _quantile(samples, q: float) -> float:
+    """Nearest-rank quantile of a non-empty sequence"""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+def _labels(**labels) -> str:
+    """Render an OpenMetrics label set"""
+    parts = []
+    for name, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{name}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+class _Histogram:
+    """Cumulative-bucket histogram plus a window of recent samples for quantiles"""
+
+    def __init__(self, buckets: Tuple[float, ...], max_samples: int):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.samples = deque(maxlen=max_samples)
+
+    def observe(self, value: float):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+        self.samples.append(value)
+
+    def summary(self) -> Dict[str, float]:
+        if not self.samples:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean": self.sum / self.count,
+            "p50": _quantile(self.samples, 0.50),
+            "p95": _quantile(self.samples, 0.95),
+            "p99": _quantile(self.samples, 0.99),
+        }
+
+class MetricsRegistry:
+    """
+    Thread-safe store of model call, parse, cache and analysis metrics
+    Quantiles in snapshot() cover the most recent max_samples observations
+    per series; the exported histograms cover everything since reset().
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS, max_samples: int = 10000,
+                 prices: Optional[Dict[str, Tuple[float, float]]] = None):
+        self.buckets = buckets
+        self.max_samples = max_samples
+        self.prices = MODEL_PRICES if prices is None else prices
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Drop every recorded value"""
+        with self._lock:
+            self._calls = defaultdict(int)           # (kind, model, outcome)
+            self._errors = defaultdict(int)          # (kind, error class)
+            self._latency = {}                       # (kind, model) -> _Histogram
+            self._first_chunk = {}                   # (kind, model) -> _Histogram
+            self._chars = defaultdict(int)           # (kind, direction)
+            self._tokens = defaultdict(int)          # (kind, model, direction)
+            self._cost = defaultdict(float)          # model
+            self._parse = defaultdict(int)           # (kind, outcome)
+            self._cache = defaultdict(int)           # (kind, result)
+            self._analysis = {}                      # mode -> _Histogram
+            self._tier_latency = {}                  # (tier, section) -> _Histogram
+            self._tier_models = {}                   # tier -> model
+            self._escalations = defaultdict(int)     # (tier, reason)
+            self._phrases = defaultdict(int)         # outcome
+
+    def record_call(self, kind: str, model: str, latency: float, prompt_chars: int,
+                    response_chars: int = 0, usage: Any = None, error: Optional[BaseException] = None,
+                    first_chunk_latency: Optional[float] = None):
+        """
+        Record one model call
+        usage is the backend's usage_metadata object, if it returned one;
+        error is the exception the call raised, if it failed.
+        """
+        prompt_tokens = getattr(usage, "prompt_token_count", None) or 0
+        response_tokens = getattr(usage, "candidates_token_count", None) or 0
+
+        with self._lock:
+            self._calls[(kind, model, "error" if error else "ok")] += 1
+            if error is not None:
+                self._errors[(kind, type(error).__name__)] += 1
+            self._histogram(self._latency, (kind, model)).observe(latency)
+            if first_chunk_latency is not None:
+                self._histogram(self._first_chunk, (kind, model)).observe(first_chunk_latency)
+
+            self._chars[(kind, "prompt")] += prompt_chars
+            self._chars[(kind, "response")] += response_chars
+            self._tokens[(kind, model, "prompt")] += prompt_tokens
+            self._tokens[(kind, model, "response")] += response_tokens
+
+            if model in self.prices:
+                prompt_price, response_price = self.prices[model]
+                self._cost[model] += (prompt_tokens * prompt_price + response_tokens * response_price) / 1e6
+
+    def record_parse(self, kind: str, outcome: str):
+        """Record how a response was parsed: "ok", "repaired", "failed" or "fallback" """
+        with self._lock:
+            self._parse[(kind, outcome)] += 1
+
+    def record_cache(self, kind: str, hit: bool):
+        """Record one analyzer cache lookup"""
+        with self._lock:
+            self._cache[(kind, "hit" if hit else "miss")] += 1
+
+    def record_phrases(self, outcome: str, count: int = 1):
+        """Record quoted bias phrases checked against the transcript: "exact", "fuzzy" or "dropped" """
+        with self._lock:
+            self._phrases[outcome] += count
+
+    def record_analysis(self, mode: str, latency: float):
+        """Record one complete analysis of a transcript"""
+        with self._lock:
+            self._histogram(self._analysis, mode).observe(latency)
+
+    def record_tier(self, tier: str, model: str, section: str, latency: float,
+                    escalation: Optional[str] = None):
+        """
+        Record one analysis section run on a model tier
+        escalation is why the section was passed on to the next tier
+        ("bias_found", "low_confidence", "parse_failed" or "error"), if it was.
+        """
+        with self._lock:
+            self._tier_models[tier] = model
+            self._histogram(self._tier_latency, (tier, section)).observe(latency)
+            if escalation is not None:
+                self._escalations[(tier, escalation)] += 1
+
+    def tier_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-tier routing statistics
+        Cost is that of every call to the tier's model, so tiers should use
+        distinct models.
+        Returns: Dictionary by tier with model, runs, escalated (count by
+        reason), escalation_rate, latency (summary by section) and cost_usd
+        """
+        with self._lock:
+            stats = {}
+            for tier, model in self._tier_models.items():
+                latency = {section: h.summary() for (name, section), h in self._tier_latency.items() if name == tier}
+                escalated = {reason: count for (name, reason), count in self._escalations.items() if name == tier}
+                runs = sum(summary["count"] for summary in latency.values())
+                stats[tier] = {
+                    "model": model,
+                    "runs": runs,
+                    "escalated": escalated,
+                    "escalation_rate": sum(escalated.values()) / runs if runs else 0.0,
+                    "latency": latency,
+                    "cost_usd": self._cost.get(model, 0.0),
+                }
+            return stats
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return every metric as plain dicts
+        Returns: Dictionary with calls, errors, latency, first_chunk, chars,
+        tokens, cost_usd, parse, cache, phrases, analysis and tiers keys, plus
+        cost_per_analysis_usd
+        """
+        tiers = self.tier_stats()
+        with self._lock:
+            analyses = sum(histogram.count for histogram in self._analysis.values())
+            cost = sum(self._cost.values())
+            return {
+                "calls": {"/".join(key): count for key, count in self._calls.items()},
+                "errors": {"/".join(key): count for key, count in self._errors.items()},
+                "latency": {"/".join(key): h.summary() for key, h in self._latency.items()},
+                "first_chunk": {"/".join(key): h.summary() for key, h in self._first_chunk.items()},
+                "chars": {"/".join(key): count for key, count in self._chars.items()},
+                "tokens": {"/".join(key): count for key, count in self._tokens.items()},
+                "cost_usd": dict(self._cost),
+                "parse": {"/".join(key): count for key, count in self._parse.items()},
+                "cache": {"/".join(key): count for key, count in self._cache.items()},
+                "phrases": dict(self._phrases),
+                "analysis": {mode: h.summary() for mode, h in self._analysis.items()},
+                "tiers": tiers,
+                "cost_per_analysis_usd": cost / analyses if analyses else 0.0,
+            }
+
+    def to_openmetrics(self, prefix: str = "interview_analyzer") -> str:
+        """Render every metric in the OpenMetrics text exposition format"""
+        lines = []
+
+        def counter(name, help_text, series):
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            for labels, value in series:
+                lines.append(f"{prefix}_{name}_total{_labels(**labels)} {value}")
+
+        def histogram(name, help_text, series):
+            lines.append(f"# TYPE {prefix}_{name} histogram")
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            for labels, h in series:
+                for bound, count in zip(h.buckets, h.counts):
+                    lines.append(f"{prefix}_{name}_bucket{_labels(**labels, le=bound)} {count}")
+                lines.append(f"{prefix}_{name}_bucket{_labels(**labels, le='+Inf')} {h.count}")
+                lines.append(f"{prefix}_{name}_sum{_labels(**labels)} {h.sum}")
+                lines.append(f"{prefix}_{name}_count{_labels(**labels)} {h.count}")
+
+        with self._lock:
+            counter("model_calls", "Model calls by outcome.", [
+                (dict(kind=kind, model=model, outcome=outcome), count)
+                for (kind, model, outcome), count in sorted(self._calls.items())
+            ])
+            counter("model_errors", "Failed model calls by exception class.", [
+                (dict(kind=kind, error=error), count)
+                for (kind, error), count in sorted(self._errors.items())
+            ])
+            histogram("model_latency_seconds", "Model call latency.", [
+                (dict(kind=kind, model=model), h) for (kind, model), h in sorted(self._latency.items())
+            ])
+            histogram("model_first_chunk_seconds", "Time to the first streamed chunk.", [
+                (dict(kind=kind, model=model), h) for (kind, model), h in sorted(self._first_chunk.items())
+            ])
+            counter("model_chars", "Prompt and response characters.", [
+                (dict(kind=kind, direction=direction), count)
+                for (kind, direction), count in sorted(self._chars.items())
+            ])
+            counter("model_tokens", "Prompt and response tokens reported by the backend.", [
+                (dict(kind=kind, model=model, direction=direction), count)
+                for (kind, model, direction), count in sorted(self._tokens.items())
+            ])
+            counter("model_cost_usd", "Estimated model cost in US dollars.", [
+                (dict(model=model), cost) for model, cost in sorted(self._cost.items())
+            ])
+            counter("parse_results", "Response parse outcomes.", [
+                (dict(kind=kind, outcome=outcome), count)
+                for (kind, outcome), count in sorted(self._parse.items())
+            ])
+            counter("cache_lookups", "Analyzer cache lookups.", [
+                (dict(kind=kind, result=result), count)
+                for (kind, result), count in sorted(self._cache.items())
+            ])
+            counter("phrase_verifications", "Quoted bias phrases checked against the transcript, by outcome.", [
+                (dict(outcome=outcome), count) for outcome, count in sorted(self._phrases.items())
+            ])
+            histogram("analysis_seconds", "End-to-end analysis latency.", [
+                (dict(mode=mode), h) for mode, h in sorted(self._analysis.items())
+            ])
+            histogram("tier_seconds", "Analysis section latency per model tier.", [
+                (dict(tier=tier, section=section), h) for (tier, section), h in sorted(self._tier_latency.items())
+            ])
+            counter("tier_escalations", "Sections passed on to the next model tier, by reason.", [
+                (dict(tier=tier, reason=reason), count) for (tier, reason), count in sorted(self._escalations.items())
+            ])
+
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def _histogram(self, store: Dict, key) -> _Histogram:
+        """Get or create the histogram for key; the caller holds the lock"""
+        histogram = store.get(key)
+        if histogram is None:
+            histogram = store[key] = _Histogram(self.buckets, self.max_samples)
+        return histogram
+
+# Shared by every analyzer that is not given its own registry
+REGISTRY = MetricsRegistry()
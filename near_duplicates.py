@@ -0,0 +1,296 @@
+"""
+Near-duplicate transcript index for reusing prior analyses
+Transcripts are normalized (case, punctuation, whitespace and timestamps
+from recording tools removed), split into overlapping word shingles and
+summarized as MinHash signatures. Locality-sensitive hashing over bands
+of each signature finds candidates without comparing against every
+stored transcript; candidates are then scored by estimated Jaccard
+similarity. Each entry also keeps hashes of its speaker turns, so an
+edited re-export can be diffed turn by turn.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from chunking import split_turns
+from store import transcript_hash
+
+# Clock times and media offsets, optionally bracketed: 12:03, [00:01:23.456],
+# 00:01:23,456 --> 00:01:25,000, (3:15 pm)
+_TIMESTAMP = re.compile(
+    r"[\[(]?\b\d{1,2}:\d{2}(?::\d{2})?(?:[.,]\d{1,3})?(?:\s*[ap]\.?m\b\.?)?[\])]?(?:\s*-->\s*)?",
+    re.IGNORECASE
+)
+_NON_WORD = re.compile(r"[^\w\s]+")
+# Subtitle cue numbers left on their own line
+_CUE_NUMBER = re.compile(r"^[ \t]*\d+[ \t]*$", re.MULTILINE)
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+def strip_timestamps(text: str) -> str:
+    """Remove timestamps and subtitle cue numbers, leaving speaker labels at the start of their lines"""
+    text = _CUE_NUMBER.sub("", _TIMESTAMP.sub("", text))
+    return "\n".join(line.strip() for line in text.split("\n"))
+
+def matching_text(text: str) -> str:
+    """Normalize text for similarity: drop timestamps, cue numbers, case and punctuation"""
+    return " ".join(_NON_WORD.sub(" ", strip_timestamps(text).lower()).split())
+
+def _turns(transcript: str) -> List[str]:
+    """Speaker turns, found after timestamps are removed"""
+    return split_turns(strip_timestamps(transcript))
+
+def shingles(text: str, size: int = 5) -> Set[int]:
+    """Hashes of every run of size consecutive words in the normalized text"""
+    words = matching_text(text).split()
+    if len(words) < size:
+        return {zlib.crc32(" ".join(words).encode("utf-8"))} if words else set()
+    return {
+        zlib.crc32(" ".join(words[index:index + size]).encode("utf-8"))
+        for index in range(len(words) - size + 1)
+    }
+
+def turn_hashes(transcript: str) -> List[int]:
+    """Hash of each normalized speaker turn, in order"""
+    return [zlib.crc32(matching_text(turn).encode("utf-8")) for turn in _turns(transcript)]
+
+def changed_turns(transcript: str, previous_hashes: Iterable[int], context: int = 1) -> List[str]:
+    """
+    Speaker turns of transcript that do not appear in a previous version
+    Each changed turn is preceded by up to context earlier turns, so an
+    edited answer is read with the question it answers.
+    Returns: the turns to re-analyze, in transcript order; empty when
+    the only edits were deletions
+    """
+    previous = set(previous_hashes)
+    turns = _turns(transcript)
+    keep = set()
+    for index, turn in enumerate(turns):
+        if zlib.crc32(matching_text(turn).encode("utf-8")) not in previous:
+            keep.update(range(max(0, index - context), index + 1))
+    return [turns[index] for index in sorted(keep)]
+
+def phrase_present(phrase: str, transcript: str) -> bool:
+    """Whether a quoted phrase still occurs in the transcript, ignoring case, punctuation and timestamps"""
+    phrase = matching_text(phrase)
+    return bool(phrase) and phrase in matching_text(transcript)
+
+def _integrate(func, start: float, end: float, steps: int = 50) -> float:
+    """Midpoint rule integral of func over [start, end]"""
+    width = (end - start) / steps
+    return sum(func(start + (step + 0.5) * width) for step in range(steps)) * width
+
+@lru_cache(maxsize=None)
+def lsh_params(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """
+    Choose LSH bands and rows per band for a similarity threshold
+    Minimizes the combined probability mass of false positives below the
+    threshold and false negatives above it.
+    Returns: (bands, rows)
+    """
+    best = None
+    for bands in range(1, num_perm + 1):
+        for rows in range(1, num_perm // bands + 1):
+            false_positive = _integrate(lambda s: 1 - (1 - s ** rows) ** bands, 0.0, threshold)
+            false_negative = _integrate(lambda s: (1 - s ** rows) ** bands, threshold, 1.0)
+            error = false_positive + false_negative
+            if best is None or error < best[0]:
+                best = (error, bands, rows)
+    return best[1], best[2]
+
+class MinHasher:
+    """
+    MinHash signatures from num_perm hash functions h(x) = (a * x + b) mod p
+    The coefficients come from a seeded hash rather than a random number
+    generator, so signatures stay comparable across processes and versions.
+    """
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        self.num_perm = num_perm
+        coefficients = [
+            int.from_bytes(hashlib.blake2b(f"{seed}:{index}".encode(), digest_size=8).digest(), "big")
+            for index in range(num_perm)
+        ]
+        # a and x below 2**32 keep a * x + b inside uint64
+        self._a = np.array([(value & _MAX_HASH) | 1 for value in coefficients], dtype=np.uint64)
+        self._b = np.array([value >> 32 for value in coefficients], dtype=np.uint64)
+
+    def signature(self, values: Set[int], block: int = 4096) -> np.ndarray:
+        """Minimum of each hash function over the shingle hashes, as uint32"""
+        signature = np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        values = np.fromiter(values, dtype=np.uint64, count=len(values))
+        for start in range(0, len(values), block):
+            # Blocks bound the (shingles x num_perm) intermediate for long transcripts
+            hashed = (values[start:start + block, None] * self._a + self._b) % _MERSENNE_PRIME & _MAX_HASH
+            np.minimum(signature, hashed.min(axis=0), out=signature)
+        return signature.astype(np.uint32)
+
+def similarity(first: np.ndarray, second: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return float(np.count_nonzero(first == second)) / len(first)
+
+class NearDuplicateIndex:
+    """
+    SQLite-backed MinHash LSH index of analyzed transcripts
+    query() returns the most similar stored transcript at or above
+    threshold, with its analysis results. Entries are partitioned by a
+    scope string, so results from another prompt version, model or bias
+    mode are never matched. Safe to share between threads.
+    """
+
+    def __init__(self, path: str = ":memory:", threshold: float = 0.8, num_perm: int = 128,
+                 shingle_size: int = 5, seed: int = 1):
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        self.path = path
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.hasher = MinHasher(num_perm, seed)
+        self.bands, self.rows = lsh_params(threshold, num_perm)
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS documents (
+                id INTEGER PRIMARY KEY,
+                scope TEXT NOT NULL,
+                transcript_hash TEXT NOT NULL,
+                signature BLOB NOT NULL,
+                turn_hashes TEXT NOT NULL,
+                results TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                UNIQUE (scope, transcript_hash)
+            );
+            CREATE TABLE IF NOT EXISTS buckets (
+                band INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                document_id INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_buckets ON buckets (band, bucket);
+            CREATE INDEX IF NOT EXISTS idx_buckets_document ON buckets (document_id);
+            CREATE TABLE IF NOT EXISTS settings (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+        """)
+        self._check_settings(seed)
+
+    def query(self, transcript: str, scope: str = "") -> Optional[Dict[str, Any]]:
+        """
+        Find the stored transcript most similar to this one
+        Returns: Dictionary with transcript_hash, similarity, results and
+        turn_hashes, or None when nothing reaches the threshold
+        """
+        signature = self.signature(transcript)
+        keys = self._bucket_keys(signature)
+        clause = " OR ".join("(b.band = ? AND b.bucket = ?)" for _ in keys)
+        params = [value for key in keys for value in key]
+        with self._lock:
+            rows = self._db.execute(
+                # CROSS JOIN keeps the bucket lookups first; otherwise SQLite may scan the whole scope
+                "SELECT DISTINCT d.id, d.transcript_hash, d.signature FROM buckets b "
+                f"CROSS JOIN documents d ON d.id = b.document_id WHERE ({clause}) AND d.scope = ?",
+                params + [scope]
+            ).fetchall()
+
+        best = None
+        for document_id, matched_hash, stored in rows:
+            score = similarity(signature, np.frombuffer(stored, dtype=np.uint32))
+            if score >= self.threshold and (best is None or score > best[0]):
+                best = (score, document_id, matched_hash)
+        if best is None:
+            return None
+
+        with self._lock:
+            turns, results = self._db.execute(
+                "SELECT turn_hashes, results FROM documents WHERE id = ?", (best[1],)
+            ).fetchone()
+        return {
+            "transcript_hash": best[2],
+            "similarity": round(best[0], 3),
+            "results": json.loads(results),
+            "turn_hashes": json.loads(turns),
+        }
+
+    def add(self, transcript: str, results: Dict[str, Any], scope: str = "") -> int:
+        """
+        Index a transcript with its analysis, replacing any entry for the same text and scope
+        Returns: the entry id
+        """
+        signature = self.signature(transcript)
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM buckets WHERE document_id IN "
+                "(SELECT id FROM documents WHERE scope = ? AND transcript_hash = ?)",
+                (scope, transcript_hash(transcript))
+            )
+            cursor = self._db.execute(
+                "INSERT OR REPLACE INTO documents (scope, transcript_hash, signature, turn_hashes, results, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (scope, transcript_hash(transcript), signature.tobytes(), json.dumps(turn_hashes(transcript)),
+                 json.dumps(results), time.time())
+            )
+            document_id = cursor.lastrowid
+            self._db.executemany(
+                "INSERT INTO buckets (band, bucket, document_id) VALUES (?, ?, ?)",
+                [(band, bucket, document_id) for band, bucket in self._bucket_keys(signature)]
+            )
+            self._db.commit()
+        return document_id
+
+    def signature(self, transcript: str) -> np.ndarray:
+        """MinHash signature of a transcript's shingles"""
+        return self.hasher.signature(shingles(transcript, self.shingle_size))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def _bucket_keys(self, signature: np.ndarray) -> List[Tuple[int, int]]:
+        """(band, bucket) pairs: each band of rows signature values hashed to a signed 64-bit integer"""
+        return [
+            (band, int.from_bytes(
+                hashlib.blake2b(signature[band * self.rows:(band + 1) * self.rows].tobytes(), digest_size=8).digest(),
+                "big", signed=True
+            ))
+            for band in range(self.bands)
+        ]
+
+    def _check_settings(self, seed: int):
+        """Refuse an index built with other hash functions; re-band one built for another threshold"""
+        settings = {
+            "num_perm": str(self.hasher.num_perm), "seed": str(seed), "shingle_size": str(self.shingle_size),
+        }
+        stored = dict(self._db.execute("SELECT name, value FROM settings").fetchall())
+        for name, value in settings.items():
+            if name in stored and stored[name] != value:
+                raise ValueError(
+                    f"Near-duplicate index at {self.path} was built with {name}={stored[name]}, not {value}"
+                )
+
+        banding = f"{self.bands}x{self.rows}"
+        with self._lock:
+            if stored.get("banding", banding) != banding:
+                self._db.execute("DELETE FROM buckets")
+                rows = self._db.execute("SELECT id, signature FROM documents").fetchall()
+                self._db.executemany(
+                    "INSERT INTO buckets (band, bucket, document_id) VALUES (?, ?, ?)",
+                    [(band, bucket, document_id) for document_id, stored_signature in rows
+                     for band, bucket in self._bucket_keys(np.frombuffer(stored_signature, dtype=np.uint32))]
+                )
+            self._db.executemany(
+                "INSERT OR REPLACE INTO settings (name, value) VALUES (?, ?)",
+                list(settings.items()) + [("banding", banding)]
+            )
+            self._db.commit()
@@ -0,0 +1,265 @@
+"""
+JSON parsing helpers for model responses
+"""
+
+import json
+import re
+from typing import Any, List, Optional, Tuple
+
+_WHITESPACE = " \t\r\n"
+
+class IncrementalJSONParser:
+    """
+    Incremental parser for a JSON document arriving in chunks
+    Each call to feed() scans only the new characters and returns
+    (path, value) events for every value that closed in them, where path
+    is a tuple of object keys and array indices. Only values at most
+    emit_depth levels deep are decoded and emitted, plus the root document.
+    Text before the first '{' or '[' (prose, code fences) is skipped.
+    """
+
+    def __init__(self, emit_depth: int = 2):
+        self.emit_depth = emit_depth
+        self.result = None
+        self.done = False
+
+        self._text = ""
+        self._pos = 0
+        self._started = False
+        # Frames: [container char, value start, current key or index, expecting key]
+        self._stack = []
+        self._string_start = None
+        self._escape = False
+        self._scalar_start = None
+
+    def feed(self, chunk: str) -> List[Tuple[Tuple, Any]]:
+        """Consume the next chunk of text and return newly completed values"""
+        events = []
+        self._text += chunk
+        text = self._text
+
+        i = self._pos
+        end = len(text)
+        while i < end and not self.done:
+            c = text[i]
+
+            if self._string_start is not None:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._close_string(i, events)
+                i += 1
+                continue
+
+            if self._scalar_start is not None:
+                if c not in ",}]" and c not in _WHITESPACE:
+                    i += 1
+                    continue
+                self._close_value(self._scalar_start, i, events)
+                self._scalar_start = None
+
+            if not self._started:
+                if c in "{[":
+                    self._started = True
+                    self._stack.append([c, i, None if c == "{" else 0, c == "{"])
+                i += 1
+                continue
+
+            if c in _WHITESPACE or c == ":":
+                pass
+            elif c == '"':
+                self._string_start = i
+            elif c in "{[":
+                self._stack.append([c, i, None if c == "{" else 0, c == "{"])
+            elif c in "}]":
+                frame = self._stack.pop()
+                self._close_value(frame[1], i + 1, events)
+            elif c == ",":
+                frame = self._stack[-1]
+                if frame[0] == "{":
+                    frame[3] = True
+                else:
+                    frame[2] += 1
+            else:
+                self._scalar_start = i
+            i += 1
+
+        self._pos = i
+        return events
+
+    def _path(self) -> Tuple:
+        """Path of the value currently being parsed"""
+        return tuple(frame[2] for frame in self._stack)
+
+    def _close_string(self, i: int, events: List):
+        """Finish a string token, which is either an object key or a value"""
+        start = self._string_start
+        self._string_start = None
+        frame = self._stack[-1]
+        if frame[0] == "{" and frame[3]:
+            frame[2] = json.loads(self._text[start:i + 1])
+            frame[3] = False
+        else:
+            self._close_value(start, i + 1, events)
+
+    def _close_value(self, start: int, end: int, events: List):
+        """Decode and emit a completed value if it is shallow enough"""
+        if not self._stack:
+            self.result = json.loads(self._text[start:end])
+            self.done = True
+            events.append(((), self.result))
+            return
+
+        path = self._path()
+        if len(path) <= self.emit_depth:
+            events.append((path, json.loads(self._text[start:end])))
+
+_CLOSERS = {"{": "}", "[": "]"}
+_DECODER = json.JSONDecoder()
+# Openers decoded directly before falling back to the balanced scan
+_DIRECT_ATTEMPTS = 4
+
+# Outside any bracket only openers matter; prose quotes are ignored
+_OPENER = re.compile(r"[{\[]")
+# Inside brackets: a whole JSON string, a bracket, or an unterminated quote
+_TOKEN = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\]]|"')
+
+def _balanced_candidates(text: str, start: int, end: int):
+    """
+    Yield (start, end) spans of balanced {...} / [...] runs in one pass
+    Top-level spans come out in order. Brackets inside JSON strings are
+    ignored, and a stray opening brace in prose that never closes does not
+    hide the complete values nested inside it: those are yielded at the
+    end. Tokens are located with compiled regexes, so ordinary text and
+    string contents are skipped at C speed.
+    """
+    stack = []          # [opener, position, closed child spans]
+    i = start
+
+    while i < end:
+        if not stack:
+            match = _OPENER.search(text, i, end)
+            if match is None:
+                break
+            stack.append([match.group(), match.start(), []])
+            i = match.end()
+            continue
+
+        match = _TOKEN.search(text, i, end)
+        if match is None:
+            break
+        token = match.group()
+        i = match.end()
+
+        if token in "{[":
+            stack.append([token, match.start(), []])
+        elif token in "}]":
+            if _CLOSERS[stack[-1][0]] == token:
+                _, position, _ = stack.pop()
+                if stack:
+                    stack[-1][2].append((position, i))
+                else:
+                    yield position, i
+            else:
+                # Mismatched bracket: whatever was open is not JSON
+                stack = []
+        elif token == '"':
+            # Unterminated string: nothing after this point can close
+            break
+
+    # Unclosed braces: fall back to the complete values directly inside them
+    for _, _, children in stack:
+        yield from children
+
+def extract_json(text: str, opener: str = "{") -> Optional[Any]:
+    """
+    Extract the first JSON value of the given kind ("{" or "[") from a model response
+    A ```json fenced block is tried first, then the whole text. In each region
+    the first few openers are decoded directly (the common case of JSON with
+    some prose around it); failing that, a single balanced-bracket pass finds
+    every candidate span. Both steps are linear in the response length, and
+    braces in surrounding prose do not affect the result.
+    """
+    expected = dict if opener == "{" else list
+    regions = []
+
+    fence = text.find("```json")
+    if fence != -1:
+        body_start = fence + len("```json")
+        body_end = text.find("```", body_start)
+        regions.append((body_start, body_end if body_end != -1 else len(text)))
+    regions.append((0, len(text)))
+
+    for start, end in regions:
+        position = text.find(opener, start, end)
+        for _ in range(_DIRECT_ATTEMPTS):
+            if position == -1:
+                break
+            try:
+                value, stop = _DECODER.raw_decode(text, position)
+            except ValueError:
+                position = text.find(opener, position + 1, end)
+                continue
+            if isinstance(value, expected) and stop <= end:
+                return value
+            position = text.find(opener, stop, end)
+
+        for span_start, span_end in _balanced_candidates(text, start, end):
+            if text[span_start] != opener:
+                continue
+            try:
+                value = json.loads(text[span_start:span_end])
+            except ValueError:
+                continue
+            if isinstance(value, expected):
+                return value
+    return None
+
+SEVERITIES = ("Low", "Medium", "High")
+
+def _string_list_errors(value: Any, field: str) -> List[str]:
+    """Errors for a field that must be a list of strings"""
+    if not isinstance(value, list):
+        return [f"'{field}' must be an array of strings"]
+    if not all(isinstance(item, str) for item in value):
+        return [f"every entry of '{field}' must be a string"]
+    return []
+
+def validate_summary(data: Any) -> List[str]:
+    """Return schema errors for a structured summary (empty when valid)"""
+    if not isinstance(data, dict):
+        return ["summary must be a JSON object"]
+    errors = []
+    for field in ("executive_summary", "recommendation"):
+        if not isinstance(data.get(field), str) or not data[field].strip():
+            errors.append(f"'{field}' must be a non-empty string")
+    for field in ("strengths", "improvements"):
+        errors.extend(_string_list_errors(data.get(field), field))
+    return errors
+
+def validate_bias(data: Any) -> List[str]:
+    """Return schema errors for a bias detection result (empty when valid)"""
+    if not isinstance(data, dict) or not isinstance(data.get("bias_items"), list):
+        return ["result must be an object with a 'bias_items' array"]
+    errors = []
+    for index, item in enumerate(data["bias_items"]):
+        if not isinstance(item, dict):
+            errors.append(f"bias_items[{index}] must be an object")
+            continue
+        for field in ("Bias_Type", "Example_Phrase"):
+            if not isinstance(item.get(field), str) or not item[field].strip():
+                errors.append(f"bias_items[{index}].{field} must be a non-empty string")
+        if str(item.get("Severity", "")).capitalize() not in SEVERITIES:
+            errors.append(f"bias_items[{index}].Severity must be one of Low/Medium/High")
+    confidence = data.get("confidence", 0.0)
+    if isinstance(confidence, bool) or not isinstance(confidence, (int, float)) or not 0 <= confidence <= 1:
+        errors.append("confidence must be a number from 0 to 1")
+    return errors
+
+def validate_recommendations(data: Any) -> List[str]:
+    """Return schema errors for a recommendations list (empty when valid)"""
+    if isinstance(data, list) and not data:
+        return ["recommendations must not be empty"]
+    return _string_list_errors(data, "recommendations")
@@ -0,0 +1,202 @@
+"""
+Local rule-based bias pre-screen
+A curated phrase lexicon for each bias category in the detect_bias prompt,
+compiled into one trie-shaped regular expression. A single left-to-right
+pass over the transcript finds every lexicon hit. A second list of cue
+words, which only suggest bias in context, decides whether a transcript
+without hits still needs the model, so clean transcripts can skip the
+model call entirely.
+"""
+
+import re
+from typing import Dict, Iterable, List, Tuple
+
+# (phrase, severity) per bias category; matching is case-insensitive and
+# tolerant of whitespace differences between words. Only phrases that are
+# out of place in an interview whatever surrounds them belong here, since
+# "fast" mode reports every hit without asking the model.
+BIAS_LEXICON = {
+    "Gender/Sex": [
+        ("for a woman", "High"),
+        ("for a girl", "High"),
+        ("like a girl", "High"),
+        ("you women", "High"),
+        ("man's job", "High"),
+        ("job for a man", "High"),
+    ],
+    "Age": [
+        ("how old are you", "High"),
+        ("at your age", "High"),
+        ("what year were you born", "High"),
+        ("when did you graduate from high school", "High"),
+        ("close to retirement", "High"),
+        ("young person's game", "High"),
+    ],
+    "Race/Ethnicity": [
+        ("where are you originally from", "High"),
+        ("where are you really from", "High"),
+        ("what is your ethnicity", "High"),
+        ("what race are you", "High"),
+        ("your people", "High"),
+        ("so articulate", "Medium"),
+        ("english is very good", "Medium"),
+    ],
+    "Religion": [
+        ("your religion", "High"),
+        ("do you go to church", "High"),
+        ("do you pray", "High"),
+        ("do you wear a hijab", "High"),
+        ("are you christian", "High"),
+        ("are you muslim", "High"),
+        ("are you jewish", "High"),
+    ],
+    "Sexual Orientation": [
+        ("your sexual orientation", "High"),
+        ("are you gay", "High"),
+        ("are you straight", "High"),
+        ("lifestyle choice", "High"),
+        ("boyfriend or girlfriend", "Medium"),
+    ],
+    "Disability": [
+        ("are you disabled", "High"),
+        ("your disability", "High"),
+        ("handicapped", "High"),
+        ("any medical conditions", "High"),
+        ("any health problems", "High"),
+        ("history of mental illness", "High"),
+    ],
+    "Socioeconomic Status": [
+        ("what do your parents do", "Medium"),
+        ("do you own your home", "Medium"),
+        ("your credit score", "Medium"),
+    ],
+    "Appearance": [
+        ("your appearance", "Medium"),
+        ("your weight", "High"),
+        ("your hair", "Medium"),
+    ],
+    "Personal Life": [
+        ("are you married", "High"),
+        ("do you have kids", "High"),
+        ("do you have children", "High"),
+        ("plan to have kids", "High"),
+        ("plan to have children", "High"),
+        ("planning to have kids", "High"),
+        ("planning to have children", "High"),
+        ("planning to start a family", "High"),
+        ("getting pregnant", "High"),
+        ("are you pregnant", "High"),
+        ("biological clock", "High"),
+        ("family planning", "High"),
+        ("your husband", "High"),
+        ("your wife", "High"),
+    ],
+}
+
+# Words that may signal bias depending on context (education, appearance,
+# culture fit and the like). They are never reported on their own; in
+# "triage" mode a transcript containing one is still sent to the model.
+BIAS_CUES = [
+    "age", "older", "young", "younger", "retire", "retirement", "millennials",
+    "girl", "girls", "guys", "woman", "women", "female", "male", "maternity", "paternity",
+    "accent", "originally", "ethnicity", "race", "racist", "culture fit", "relate to",
+    "religion", "religious", "church", "mosque", "synagogue", "temple",
+    "gay", "boyfriend", "girlfriend",
+    "disability", "disabled", "wheelchair", "medical",
+    "schools", "college", "university", "pedigree", "caliber",
+    "neighborhood", "afford", "parents",
+    "attractive", "appearance",
+    "married", "unmarried", "kids", "children", "family", "families", "pregnant", "childcare",
+]
+
+def _normalize(phrase: str) -> str:
+    """Lowercase and collapse whitespace so matches map back to lexicon entries"""
+    return " ".join(phrase.lower().split())
+
+def _trie_pattern(phrases: Iterable[str]) -> str:
+    """
+    Build a regex alternation factored as a trie over the given phrases
+    Shared prefixes are matched once, so the engine tries a handful of
+    branches per position instead of every phrase.
+    """
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node):
+        if list(node) == [""]:
+            return ""
+        optional = "" in node
+        branches = []
+        for char in sorted(c for c in node if c):
+            atom = r"\s+" if char == " " else re.escape(char)
+            branches.append(atom + render(node[char]))
+        body = branches[0] if len(branches) == 1 and not optional else "(?:" + "|".join(branches) + ")"
+        return body + "?" if optional else body
+
+    return render(trie)
+
+class BiasPrescreen:
+    """
+    Compiled multi-phrase matcher over a bias lexicon and cue words
+    scan() returns bias_items in the same shape detect_bias produces;
+    has_cues() says whether any cue word occurs.
+    """
+
+    def __init__(self, lexicon: Dict[str, List[Tuple[str, str]]] = None, cues: Iterable[str] = None):
+        lexicon = BIAS_LEXICON if lexicon is None else lexicon
+        cues = BIAS_CUES if cues is None else cues
+        self._entries = {}
+        for bias_type, phrases in lexicon.items():
+            for phrase, severity in phrases:
+                self._entries[_normalize(phrase)] = (bias_type, severity)
+
+        # Longest-first tie breaking comes from the trie: longer continuations are greedy
+        self._pattern = re.compile(
+            r"(?<!\w)" + _trie_pattern(sorted(self._entries)) + r"(?!\w)",
+            re.IGNORECASE
+        )
+        cues = sorted({_normalize(cue) for cue in cues})
+        self._cue_pattern = re.compile(r"(?<!\w)" + _trie_pattern(cues) + r"(?!\w)", re.IGNORECASE) if cues else None
+
+    def has_cues(self, transcript: str) -> bool:
+        """Whether the transcript contains any cue word"""
+        return self._cue_pattern is not None and self._cue_pattern.search(transcript) is not None
+
+    def scan(self, transcript: str) -> List[Dict[str, str]]:
+        """Return one bias item per distinct lexicon phrase found in the transcript"""
+        items = []
+        seen = set()
+        for match in self._pattern.finditer(transcript):
+            key = _normalize(match.group())
+            if key in seen or key not in self._entries:
+                continue
+            seen.add(key)
+            bias_type, severity = self._entries[key]
+            items.append({
+                "Bias_Type": bias_type,
+                "Example_Phrase": match.group(),
+                "Severity": severity,
+                "Source": "prescreen",
+            })
+        return items
+
+_default_prescreen = None
+
+def _default() -> BiasPrescreen:
+    """The default lexicon and cues, compiled on first use"""
+    global _default_prescreen
+    if _default_prescreen is None:
+        _default_prescreen = BiasPrescreen()
+    return _default_prescreen
+
+def prescreen(transcript: str) -> List[Dict[str, str]]:
+    """Scan a transcript with the default lexicon"""
+    return _default().scan(transcript)
+
+def has_bias_cues(transcript: str) -> bool:
+    """Whether a transcript contains any default cue word, so only the model can rule bias out"""
+    return _default().has_cues(transcript)
@@ -0,0 +1,142 @@
+"""
+Canonical bias profiles for memoizing recommendations
+Recommendations depend only on which kinds of bias were found and how
+severe they were, not on the exact phrases quoted. bias_profile() reduces
+bias_items to sorted (category, severity) pairs so analyses with the same
+profile share one set of recommendations. A precomputed table of profiles
+can be loaded to pre-warm the analyzer.
+
+Usage:
+    python recommendations.py --output table.json --from-results results.jsonl --top 50
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+# Categories from the bias detection prompt, with patterns matching the
+# labels the model uses for them. Order matters: earlier categories win.
+BIAS_CATEGORIES = [
+    ("Sexual Orientation", r"orientation|sexuality|lgbt|\bgay\b|lesbian"),
+    ("Gender/Sex", r"gender|\bsex\b|sexism|female|\bmale\b|women|pregnan|maternity"),
+    ("Personal Life", r"personal|family|marital|marri|parent|child|\bkids?\b"),
+    ("Age", r"\bage\b|ageism|age-related|\bold\b|young|generation"),
+    ("Race/Ethnicity", r"\brac(e|ial|ism)|ethnic|national|origin|accent|immigra|cultur"),
+    ("Religion", r"religio|faith|church|worship"),
+    ("Disability", r"disab|handicap|health|medical|neurodiver"),
+    ("Education Background", r"educat|school|degree|pedigree|college|universit|academic"),
+    ("Socioeconomic Status", r"socio|economic|class|income|wealth|poverty"),
+    ("Appearance", r"appearance|look|weight|attractive|dress|height"),
+]
+
+SEVERITY_ORDER = ["Unknown", "Low", "Medium", "High"]
+
+_CATEGORY_PATTERNS = [(name, re.compile(pattern, re.IGNORECASE)) for name, pattern in BIAS_CATEGORIES]
+
+def canonical_bias_type(bias_type: str) -> str:
+    """Map a model-supplied Bias_Type label onto one of BIAS_CATEGORIES, or "Other" """
+    for name, pattern in _CATEGORY_PATTERNS:
+        if pattern.search(bias_type or ""):
+            return name
+    return "Other"
+
+def canonical_severity(severity: str) -> str:
+    """Normalize a Severity label to Low/Medium/High, or Unknown"""
+    severity = (severity or "").strip().title()
+    return severity if severity in SEVERITY_ORDER else "Unknown"
+
+def bias_profile(bias_items: Iterable[Dict]) -> List[Tuple[str, str]]:
+    """
+    Reduce bias_items to their canonical profile
+    Returns: sorted (category, severity) pairs, one per category at the
+    highest severity seen for it
+    """
+    highest = {}
+    for item in bias_items:
+        category = canonical_bias_type(item.get('Bias_Type', ''))
+        severity = canonical_severity(item.get('Severity', ''))
+        if SEVERITY_ORDER.index(severity) >= SEVERITY_ORDER.index(highest.get(category, "Unknown")):
+            highest[category] = severity
+    return sorted(highest.items())
+
+def profile_key(profile: List[Tuple[str, str]]) -> str:
+    """Stable string key for a profile"""
+    return json.dumps([list(pair) for pair in profile])
+
+def load_recommendation_table(path: str) -> Dict[str, List[str]]:
+    """
+    Load a precomputed table written by this module's command line
+    Returns: Dictionary mapping profile_key() strings to recommendation lists
+    """
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)
+    return {
+        profile_key([tuple(pair) for pair in entry["profile"]]): entry["recommendations"]
+        for entry in entries
+    }
+
+def common_profiles(results_path: str, top: int) -> List[List[Tuple[str, str]]]:
+    """The most frequent non-empty profiles in a batch.py results file"""
+    counts = Counter()
+    with open(results_path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            profile = bias_profile(record.get("bias", {}).get("bias_items", []))
+            if profile:
+                counts[profile_key(profile)] += 1
+    return [[tuple(pair) for pair in json.loads(key)] for key, _ in counts.most_common(top)]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute recommendations for common bias profiles")
+    parser.add_argument("--output", "-o", required=True, help="JSON table to write")
+    parser.add_argument("--from-results", help="batch.py results JSONL to mine for common profiles")
+    parser.add_argument("--top", type=int, default=50, help="Number of most common profiles to include")
+    parser.add_argument("--backend", choices=["gemini", "fake"], default="gemini",
+                        help="Model backend; 'fake' runs offline")
+    args = parser.parse_args(argv)
+
+    from analyzer import InterviewAnalyzer
+    from backends import FakeBackend
+
+    analyzer = InterviewAnalyzer()
+    if args.backend == "fake":
+        analyzer.set_backend(FakeBackend())
+    else:
+        from dotenv import load_dotenv
+        load_dotenv()
+        api_key = os.getenv('GEMINI_API_KEY')
+        if not api_key:
+            print("GEMINI_API_KEY not found in environment or .env file", file=sys.stderr)
+            return 1
+        analyzer.set_api_key(api_key)
+
+    # Every category on its own at every severity, plus the most common real profiles
+    profiles = [[(category, severity)] for category, _ in BIAS_CATEGORIES for severity in SEVERITY_ORDER[1:]]
+    if args.from_results:
+        profiles += [profile for profile in common_profiles(args.from_results, args.top) if profile not in profiles]
+
+    table = []
+    for profile in profiles:
+        recommendations = analyzer.recommend_for_profile(profile)
+        if recommendations is None:
+            print(f"Skipping {profile_key(profile)}: no valid response", file=sys.stderr)
+            continue
+        table.append({"profile": [list(pair) for pair in profile], "recommendations": recommendations})
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(table, f, indent=2)
+    print(f"Wrote {len(table)} profiles to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,400 @@
+"""
+Request schedulers in front of the model backends
+Quotas apply per API key and model, so each key's backend for a model
+gets a RequestScheduler of its own, shared by every analyzer in the
+process. A scheduler paces calls with token buckets for requests and
+tokens per minute, retries rate-limit and transient errors with jittered
+exponential backoff, stops calling an unhealthy API with a circuit
+breaker, and coalesces identical in-flight requests, streamed or not,
+so concurrent analyses of the same transcript make one upstream call.
+"""
+
+import hashlib
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from backends import ModelBackend
+
+# google.api_core exception classes worth retrying (429, 500, 503, 504)
+RETRYABLE_ERRORS = {
+    "ResourceExhausted", "TooManyRequests", "InternalServerError",
+    "ServiceUnavailable", "DeadlineExceeded", "TimeoutError", "ConnectionError",
+}
+RETRYABLE_CODES = {429, 500, 502, 503, 504}
+
+class CircuitOpenError(Exception):
+    """Raised without calling the model while the circuit breaker is open"""
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether an error is a rate limit or transient upstream failure"""
+    if type(error).__name__ in RETRYABLE_ERRORS:
+        return True
+    code = getattr(error, "code", None)
+    code = getattr(code, "value", code)
+    return code in RETRYABLE_CODES
+
+class TokenBucket:
+    """
+    Blocking token bucket refilled continuously at per_minute / 60 per second
+    The level may go negative when a call turns out to cost more than its
+    estimate; later callers then wait for the debt to be repaid.
+    """
+
+    def __init__(self, per_minute: float, burst: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = burst if burst is not None else per_minute
+        self._level = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: float = 1) -> float:
+        """Take amount from the bucket, sleeping until it is available; returns seconds waited"""
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._level >= amount:
+                    self._level -= amount
+                    return waited
+                delay = (amount - self._level) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def adjust(self, amount: float):
+        """Charge (positive) or refund (negative) the difference between an estimate and the actual cost"""
+        with self._lock:
+            self._refill()
+            self._level = min(self.capacity, self._level - amount)
+
+    def _refill(self):
+        """Add tokens for the time elapsed since the last update; the caller holds the lock"""
+        now = time.monotonic()
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+
+class CircuitBreaker:
+    """
+    Opens after failure_threshold consecutive retryable failures
+    While open every call is rejected; after reset_timeout one trial call
+    is let through (half-open), and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream now"""
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = "half_open"
+                return True
+            return False
+
+    def retry_in(self) -> float:
+        """Seconds until an open circuit lets a trial call through"""
+        with self._lock:
+            return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == "half_open" or self._failures >= self.failure_threshold:
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+class RequestScheduler:
+    """
+    Rate limiting, retries, circuit breaking and single-flight for model calls
+    requests_per_minute and tokens_per_minute of None disable that limit.
+    Token cost is estimated up front from the prompt length plus
+    expected_response_tokens and corrected from usage_metadata afterwards.
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None,
+                 max_retries: int = 4, base_delay: float = 1.0, max_delay: float = 30.0,
+                 failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 expected_response_tokens: int = 1024, seed: Optional[int] = None):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.expected_response_tokens = expected_response_tokens
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self._in_flight_streams: Dict[str, "_SharedStream"] = {}
+        self._counters = {
+            "requests": 0, "upstream_calls": 0, "coalesced": 0, "retries": 0,
+            "failures": 0, "circuit_rejections": 0, "throttled_seconds": 0.0,
+        }
+
+    def call(self, key: str, fn: Callable[[], Any], prompt: str) -> Any:
+        """
+        Run fn through the scheduler, sharing the result with concurrent calls for the same key
+        Returns: fn's result; raises its final error once retries are exhausted
+        """
+        with self._lock:
+            self._counters["requests"] += 1
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+            else:
+                self._counters["coalesced"] += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = self._execute(fn, prompt)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def stream(self, key: str, open_stream: Callable[[], Iterator[str]], prompt: str) -> Iterator[str]:
+        """
+        Streaming counterpart of call
+        The first caller for a key starts one upstream stream on a thread of
+        its own; it and every caller that joins while it runs get all of its
+        chunks, from the beginning. A stream is only retried if it fails
+        before its first chunk; after that the error propagates to everyone.
+        """
+        with self._lock:
+            self._counters["requests"] += 1
+            shared = self._in_flight_streams.get(key)
+            if shared is None:
+                shared = self._in_flight_streams[key] = _SharedStream()
+                leader = True
+            else:
+                self._counters["coalesced"] += 1
+                leader = False
+
+        if leader:
+            # The upstream stream runs to the end even if every consumer stops early
+            threading.Thread(target=self._pump, args=(key, shared, open_stream, prompt),
+                             name="scheduler-stream", daemon=True).start()
+        return shared.follow()
+
+    def _pump(self, key: str, shared: "_SharedStream", open_stream: Callable[[], Iterator[str]], prompt: str):
+        """Read one upstream stream into shared, retrying failures before the first chunk"""
+        error = None
+        try:
+            attempt = 0
+            while True:
+                estimate = self._admit(prompt)
+                started = False
+                try:
+                    for chunk in open_stream():
+                        if not started:
+                            started = True
+                            self.breaker.record_success()
+                        shared.publish(chunk)
+                except Exception as e:
+                    if not started:
+                        # Nothing was generated, so the tokens charged for it are returned
+                        self._refund(estimate)
+                    if started or not self._should_retry(e, attempt):
+                        raise
+                    attempt += 1
+                    continue
+                if not started:
+                    self.breaker.record_success()
+                return
+        except BaseException as e:
+            error = e
+        finally:
+            with self._lock:
+                del self._in_flight_streams[key]
+            shared.finish(error)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return request counters and the circuit breaker state"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats["in_flight"] = len(self._in_flight) + len(self._in_flight_streams)
+        stats["circuit"] = self.breaker.state
+        return stats
+
+    def _execute(self, fn: Callable[[], Any], prompt: str) -> Any:
+        """Call fn with admission control, retrying retryable failures"""
+        attempt = 0
+        while True:
+            estimate = self._admit(prompt)
+            try:
+                response = fn()
+            except Exception as e:
+                self._refund(estimate)
+                if not self._should_retry(e, attempt):
+                    raise
+                attempt += 1
+                continue
+
+            self.breaker.record_success()
+            usage = getattr(response, "usage_metadata", None)
+            actual = getattr(usage, "total_token_count", None)
+            if self.tokens is not None and actual:
+                self.tokens.adjust(actual - estimate)
+            return response
+
+    def _refund(self, estimate: int):
+        """Return a failed call's token estimate, so retries do not drain the bucket twice"""
+        if self.tokens is not None:
+            self.tokens.adjust(-estimate)
+
+    def _admit(self, prompt: str) -> int:
+        """Check the breaker and wait for rate limit capacity; returns the token estimate charged"""
+        if not self.breaker.allow():
+            with self._lock:
+                self._counters["circuit_rejections"] += 1
+            raise CircuitOpenError(
+                f"Model API temporarily unavailable after repeated failures; "
+                f"retrying in {self.breaker.retry_in():.0f}s"
+            )
+
+        estimate = len(prompt) // 4 + self.expected_response_tokens
+        waited = 0.0
+        if self.requests is not None:
+            waited += self.requests.acquire(1)
+        if self.tokens is not None:
+            waited += self.tokens.acquire(estimate)
+
+        with self._lock:
+            self._counters["upstream_calls"] += 1
+            self._counters["throttled_seconds"] += waited
+        return estimate
+
+    def _should_retry(self, error: Exception, attempt: int) -> bool:
+        """Record a failed attempt and, if it is worth retrying, sleep through the backoff"""
+        retryable = is_retryable(error)
+        if retryable:
+            self.breaker.record_failure()
+        else:
+            # The API answered, so it is healthy even though this request was bad
+            self.breaker.record_success()
+
+        with self._lock:
+            self._counters["failures"] += 1
+            if not retryable or attempt >= self.max_retries:
+                return False
+            self._counters["retries"] += 1
+            # Full jitter: spread retries from concurrent callers over the whole window
+            delay = self._random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+        time.sleep(delay)
+        return True
+
+class _SharedStream:
+    """Chunks of one upstream stream, replayed to every caller that follows it"""
+
+    def __init__(self):
+        self._chunks = []
+        self._done = False
+        self._error = None
+        self._changed = threading.Condition()
+
+    def publish(self, chunk: str):
+        with self._changed:
+            self._chunks.append(chunk)
+            self._changed.notify_all()
+
+    def finish(self, error: Optional[BaseException] = None):
+        with self._changed:
+            self._done = True
+            self._error = error
+            self._changed.notify_all()
+
+    def follow(self) -> Iterator[str]:
+        """Yield every chunk from the first, then raise the stream's error if it failed"""
+        index = 0
+        while True:
+            with self._changed:
+                while index == len(self._chunks) and not self._done:
+                    self._changed.wait()
+                chunks = self._chunks[index:]
+                done, error = self._done, self._error
+            index += len(chunks)
+            yield from chunks
+            if done and index == len(self._chunks):
+                if error is not None:
+                    raise error
+                return
+
+class ScheduledBackend(ModelBackend):
+    """Route a backend's calls through its RequestScheduler"""
+
+    def __init__(self, backend: ModelBackend, scheduler: RequestScheduler):
+        self.backend = backend
+        self.scheduler = scheduler
+        self.model_name = backend.model_name
+
+    def generate_content(self, prompt: str, **kwargs):
+        return self.scheduler.call(
+            self._key(prompt, kwargs), lambda: self.backend.generate_content(prompt, **kwargs), prompt
+        )
+
+    def stream_content(self, prompt: str) -> Iterator[str]:
+        return self.scheduler.stream(self._key(prompt, {}), lambda: self.backend.stream_content(prompt), prompt)
+
+    def _key(self, prompt: str, kwargs: Dict[str, Any]) -> str:
+        """Identity of a request for single-flight: model, call options and prompt"""
+        digest = hashlib.sha256()
+        for part in (self.model_name, repr(sorted(kwargs.items())), prompt):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+def scheduler_from_env(env: Optional[Dict[str, str]] = None) -> RequestScheduler:
+    """Build a RequestScheduler from ANALYZER_REQUESTS_PER_MINUTE and ANALYZER_TOKENS_PER_MINUTE"""
+    env = os.environ if env is None else env
+    requests_per_minute = env.get('ANALYZER_REQUESTS_PER_MINUTE')
+    tokens_per_minute = env.get('ANALYZER_TOKENS_PER_MINUTE')
+    return RequestScheduler(
+        requests_per_minute=float(requests_per_minute) if requests_per_minute else None,
+        tokens_per_minute=float(tokens_per_minute) if tokens_per_minute else None,
+    )
+
+def combined_stats(schedulers: Iterable[RequestScheduler]) -> Dict[str, Any]:
+    """
+    Counters of several schedulers added up
+    Returns: Dictionary shaped like RequestScheduler.stats(), with circuit
+    listing how many schedulers are in each breaker state, e.g. "2 closed, 1 open"
+    """
+    combined = {}
+    circuits = {}
+    for scheduler in schedulers:
+        stats = scheduler.stats()
+        circuit = stats.pop("circuit")
+        circuits[circuit] = circuits.get(circuit, 0) + 1
+        for name, value in stats.items():
+            combined[name] = combined.get(name, 0) + value
+    if not circuits:
+        return dict(RequestScheduler().stats(), circuit="none")
+    combined["circuit"] = ", ".join(f"{count} {state}" for state, count in sorted(circuits.items()))
+    return combined
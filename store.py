@@ -0,0 +1,354 @@
+"""
+Persistent store of completed analyses with full-text and faceted search
+Each analysis is one row in SQLite: the transcript hash (never the
+transcript itself), the full results as JSON, and timings. Summary text,
+quoted phrases and recommendations go into an FTS5 index. Each bias item
+becomes a row keyed by canonical category and severity, so phrase,
+category, severity and date filters are all answered from indexes.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+from urllib.request import pathname2url
+
+from cache import normalize_transcript
+from recommendations import SEVERITY_ORDER, canonical_bias_type, canonical_severity
+
+def transcript_hash(transcript: str) -> str:
+    """Hash of the whitespace-normalized transcript"""
+    return hashlib.sha256(normalize_transcript(transcript).encode("utf-8")).hexdigest()
+
+def turns_hash(turns: Iterable[str]) -> str:
+    """transcript_hash() of the transcript these turns make up, hashed a turn at a time"""
+    digest = hashlib.sha256()
+    separator = ""
+    for turn in turns:
+        words = turn.split()
+        if words:
+            digest.update((separator + " ".join(words)).encode("utf-8"))
+            separator = " "
+    return digest.hexdigest()
+
+def _fts_phrase(text: str) -> Optional[str]:
+    """Turn free text into an FTS5 phrase query, or None if it has no searchable words"""
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    return '"' + " ".join(words) + '"'
+
+def _as_list(value: Union[None, str, Iterable[str]]) -> List[str]:
+    """Accept a single filter value or several"""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return list(value)
+
+class AnalysisStore:
+    """
+    SQLite-backed history of analyses
+    Safe to share between threads. Writes go through one connection and
+    are serialized with a lock; each reading thread opens its own read-only
+    connection, and the database runs in WAL mode, so searches neither
+    block on writes nor share a connection with them. An in-memory store
+    has a single connection, so its reads take the lock too.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS analyses (
+                id INTEGER PRIMARY KEY,
+                transcript_hash TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                mode TEXT,
+                model_name TEXT,
+                max_severity TEXT,
+                bias_count INTEGER NOT NULL,
+                elapsed_seconds REAL,
+                timings TEXT,
+                results TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_analyses_created ON analyses (created_at);
+            CREATE INDEX IF NOT EXISTS idx_analyses_hash ON analyses (transcript_hash);
+
+            CREATE TABLE IF NOT EXISTS bias_items (
+                analysis_id INTEGER NOT NULL REFERENCES analyses (id) ON DELETE CASCADE,
+                bias_type TEXT NOT NULL,
+                severity TEXT NOT NULL,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_bias_analysis ON bias_items (analysis_id, bias_type, severity);
+            CREATE INDEX IF NOT EXISTS idx_bias_type ON bias_items (bias_type, severity, created_at, analysis_id);
+            CREATE INDEX IF NOT EXISTS idx_bias_severity ON bias_items (severity, created_at, analysis_id);
+            CREATE INDEX IF NOT EXISTS idx_bias_created ON bias_items (created_at, bias_type, severity, analysis_id);
+
+            CREATE VIRTUAL TABLE IF NOT EXISTS analyses_fts USING fts5 (
+                summary, phrases, recommendations, tokenize = 'unicode61'
+            );
+        """)
+        self._db.commit()
+
+    def add(self, transcript: str, results: Dict[str, Any], mode: Optional[str] = None,
+            model_name: Optional[str] = None, elapsed_seconds: Optional[float] = None,
+            timings: Optional[Dict[str, float]] = None, created_at: Optional[float] = None) -> int:
+        """
+        Store one completed analysis
+        results has the summary, bias and recommendations keys analyze_all returns.
+        Returns: the new analysis id
+        """
+        return self.add_many([{
+            "transcript": transcript, "results": results, "mode": mode, "model_name": model_name,
+            "elapsed_seconds": elapsed_seconds, "timings": timings, "created_at": created_at,
+        }])[0]
+
+    def add_many(self, entries: Iterable[Dict[str, Any]]) -> List[int]:
+        """
+        Store many analyses in one transaction
+        Each entry takes add()'s arguments as keys; transcript_hash may be
+        given instead of transcript when the text is no longer available.
+        Returns: the new analysis ids, in order
+        """
+        ids = []
+        with self._lock:
+            try:
+                for entry in entries:
+                    ids.append(self._insert(entry))
+                self._db.commit()
+            except BaseException:
+                self._db.rollback()
+                raise
+        return ids
+
+    def search(self, text: Optional[str] = None, bias_type: Union[None, str, Iterable[str]] = None,
+               severity: Union[None, str, Iterable[str]] = None, since: Optional[float] = None,
+               until: Optional[float] = None, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Find analyses, most recently stored first
+        text matches summary, quoted phrases and recommendations as a phrase;
+        bias_type and severity match canonical categories and Low/Medium/High,
+        and must hold for the same bias item; since/until are Unix timestamps.
+        Returns: list of stored analyses with id, created_at, transcript_hash,
+        mode, model_name, elapsed_seconds, timings and results
+        """
+        source, where, params = self._filters(text, bias_type, severity, since, until)
+        # Each order lets an index stream rows newest-first and stop at the
+        # limit, instead of collecting and sorting every match. created_at
+        # is assigned on insert, so both orders agree for a live history.
+        if source.startswith("analyses_fts"):
+            order = "f.rowid DESC"
+        elif since is not None or until is not None:
+            order = "a.created_at DESC, a.id DESC"
+        else:
+            order = "a.id DESC"
+        with self._reader() as db:
+            rows = db.execute(
+                "SELECT a.id, a.transcript_hash, a.created_at, a.mode, a.model_name, a.elapsed_seconds, "
+                f"a.timings, a.results FROM {source}{where} ORDER BY {order} LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            ).fetchall()
+        return [{
+            "id": row["id"],
+            "transcript_hash": row["transcript_hash"],
+            "created_at": row["created_at"],
+            "mode": row["mode"],
+            "model_name": row["model_name"],
+            "elapsed_seconds": row["elapsed_seconds"],
+            "timings": json.loads(row["timings"]) if row["timings"] else None,
+            "results": json.loads(row["results"]),
+        } for row in rows]
+
+    def count(self, text: Optional[str] = None, bias_type: Union[None, str, Iterable[str]] = None,
+              severity: Union[None, str, Iterable[str]] = None, since: Optional[float] = None,
+              until: Optional[float] = None) -> int:
+        """Number of analyses matching the same filters as search()"""
+        if not text and (bias_type or severity):
+            # Answered from the bias_items index alone
+            where, params = self._item_filters(bias_type, severity, since, until)
+            with self._reader() as db:
+                return db.execute(
+                    "SELECT COUNT(DISTINCT analysis_id) FROM bias_items b" + where, params
+                ).fetchone()[0]
+        source, where, params = self._filters(text, bias_type, severity, since, until)
+        with self._reader() as db:
+            return db.execute(f"SELECT COUNT(*) FROM {source}{where}", params).fetchone()[0]
+
+    def facets(self, text: Optional[str] = None, since: Optional[float] = None,
+               until: Optional[float] = None) -> Dict[str, Dict[str, int]]:
+        """
+        Count analyses per bias category and per severity
+        Returns: Dictionary with bias_type and severity keys, each mapping a
+        value to the number of matching analyses with at least one such item
+        """
+        where, params = self._item_filters(None, None, since, until)
+        source = "bias_items b"
+        if since is not None or until is not None:
+            source += " INDEXED BY idx_bias_created"
+        query = _fts_phrase(text) if text else None
+        with self._reader() as db:
+            if query:
+                # Bound the phrase matches to the ids of items in the date range,
+                # so FTS5 skips postings outside it instead of returning them all
+                low, high = db.execute(
+                    f"SELECT MIN(analysis_id), MAX(analysis_id) FROM {source}{where}", params
+                ).fetchone()
+                if low is None:
+                    return {"bias_type": {}, "severity": {}}
+                where += (" AND " if where else " WHERE ") + (
+                    "b.analysis_id IN (SELECT rowid FROM analyses_fts WHERE analyses_fts MATCH ? "
+                    "AND rowid BETWEEN ? AND ?)"
+                )
+                params.extend([query, low, high])
+
+            facets = {}
+            for column in ("bias_type", "severity"):
+                rows = db.execute(
+                    f"SELECT {column}, COUNT(DISTINCT analysis_id) FROM {source}{where} GROUP BY {column}",
+                    params
+                ).fetchall()
+                facets[column] = {value: count for value, count in rows}
+        return facets
+
+    def get(self, analysis_id: int) -> Optional[Dict[str, Any]]:
+        """Return one stored analysis's results by id"""
+        with self._reader() as db:
+            row = db.execute("SELECT results FROM analyses WHERE id = ?", (analysis_id,)).fetchone()
+        return json.loads(row["results"]) if row else None
+
+    def delete(self, analysis_id: int):
+        """Remove an analysis and its index entries"""
+        with self._lock:
+            self._db.execute("DELETE FROM bias_items WHERE analysis_id = ?", (analysis_id,))
+            self._db.execute("DELETE FROM analyses_fts WHERE rowid = ?", (analysis_id,))
+            self._db.execute("DELETE FROM analyses WHERE id = ?", (analysis_id,))
+            self._db.commit()
+
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        """This thread's read-only connection, opened on first use"""
+        if self.path == ":memory:":
+            with self._lock:
+                yield self._db
+            return
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(f"file:{pathname2url(os.path.abspath(self.path))}?mode=ro", uri=True)
+            db.row_factory = sqlite3.Row
+            self._local.db = db
+        yield db
+
+    def _insert(self, entry: Dict[str, Any]) -> int:
+        """Insert one analysis and its index rows; the caller holds the lock and commits"""
+        created_at = entry.get('created_at') or time.time()
+        results = entry['results']
+        summary = results.get('summary') or {}
+        bias_items = (results.get('bias') or {}).get('bias_items') or []
+        recommendations = results.get('recommendations') or []
+        timings = entry.get('timings')
+
+        facets = [
+            (canonical_bias_type(item.get('Bias_Type', '')), canonical_severity(item.get('Severity', '')))
+            for item in bias_items
+        ]
+        max_severity = max((severity for _, severity in facets), key=SEVERITY_ORDER.index, default=None)
+
+        summary_text = "\n".join([
+            str(summary.get('executive_summary', '')),
+            *map(str, summary.get('strengths', [])),
+            *map(str, summary.get('improvements', [])),
+            str(summary.get('recommendation', '')),
+        ])
+        phrases = "\n".join(str(item.get('Example_Phrase', '')) for item in bias_items)
+
+        cursor = self._db.execute(
+            "INSERT INTO analyses (transcript_hash, created_at, mode, model_name, max_severity, "
+            "bias_count, elapsed_seconds, timings, results) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (entry.get('transcript_hash') or transcript_hash(entry['transcript']), created_at,
+             entry.get('mode'), entry.get('model_name'), max_severity, len(bias_items),
+             entry.get('elapsed_seconds'), json.dumps(timings) if timings else None, json.dumps(results))
+        )
+        analysis_id = cursor.lastrowid
+        self._db.executemany(
+            "INSERT INTO bias_items (analysis_id, bias_type, severity, created_at) VALUES (?, ?, ?, ?)",
+            [(analysis_id, bias_type, severity, created_at) for bias_type, severity in facets]
+        )
+        self._db.execute(
+            "INSERT INTO analyses_fts (rowid, summary, phrases, recommendations) VALUES (?, ?, ?, ?)",
+            (analysis_id, summary_text, phrases, "\n".join(map(str, recommendations)))
+        )
+        return analysis_id
+
+    def _filters(self, text, bias_type, severity, since, until):
+        """Build the FROM source and WHERE clause shared by search and count"""
+        source = "analyses a"
+        clauses = []
+        params = []
+
+        query = _fts_phrase(text) if text else None
+        if query:
+            source = "analyses_fts f JOIN analyses a ON a.id = f.rowid"
+            clauses.append("analyses_fts MATCH ?")
+            params.append(query)
+
+        if since is not None:
+            clauses.append("a.created_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("a.created_at < ?")
+            params.append(until)
+
+        types = _as_list(bias_type)
+        severities = _as_list(severity)
+        if types or severities:
+            # One probe of the (analysis_id, bias_type, severity) index per candidate row
+            item_clauses = ["b.analysis_id = a.id"]
+            if types:
+                item_clauses.append(f"b.bias_type IN ({', '.join('?' * len(types))})")
+                params.extend(types)
+            if severities:
+                item_clauses.append(f"b.severity IN ({', '.join('?' * len(severities))})")
+                params.extend(severities)
+            clauses.append(
+                "EXISTS (SELECT 1 FROM bias_items b INDEXED BY idx_bias_analysis WHERE "
+                + " AND ".join(item_clauses) + ")"
+            )
+
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        return source, where, params
+
+    def _item_filters(self, bias_type, severity, since, until):
+        """WHERE clause over bias_items alone, using its denormalized created_at"""
+        clauses = []
+        params = []
+        types = _as_list(bias_type)
+        severities = _as_list(severity)
+        if types:
+            clauses.append(f"b.bias_type IN ({', '.join('?' * len(types))})")
+            params.extend(types)
+        if severities:
+            clauses.append(f"b.severity IN ({', '.join('?' * len(severities))})")
+            params.extend(severities)
+        if since is not None:
+            clauses.append("b.created_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("b.created_at < ?")
+            params.append(until)
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        return where, params
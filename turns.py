@@ -0,0 +1,142 @@
+"""
+Speaker-turn index with character offsets into the original transcript
+parse_turns() records where each turn, and the text after its speaker
+label, starts and ends, in compact integer arrays; turn text is only
+sliced out when asked for. Each turn is also tagged as interviewer,
+candidate or other, so bias detection can send interviewer turns with a
+little candidate context instead of the whole transcript, and quoted
+phrases can be located preferring interviewer turns (see
+verification.PhraseIndex).
+"""
+
+import re
+from array import array
+from bisect import bisect_right
+from typing import Dict, List, Optional
+
+from chunking import SPEAKER_TURN
+
+INTERVIEWER, CANDIDATE, OTHER = 0, 1, 2
+
+INTERVIEWER_LABELS = re.compile(r"interview|hiring|manager|recruit|panel|host|^q$", re.IGNORECASE)
+CANDIDATE_LABELS = re.compile(r"candidate|applicant|interviewee|^a$", re.IGNORECASE)
+
+class TurnIndex:
+    """
+    Offsets of every speaker turn in a transcript
+    starts/ends delimit each whole turn (label included, surrounding
+    whitespace excluded); body_starts is where the text after the label
+    begins, equal to the start for unlabeled text. roles holds INTERVIEWER,
+    CANDIDATE or OTHER per turn.
+    """
+
+    def __init__(self, transcript: str):
+        self.transcript = transcript
+        self.starts = array("I")
+        self.ends = array("I")
+        self.body_starts = array("I")
+        self.roles = array("B")
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def text(self, turn: int) -> str:
+        """The turn's text, label included"""
+        return self.transcript[self.starts[turn]:self.ends[turn]]
+
+    def speaker(self, turn: int) -> str:
+        """The turn's speaker label without the colon, or "" for unlabeled text"""
+        if self.body_starts[turn] == self.starts[turn]:
+            return ""
+        return self.transcript[self.starts[turn]:self.body_starts[turn]].strip().rstrip(":").strip()
+
+    def turn_at(self, offset: int) -> Optional[int]:
+        """Index of the turn containing a character offset, or None between turns"""
+        turn = bisect_right(self.starts, offset) - 1
+        if turn >= 0 and offset < self.ends[turn]:
+            return turn
+        return None
+
+def parse_turns(transcript: str) -> TurnIndex:
+    """
+    Index the speaker turns of a transcript
+    Lines without a speaker label belong to the turn they follow; text
+    before the first label is its own unlabeled turn. Speakers whose labels
+    do not say who they are (e.g. names) are classified by how often their
+    turns ask questions.
+    """
+    index = TurnIndex(transcript)
+    labels = [(match.start(), match.end()) for match in SPEAKER_TURN.finditer(transcript)]
+    boundaries = [start for start, _ in labels] + [len(transcript)]
+    if not labels or labels[0][0] > 0:
+        labels.insert(0, (0, 0))
+        boundaries.insert(0, 0)
+
+    speakers = []
+    for (label_start, label_end), end in zip(labels, boundaries[1:]):
+        # Trim whitespace by offset instead of stripping a copy
+        start = label_start
+        while start < end and transcript[start].isspace():
+            start += 1
+        while end > start and transcript[end - 1].isspace():
+            end -= 1
+        if start == end:
+            continue
+        index.starts.append(start)
+        index.ends.append(end)
+        index.body_starts.append(max(label_end, start))
+        speakers.append(index.speaker(len(index.starts) - 1))
+
+    roles = _speaker_roles(index, speakers)
+    index.roles.extend(roles[speaker] for speaker in speakers)
+    return index
+
+def _speaker_roles(index: TurnIndex, speakers: List[str]) -> Dict[str, int]:
+    """Role per speaker label: from the label when it names one, else by share of questions asked"""
+    roles = {}
+    questions = {}
+    for turn, speaker in enumerate(speakers):
+        if INTERVIEWER_LABELS.search(speaker):
+            roles[speaker] = INTERVIEWER
+        elif CANDIDATE_LABELS.search(speaker):
+            roles[speaker] = CANDIDATE
+        elif speaker:
+            asked, total = questions.get(speaker, (0, 0))
+            asked += index.transcript.find("?", index.body_starts[turn], index.ends[turn]) >= 0
+            questions[speaker] = (asked, total + 1)
+
+    interviewer_known = INTERVIEWER in roles.values()
+    for speaker, (asked, total) in questions.items():
+        if speaker in roles:
+            continue
+        # Without an explicit interviewer label, whoever mostly asks questions is one
+        roles[speaker] = INTERVIEWER if not interviewer_known and asked * 2 >= total else OTHER
+    roles[""] = OTHER
+    return roles
+
+def interviewer_excerpt(transcript: str, index: Optional[TurnIndex] = None, context_chars: int = 80) -> Optional[str]:
+    """
+    The interviewer's turns, each preceded by the end of the candidate turn it responds to
+    Candidate context is cut to its last context_chars characters, at a
+    word boundary, and marked with an ellipsis.
+    Returns: the excerpt, or None when no interviewer turns were recognized
+    """
+    index = index or parse_turns(transcript)
+    parts = []
+    for turn in range(len(index)):
+        if index.roles[turn] != INTERVIEWER:
+            continue
+        previous = turn - 1
+        if context_chars and previous >= 0 and index.roles[previous] != INTERVIEWER:
+            body_start = index.body_starts[previous]
+            end = index.ends[previous]
+            if end - body_start > context_chars:
+                cut = transcript.find(" ", end - context_chars, end)
+                body_start = cut + 1 if cut >= 0 else end - context_chars
+                context = "..." + transcript[body_start:end]
+            else:
+                context = transcript[body_start:end]
+            speaker = index.speaker(previous)
+            parts.append(f"{speaker}: {context}" if speaker else context)
+        parts.append(index.text(turn))
+    return "\n\n".join(parts) if parts else None
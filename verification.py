@@ -0,0 +1,192 @@
+"""
+Verification of the phrases quoted in bias findings
+A model's Example_Phrase is not guaranteed to occur in the transcript: it
+may paraphrase, stitch two questions together or invent a quote.
+PhraseIndex tokenizes a transcript once into words with character
+offsets, plus the positions of every distinct word. A phrase is then
+looked up as an exact word sequence through the occurrences of its
+rarest word, or failing that by scoring only the few windows where most
+of its rarer words line up, so each lookup costs about the number of
+times those words occur rather than the transcript's length. Bias is
+asked about the interviewer's questions, so when a phrase occurs more
+than once a match inside an interviewer turn (see turns.parse_turns())
+is preferred.
+"""
+
+import re
+from array import array
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from turns import INTERVIEWER, TurnIndex, parse_turns
+
+# Fuzzy matches scoring below this character similarity (0..1) are rejected
+MIN_MATCH_SCORE = 0.8
+
+# Bounds on the fuzzy search: how many of a phrase's rarest words cast
+# votes for where it starts, and how many of the top-voted windows are scored
+MAX_ANCHOR_WORDS = 4
+MAX_CANDIDATES = 8
+
+# Findings that are not quotes, such as the placeholder for a failed call
+UNQUOTED_BIAS_TYPES = frozenset(["Analysis Error"])
+
+_WORD = re.compile(r"\w+")
+_LEADING_PUNCTUATION = re.compile(r"^[^\w\s]+")
+_TRAILING_PUNCTUATION = re.compile(r"[^\w\s]+$")
+
+class PhraseIndex:
+    """
+    Words of a transcript with their character offsets
+    words holds the casefolded words in order, starts/ends their offsets,
+    and positions the indexes in words of each distinct word. turns is
+    the transcript's TurnIndex, parsed here unless one is passed in.
+    """
+
+    def __init__(self, transcript: str, turns: Optional[TurnIndex] = None):
+        self.transcript = transcript
+        self.turns = turns or parse_turns(transcript)
+        self.words: List[str] = []
+        self.starts = array("I")
+        self.ends = array("I")
+        self.positions: Dict[str, array] = {}
+        for match in _WORD.finditer(transcript):
+            word = match.group().casefold()
+            positions = self.positions.get(word)
+            if positions is None:
+                positions = self.positions[word] = array("I")
+            positions.append(len(self.words))
+            self.words.append(word)
+            self.starts.append(match.start())
+            self.ends.append(match.end())
+
+    def find(self, phrase: str, min_score: float = MIN_MATCH_SCORE) -> Optional[Tuple[int, int, float]]:
+        """
+        Locate a phrase, ignoring case, punctuation and spacing
+        An exact word sequence wins; otherwise the best fuzzy match is taken
+        if its character similarity to the phrase reaches min_score. Either
+        way a match in an interviewer turn beats one elsewhere.
+        Returns: (start, end, score) with character offsets into the
+        transcript and a score of 1.0 for exact matches, or None
+        """
+        phrase = (phrase or "").strip().strip('"“”').strip()
+        words = _WORD.findall(phrase.casefold())
+        if not words:
+            return None
+        span = self._find_exact(words)
+        if span is not None:
+            match = span[0], span[1], 1.0
+        else:
+            match = self._find_fuzzy(words, min_score)
+            if match is None:
+                return None
+        return self._with_punctuation(phrase, *match)
+
+    def _with_punctuation(self, phrase: str, start: int, end: int, score: float) -> Tuple[int, int, float]:
+        """Widen a match over punctuation the phrase quotes at either end, like a closing question mark"""
+        leading = phrase[:len(phrase) - len(_LEADING_PUNCTUATION.sub("", phrase))]
+        trailing = phrase[len(_TRAILING_PUNCTUATION.sub("", phrase)):]
+        if leading and self.transcript.endswith(leading, 0, start):
+            start -= len(leading)
+        if trailing and self.transcript.startswith(trailing, end):
+            end += len(trailing)
+        return start, end, score
+
+    def _in_interviewer_turn(self, offset: int) -> bool:
+        """Whether a character offset falls inside an interviewer turn"""
+        turn = self.turns.turn_at(offset)
+        return turn is not None and self.turns.roles[turn] == INTERVIEWER
+
+    def _find_exact(self, words: List[str]) -> Optional[Tuple[int, int]]:
+        """Character span of the word sequence, first in an interviewer turn if any, or None"""
+        if any(word not in self.positions for word in words):
+            return None
+        # Every match contains an occurrence of the rarest word
+        anchor = min(range(len(words)), key=lambda i: len(self.positions[words[i]]))
+        count = len(words)
+        fallback = None
+        for position in self.positions[words[anchor]]:
+            first = position - anchor
+            if first >= 0 and self.words[first:first + count] == words:
+                span = self.starts[first], self.ends[first + count - 1]
+                if self._in_interviewer_turn(span[0]):
+                    return span
+                fallback = fallback or span
+        return fallback
+
+    def _find_fuzzy(self, words: List[str], min_score: float) -> Optional[Tuple[int, int, float]]:
+        """Best-scoring window where the phrase's rarer words line up, preferring interviewer turns"""
+        anchors = sorted({word: i for i, word in enumerate(words) if word in self.positions}.items(),
+                         key=lambda item: len(self.positions[item[0]]))
+        # Each occurrence of an anchor word votes for where the phrase would start
+        votes = Counter()
+        for word, i in anchors[:MAX_ANCHOR_WORDS]:
+            for position in self.positions[word]:
+                votes[position - i] += 1
+
+        target = " ".join(words)
+        count = len(words)
+        slack = max(1, count // 4)
+        # Best match anywhere, and best inside an interviewer turn
+        best = best_interviewer = None
+        for first, _ in votes.most_common(MAX_CANDIDATES):
+            low = max(0, first - slack)
+            high = min(len(self.words), first + count + slack)
+            blocks = [block for block in SequenceMatcher(None, words, self.words[low:high], autojunk=False)
+                      .get_matching_blocks() if block.size]
+            if not blocks:
+                continue
+            # The span runs from the first to the last matched word
+            begin = low + blocks[0].b
+            end = low + blocks[-1].b + blocks[-1].size
+            score = SequenceMatcher(None, target, " ".join(self.words[begin:end]), autojunk=False).ratio()
+            match = (self.starts[begin], self.ends[end - 1], score)
+            if best is None or score > best[2]:
+                best = match
+            if self._in_interviewer_turn(match[0]) and (best_interviewer is None or score > best_interviewer[2]):
+                best_interviewer = match
+
+        if best_interviewer is not None and best_interviewer[2] >= min_score:
+            best = best_interviewer
+        if best is None or best[2] < min_score:
+            return None
+        return best[0], best[1], round(best[2], 3)
+
+def verify_bias_items(transcript: str, bias_items: Iterable[Dict[str, Any]], index: Optional[PhraseIndex] = None,
+                      min_score: float = MIN_MATCH_SCORE, offsets: bool = True) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Keep the bias findings whose Example_Phrase can be found in the transcript
+    Each kept item's Example_Phrase becomes the matched transcript text and
+    it gains a Match_Score, plus Start and End character offsets when
+    offsets is true. Placeholders for failed calls are kept as they are.
+    Returns: (verified items, number of items dropped)
+    """
+    verified = []
+    dropped = 0
+    for item in bias_items:
+        if item.get('Bias_Type') in UNQUOTED_BIAS_TYPES:
+            verified.append(item)
+            continue
+        if index is None:
+            index = PhraseIndex(transcript)
+        match = index.find(item.get('Example_Phrase', ''), min_score)
+        if match is None:
+            dropped += 1
+            continue
+        start, end, score = match
+        item = dict(item, Example_Phrase=transcript[start:end], Match_Score=score)
+        if offsets:
+            item['Start'], item['End'] = start, end
+        verified.append(item)
+    return verified, dropped
+
+def verify_bias(transcript: str, bias: Dict[str, Any], index: Optional[PhraseIndex] = None,
+                min_score: float = MIN_MATCH_SCORE, offsets: bool = True) -> Dict[str, Any]:
+    """
+    Bias result with only the findings verified by verify_bias_items()
+    Returns: a copy of bias with verified bias_items and an "unverified"
+    count of the findings dropped
+    """
+    items, dropped = verify_bias_items(transcript, bias.get('bias_items') or [], index, min_score, offsets)
+    return dict(bias, bias_items=items, unverified=dropped)